@@ -3,10 +3,12 @@ API v1 router aggregation for FloatChat backend.
 """
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1.endpoints import ai_query, floats, profiles
 
-api_router = APIRouter()
+# orjson serializes responses (including datetimes) natively in C
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 # Include all endpoint routers
 api_router.include_router(
@@ -2,94 +2,214 @@
 AI query endpoints for natural language oceanographic queries.
 """
 
+import asyncio
+import hashlib
 import time
 import logging
-from typing import Dict, Any, List
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from fastapi.encoders import jsonable_encoder
+import re
+import string
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request, Response
+from fastapi.responses import ORJSONResponse
+import orjson
+from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.models import Float
 from app.schemas import (
     AIQueryInput, 
     AIQueryResponse, 
     QueryParameters,
-    ErrorResponse,
-    ErrorDetail
+    FloatIdIntent,
+    ComparisonIntent
 )
 from app.services.ai_service import ai_service
 from app.services.geospatial import geospatial_service
+from app.services.cache import cache_service, make_cache_key
+from app.metrics import (
+    start_stage_timing,
+    stage,
+    get_stage_timings,
+    AI_QUERY_LATENCY,
+    AI_QUERY_COUNT,
+    OFF_TOPIC_REJECTIONS
+)
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Time to live for cached AI query responses, in seconds
+_QUERY_RESPONSE_TTL = 300
+
+# Static capabilities payload - built and serialized once at import time
+_CAPABILITIES: Dict[str, Any] = {
+    "ai_service_available": ai_service.groq_api_key is not None,
+    "supported_parameters": [
+        "location",
+        "bbox",
+        "start_date",
+        "end_date", 
+        "variables",
+        "depth_range",
+        "general_search_term"
+    ],
+    "supported_variables": [
+        "temperature",
+        "salinity", 
+        "pressure",
+        "dissolved_oxygen",
+        "ph",
+        "nitrate",
+        "chlorophyll"
+    ],
+    "example_queries": [
+        "Show me temperature data from the Pacific Ocean in 2023",
+        "Find floats with salinity measurements near 30°N, 140°W",
+        "What are the oxygen levels in the Southern Ocean?",
+        "Compare temperature profiles between 0-1000m depth",
+        "Show recent data from Argo floats in the Atlantic"
+    ],
+    "query_tips": [
+        "Be specific about location (ocean regions, coordinates, or place names)",
+        "Mention time periods for temporal filtering",
+        "Specify variables of interest (temperature, salinity, etc.)",
+        "Include depth ranges for vertical profiling",
+        "Use natural language - the AI will extract parameters"
+    ]
+}
+_CAPABILITIES_JSON = orjson.dumps(_CAPABILITIES)
+_CAPABILITIES_ETAG = f'"{hashlib.md5(_CAPABILITIES_JSON).hexdigest()}"'
+
+
+def _error_response(error: str, code: str, message: str) -> Dict[str, Any]:
+    """
+    Build an ErrorResponse-shaped payload as a plain dict.
+    
+    Skips Pydantic validation so error paths stay cheap under load
+    (e.g. during an LLM provider outage).
+    """
+    return {
+        "error": error,
+        "details": [{"message": message, "code": code, "field": None}],
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+# Questions must mention at least one of these to be worth an LLM round-trip
+_RELEVANT_QUERY_RE = re.compile(
+    r"\b(ocean|oceans|oceanographic|sea|seas|marine|water|float|floats|argo|wmo|profile|profiles|"
+    r"temperature|temp|salinity|salt|pressure|depth|deep|oxygen|ph|nitrate|chlorophyll|"
+    r"pacific|atlantic|indian|arctic|southern|data|measurement|measurements|"
+    r"active|inactive|maintenance|compare|\d{5,7})\b",
+    re.IGNORECASE
+)
+
+
+def _irrelevant_query_response(
+    question: str,
+    parameters: QueryParameters,
+    processing_time: float
+) -> AIQueryResponse:
+    """Build the polite rejection returned for off-topic questions."""
+    return AIQueryResponse(
+        query=question,
+        parameters=parameters,
+        floats=[],
+        insights="Sorry, I cannot help you with that. I specialize in oceanographic float data including temperature, salinity, and pressure measurements from the Pacific, Atlantic, and Indian Oceans. Please ask about ocean data!",
+        data_summary={'float_count': 0, 'profile_count': 0, 'measurement_count': 0},
+        recommendations=[
+            "Show me active floats",
+            "What is the temperature in Pacific Ocean",
+            "Compare salinity between Atlantic and Indian Ocean",
+            "Show me pressure data for Indian Ocean"
+        ],
+        processing_time=processing_time
+    )
+
+
+# Float-ID insight text, compiled once; optional sections are substituted as
+# pre-rendered lines or empty strings
+_FLOAT_INSIGHTS_TMPL = string.Template(
+    "📍 **Float $wmo** (ID: $fid)\n\n"
+    "**Status:** $status\n"
+    "$position"
+    "**Profiles:** $profiles\n"
+    "$institution"
+)
+_FLOAT_POSITION_TMPL = string.Template(
+    "**Location:** $lat°, $lon°\n"
+    "**Last Update:** $updated\n"
+)
+
+
+# Pre-serialized "float not found" response; only the float ID varies per request
+_FLOAT_ID_PLACEHOLDER = "__FLOAT_ID__"
+_FLOAT_NOT_FOUND_JSON = orjson.dumps(AIQueryResponse(
+    query=f"Float/WMO ID {_FLOAT_ID_PLACEHOLDER}",
+    parameters=QueryParameters(),
+    floats=[],
+    insights=f"❌ Float with ID or WMO ID {_FLOAT_ID_PLACEHOLDER} not found in the database.\n\nPlease check the ID and try again.",
+    data_summary={'float_count': 0},
+    recommendations=[
+        "Show me all active floats",
+        "Find floats in Pacific Ocean",
+        "What floats are available?"
+    ],
+    processing_time=0
+).model_dump(mode="json"))
+
+
+def _float_not_found_response(float_id: int) -> Response:
+    """Build the "float not found" response from the pre-serialized template."""
+    content = _FLOAT_NOT_FOUND_JSON.replace(_FLOAT_ID_PLACEHOLDER.encode(), str(float_id).encode())
+    return Response(content=content, media_type="application/json")
 
 
 async def _handle_float_id_query(
     db: AsyncSession,
     float_id: int
-) -> AIQueryResponse:
-    """Handle queries for specific float IDs or WMO IDs."""
-    from app.models import Float, Profile, Measurement
-    from sqlalchemy import select, func, or_
-    from app.schemas import QueryParameters
-    
-    # Query the specific float by ID or WMO ID
+) -> Optional[AIQueryResponse]:
+    """Handle queries for specific float IDs or WMO IDs, returning None if not found."""
+    # Fetch the float; its profile count and latest position are stored on it
     result = await db.execute(
-        select(Float).where(
+        select(Float)
+        .where(
             or_(
                 Float.id == float_id,
                 Float.wmo_id == str(float_id)
             )
         )
+        .limit(1)
     )
     float_obj = result.scalar_one_or_none()
     
     if not float_obj:
-        return AIQueryResponse(
-            query=f"Float/WMO ID {float_id}",
-            parameters=QueryParameters(),
-            floats=[],
-            insights=f"❌ Float with ID or WMO ID {float_id} not found in the database.\n\nPlease check the ID and try again.",
-            data_summary={'float_count': 0},
-            recommendations=[
-                "Show me all active floats",
-                "Find floats in Pacific Ocean",
-                "What floats are available?"
-            ],
-            processing_time=0
-        )
+        return None
     
-    # Get float summary
-    float_summary = await geospatial_service._create_float_summary(float_obj, db)
+    profile_count = float_obj.profile_count or 0
     
-    # Get profile count
-    profile_count_result = await db.execute(
-        select(func.count(Profile.id)).where(Profile.float_id == float_id)
-    )
-    profile_count = profile_count_result.scalar() or 0
-    
-    # Get latest profile data
-    latest_profile_result = await db.execute(
-        select(Profile)
-        .where(Profile.float_id == float_id)
-        .order_by(Profile.timestamp.desc())
-        .limit(1)
-    )
-    latest_profile = latest_profile_result.scalar_one_or_none()
-    
-    # Build insights
-    insights = f"📍 **Float {float_obj.wmo_id}** (ID: {float_id})\n\n"
-    insights += f"**Status:** {float_obj.status.title()}\n"
-    
-    if latest_profile:
-        insights += f"**Location:** {latest_profile.latitude:.2f}°, {latest_profile.longitude:.2f}°\n"
-        insights += f"**Last Update:** {latest_profile.timestamp.strftime('%Y-%m-%d %H:%M')}\n"
+    float_summary = geospatial_service._create_float_summary(float_obj)
     
-    insights += f"**Profiles:** {profile_count}\n"
+    # Build insights in a single template substitution
+    position = ""
+    if float_obj.last_profile_timestamp:
+        position = _FLOAT_POSITION_TMPL.substitute(
+            lat=f"{float_obj.last_latitude:.2f}",
+            lon=f"{float_obj.last_longitude:.2f}",
+            updated=float_obj.last_profile_timestamp.strftime('%Y-%m-%d %H:%M')
+        )
     
-    if float_obj.institution:
-        insights += f"**Institution:** {float_obj.institution}\n"
+    insights = _FLOAT_INSIGHTS_TMPL.substitute(
+        wmo=float_obj.wmo_id,
+        fid=float_id,
+        status=float_obj.status.title(),
+        position=position,
+        profiles=profile_count,
+        institution=f"**Institution:** {float_obj.institution}\n" if float_obj.institution else ""
+    )
     
     # Generate recommendations
     recommendations = [
@@ -119,28 +239,29 @@ async def _handle_comparison_query(
     variables: List[str]
 ) -> AIQueryResponse:
     """Handle comparison queries between two oceans."""
-    from app.schemas import QueryParameters
-    
     if not variables:
         variables = ['temperature', 'salinity']  # Default variables for comparison
     
     results = {}
     all_floats = []
     
-    # Query each ocean separately
-    for ocean in oceans:
-        params = QueryParameters(
-            location=ocean,
-            variables=variables,
-            status=None,
-            general_search_term=None
-        )
-        
-        floats, data_summary = await geospatial_service.query_floats_by_parameters(
-            parameters=params,
+    # Validate shared parameters once; per-ocean copies skip re-validation
+    template = QueryParameters(
+        variables=variables,
+        status=None,
+        general_search_term=None
+    )
+    
+    # Query each ocean concurrently - every query uses its own session
+    outputs = await asyncio.gather(*[
+        geospatial_service.query_floats_by_parameters(
+            parameters=template.model_copy(update={'location': ocean}),
             limit=100
         )
-        
+        for ocean in oceans
+    ])
+    
+    for ocean, (floats, data_summary) in zip(oceans, outputs):
         results[ocean] = {
             'floats': floats,
             'data_summary': data_summary,
@@ -149,24 +270,24 @@ async def _handle_comparison_query(
         all_floats.extend(floats)
     
     # Generate comparison insights
-    insights = f"🔍 **Comparison between {' and '.join(oceans)}**\n\n"
+    parts = [f"🔍 **Comparison between {' and '.join(oceans)}**\n\n"]
     
     for ocean in oceans:
         result = results[ocean]
-        insights += f"**{ocean}:**\n"
-        insights += f"  • {result['float_count']} floats, {result['data_summary'].get('measurement_count', 0):,} measurements\n"
+        parts.append(f"**{ocean}:**\n")
+        parts.append(f"  • {result['float_count']} floats, {result['data_summary'].get('measurement_count', 0):,} measurements\n")
         
         if result['data_summary'].get('variable_statistics'):
             stats = result['data_summary']['variable_statistics']
             for var in variables:
                 if var in stats:
                     var_stats = stats[var]
-                    insights += f"  • {var.title()}: {var_stats['mean']:.2f} (range: {var_stats['min']:.2f} to {var_stats['max']:.2f})\n"
-        insights += "\n"
+                    parts.append(f"  • {var.title()}: {var_stats['mean']:.2f} (range: {var_stats['min']:.2f} to {var_stats['max']:.2f})\n")
+        parts.append("\n")
     
     # Add comparison summary
     if len(oceans) == 2 and variables:
-        insights += "**Key Differences:**\n"
+        parts.append("**Key Differences:**\n")
         for var in variables:
             stats1 = results[oceans[0]]['data_summary'].get('variable_statistics', {}).get(var)
             stats2 = results[oceans[1]]['data_summary'].get('variable_statistics', {}).get(var)
@@ -174,10 +295,11 @@ async def _handle_comparison_query(
             if stats1 and stats2:
                 diff = stats1['mean'] - stats2['mean']
                 higher = oceans[0] if diff > 0 else oceans[1]
-                insights += f"  • {var.title()}: {higher} has {abs(diff):.2f} units higher average\n"
+                parts.append(f"  • {var.title()}: {higher} has {abs(diff):.2f} units higher average\n")
     
     # Highlight float IDs
-    insights += f"\n\n💡 Comparing data from {len(all_floats)} total floats across regions"
+    parts.append(f"\n\n💡 Comparing data from {len(all_floats)} total floats across regions")
+    insights = "".join(parts)
     
     # Generate recommendations
     recommendations = [
@@ -216,82 +338,92 @@ async def process_ai_query(
     3. Generates AI insights about the data
     4. Returns comprehensive response with floats and analysis
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
+    start_stage_timing()
+    status = "ok"
     
     try:
-        logger.info(f"Processing AI query: {query_input.question[:100]}...")
+        logger.info("Processing AI query: %s...", query_input.question[:100])
+        
+        # Reject obviously off-topic questions without paying for an LLM call
+        if not _RELEVANT_QUERY_RE.search(query_input.question):
+            OFF_TOPIC_REJECTIONS.inc()
+            logger.info("Rejected off-topic query before parameter extraction")
+            processing_time = time.perf_counter() - start_time
+            return _irrelevant_query_response(query_input.question, QueryParameters(), processing_time)
+        
+        # Serve identical questions from cache while the data is unchanged
+        data_version = await cache_service.get_data_version()
+        cache_key = make_cache_key(f"ai_query:{data_version}", query_input.question, normalize_strings=True)
+        cached_response = await cache_service.get_json(cache_key)
+        if cached_response is not None:
+            logger.info("Returning cached AI query response")
+            return ORJSONResponse(cached_response)
         
         # Step 1: Extract structured parameters from natural language
-        parameters = await ai_service.process_query(query_input)
-        logger.info(f"Extracted parameters: {parameters.dict()}")
+        with stage("extract"):
+            parameters = await ai_service.process_query(query_input)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Extracted parameters: %s", parameters.model_dump())
         
         # Check if query is irrelevant (no parameters extracted)
         if (not parameters.location and not parameters.variables and 
-            not parameters.status and not parameters.general_search_term):
+            not parameters.status and not parameters.general_search_term and
+            parameters.intent is None):
             # Return rejection message
-            processing_time = time.time() - start_time
-            return AIQueryResponse(
-                query=query_input.question,
-                parameters=parameters,
-                floats=[],
-                insights="Sorry, I cannot help you with that. I specialize in oceanographic float data including temperature, salinity, and pressure measurements from the Pacific, Atlantic, and Indian Oceans. Please ask about ocean data!",
-                data_summary={'float_count': 0, 'profile_count': 0, 'measurement_count': 0},
-                recommendations=[
-                    "Show me active floats",
-                    "What is the temperature in Pacific Ocean",
-                    "Compare salinity between Atlantic and Indian Ocean",
-                    "Show me pressure data for Indian Ocean"
-                ],
-                processing_time=processing_time
-            )
+            processing_time = time.perf_counter() - start_time
+            return _irrelevant_query_response(query_input.question, parameters, processing_time)
         
         # Handle float ID queries
-        if parameters.general_search_term and parameters.general_search_term.startswith('FLOAT_ID:'):
-            float_id_str = parameters.general_search_term.replace('FLOAT_ID:', '')
-            try:
-                float_id = int(float_id_str)
-                float_results = await _handle_float_id_query(db, float_id)
-                processing_time = time.time() - start_time
-                float_results.processing_time = processing_time
-                return float_results
-            except ValueError:
-                logger.error(f"Invalid float ID: {float_id_str}")
+        if isinstance(parameters.intent, FloatIdIntent):
+            with stage("db"):
+                float_results = await _handle_float_id_query(db, parameters.intent.float_id)
+            if float_results is None:
+                return _float_not_found_response(parameters.intent.float_id)
+            float_results.processing_time = time.perf_counter() - start_time
+            return float_results
         
         # Handle comparison queries
-        if parameters.general_search_term and parameters.general_search_term.startswith('COMPARISON:'):
-            oceans = parameters.general_search_term.replace('COMPARISON:', '').split(',')
-            comparison_results = await _handle_comparison_query(db, oceans, parameters.variables)
-            processing_time = time.time() - start_time
+        if isinstance(parameters.intent, ComparisonIntent):
+            with stage("db"):
+                comparison_results = await _handle_comparison_query(db, parameters.intent.oceans, parameters.variables)
+            comparison_results.processing_time = time.perf_counter() - start_time
             return comparison_results
         
         # Step 2: Query database for matching floats
-        floats, data_summary = await geospatial_service.query_floats_by_parameters(
-            parameters=parameters,
-            limit=100
-        )
+        with stage("db"):
+            floats, data_summary = await geospatial_service.query_floats_by_parameters(
+                parameters=parameters,
+                limit=100
+            )
         
-        logger.info(f"Found {len(floats)} matching floats")
+        logger.info("Found %d matching floats", len(floats))
         
-        # Step 3: Generate AI insights with float highlighting
-        insights = await ai_service.generate_insights(
-            query=query_input.question,
-            parameters=parameters,
-            data_summary=data_summary
-        )
+        # Steps 3 & 4: Generate AI insights and recommendations concurrently,
+        # sharing one serialization of the parameters and data summary
+        with stage("llm"):
+            prompt_context = ai_service.build_prompt_context(parameters, data_summary)
+            insights, recommendations = await asyncio.gather(
+                ai_service.generate_insights(
+                    query=query_input.question,
+                    parameters=parameters,
+                    data_summary=data_summary,
+                    prompt_context=prompt_context
+                ),
+                ai_service.generate_recommendations(
+                    query=query_input.question,
+                    parameters=parameters,
+                    data_summary=data_summary,
+                    prompt_context=prompt_context
+                )
+            )
         
         # Add float IDs to insights for highlighting
         if floats:
-            float_ids = [f.id for f in floats]
-            insights += f"\n\n💡 Showing data from {len(floats)} floats (IDs: {', '.join(map(str, float_ids[:10]))}{'...' if len(floats) > 10 else ''})"
+            shown_ids = ", ".join(str(f.id) for f in floats[:10])
+            insights += f"\n\n💡 Showing data from {len(floats)} floats (IDs: {shown_ids}{'...' if len(floats) > 10 else ''})"
         
-        # Step 4: Generate recommendations
-        recommendations = await ai_service.generate_recommendations(
-            query=query_input.question,
-            parameters=parameters,
-            data_summary=data_summary
-        )
-        
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         
         # Create response
         response = AIQueryResponse(
@@ -304,24 +436,27 @@ async def process_ai_query(
             processing_time=processing_time
         )
         
-        logger.info(f"Query processed successfully in {processing_time:.2f}s")
+        await cache_service.set_json(cache_key, response.model_dump(mode="json"), _QUERY_RESPONSE_TTL)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Query processed successfully in %.2fs", processing_time)
+            logger.debug("Stage timings: %s", get_stage_timings())
+        
         return response
         
     except Exception as e:
+        status = "error"
         logger.error(f"Error processing AI query: {e}", exc_info=True)
         
-        error_response = ErrorResponse(
-            error="Query Processing Error",
-            details=[ErrorDetail(
-                message=f"Failed to process query: {str(e)}",
-                code="QUERY_ERROR"
-            )]
-        )
-        
         raise HTTPException(
             status_code=500,
-            detail=jsonable_encoder(error_response)
+            detail=_error_response("Query Processing Error", "QUERY_ERROR", f"Failed to process query: {str(e)}")
         )
+    
+    finally:
+        # Covers every exit: rejections, cache hits, float-ID and comparison answers and errors
+        AI_QUERY_COUNT.labels(status=status).inc()
+        AI_QUERY_LATENCY.observe(time.perf_counter() - start_time)
 
 
 @router.post("/extract-parameters", response_model=QueryParameters)
@@ -336,11 +471,12 @@ async def extract_query_parameters(
     query parameter validation.
     """
     try:
-        logger.info(f"Extracting parameters from: {query_input.question[:100]}...")
+        logger.info("Extracting parameters from: %s...", query_input.question[:100])
         
         parameters = await ai_service.process_query(query_input)
         
-        logger.info(f"Extracted parameters: {parameters.dict()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Extracted parameters: %s", parameters.model_dump())
         return parameters
         
     except Exception as e:
@@ -348,10 +484,7 @@ async def extract_query_parameters(
         
         raise HTTPException(
             status_code=500,
-            detail=jsonable_encoder(ErrorResponse(
-                error="Parameter Extraction Error",
-                details=[ErrorDetail(message=f"Failed to extract parameters: {str(e)}", code="PARAM_ERROR")]
-            ))
+            detail=_error_response("Parameter Extraction Error", "PARAM_ERROR", f"Failed to extract parameters: {str(e)}")
         )
 
 
@@ -369,18 +502,22 @@ async def generate_insights_only(
     and just need AI analysis.
     """
     try:
-        logger.info(f"Generating insights for query: {query[:100]}...")
+        logger.info("Generating insights for query: %s...", query[:100])
         
-        insights = await ai_service.generate_insights(
-            query=query,
-            parameters=parameters,
-            data_summary=data_summary
-        )
-        
-        recommendations = await ai_service.generate_recommendations(
-            query=query,
-            parameters=parameters,
-            data_summary=data_summary
+        prompt_context = ai_service.build_prompt_context(parameters, data_summary)
+        insights, recommendations = await asyncio.gather(
+            ai_service.generate_insights(
+                query=query,
+                parameters=parameters,
+                data_summary=data_summary,
+                prompt_context=prompt_context
+            ),
+            ai_service.generate_recommendations(
+                query=query,
+                parameters=parameters,
+                data_summary=data_summary,
+                prompt_context=prompt_context
+            )
         )
         
         return {
@@ -393,15 +530,12 @@ async def generate_insights_only(
         
         raise HTTPException(
             status_code=500,
-            detail=jsonable_encoder(ErrorResponse(
-                error="Insight Generation Error",
-                details=[ErrorDetail(message=f"Failed to generate insights: {str(e)}", code="INSIGHT_ERROR")]
-            ))
+            detail=_error_response("Insight Generation Error", "INSIGHT_ERROR", f"Failed to generate insights: {str(e)}")
         )
 
 
 @router.get("/capabilities")
-async def get_ai_capabilities() -> Dict[str, Any]:
+async def get_ai_capabilities(request: Request) -> Response:
     """
     Get information about AI service capabilities.
     
@@ -410,39 +544,13 @@ async def get_ai_capabilities() -> Dict[str, Any]:
     - Supported query types
     - Parameter extraction capabilities
     - Example queries
+    
+    The payload is static, so it is served pre-serialized with an ETag and
+    conditional requests are answered with 304 Not Modified.
     """
-    return {
-        "ai_service_available": ai_service.llm is not None,
-        "supported_parameters": [
-            "location",
-            "bbox",
-            "start_date",
-            "end_date", 
-            "variables",
-            "depth_range",
-            "general_search_term"
-        ],
-        "supported_variables": [
-            "temperature",
-            "salinity", 
-            "pressure",
-            "dissolved_oxygen",
-            "ph",
-            "nitrate",
-            "chlorophyll"
-        ],
-        "example_queries": [
-            "Show me temperature data from the Pacific Ocean in 2023",
-            "Find floats with salinity measurements near 30°N, 140°W",
-            "What are the oxygen levels in the Southern Ocean?",
-            "Compare temperature profiles between 0-1000m depth",
-            "Show recent data from Argo floats in the Atlantic"
-        ],
-        "query_tips": [
-            "Be specific about location (ocean regions, coordinates, or place names)",
-            "Mention time periods for temporal filtering",
-            "Specify variables of interest (temperature, salinity, etc.)",
-            "Include depth ranges for vertical profiling",
-            "Use natural language - the AI will extract parameters"
-        ]
-    }
+    headers = {"ETag": _CAPABILITIES_ETAG, "Cache-Control": "public, max-age=300"}
+    
+    if request.headers.get("if-none-match") == _CAPABILITIES_ETAG:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=_CAPABILITIES_JSON, media_type="application/json", headers=headers)
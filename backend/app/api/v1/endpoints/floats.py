@@ -3,14 +3,18 @@ Float endpoints for oceanographic float management.
 """
 
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Request, Response
+from fastapi.responses import ORJSONResponse
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.database import get_db
-from app.models import Float, Profile
+from app.models import Float, Profile, Measurement
 from app.schemas import (
     FloatDetailSchema,
     FloatSummarySchema, 
@@ -23,18 +27,32 @@ from app.schemas import (
 )
 from app.services.data_ingestion import ingestion_service
 from app.services.geospatial import geospatial_service
+from app.services.cache import cache_service
+from app.pagination import encode_cursor, decode_cursor, cached_table_count
+from app.http_cache import weak_etag, check_not_modified
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Time to live for cached statistics, in seconds
+_STATISTICS_TTL = 3600
+
+# Measurement variables reported in float statistics
+_VARIABLE_NAMES = ("temperature", "salinity", "dissolved_oxygen", "ph")
 
 
 @router.get("/", response_model=PaginatedResponse)
 async def get_floats(
-    page: int = Query(1, ge=1, description="Page number"),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    page: int = Query(1, ge=1, description="Page number (deprecated, use cursor)", deprecated=True),
     size: int = Query(50, ge=1, le=1000, description="Page size"),
     status: Optional[str] = Query(None, description="Filter by float status"),
     wmo_id: Optional[str] = Query(None, description="Filter by WMO ID"),
+    wmo_id_exact: bool = Query(False, description="Match the WMO ID exactly instead of as a substring"),
+    include_total: bool = Query(False, description="Include the total item count"),
     db: AsyncSession = Depends(get_db)
 ) -> PaginatedResponse:
     """
@@ -44,50 +62,73 @@ async def get_floats(
     - Basic metadata (WMO ID, status, institution)
     - Latest position and profile date
     - Profile count statistics
+    
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next
+    page; offset-based ``page`` is kept for backwards compatibility.
     """
     try:
-        # Build base query
-        query = select(Float).options(
-            selectinload(Float.profiles)
-        )
+        # Build base query - profile count and latest position are stored on
+        # the float, so no profile rows are loaded
+        query = select(Float).options(raiseload('*'))
         
-        # Apply filters
+        # Apply filters; substring matches on WMO ID use the trigram index
+        filters = []
         if status:
-            query = query.where(Float.status == status)
+            filters.append(Float.status == status)
         if wmo_id:
-            query = query.where(Float.wmo_id.ilike(f"%{wmo_id}%"))
+            filters.append(Float.wmo_id == wmo_id if wmo_id_exact else Float.wmo_id.ilike(f"%{wmo_id}%"))
         
-        # Get total count
-        count_query = select(func.count(Float.id))
-        if status:
-            count_query = count_query.where(Float.status == status)
-        if wmo_id:
-            count_query = count_query.where(Float.wmo_id.ilike(f"%{wmo_id}%"))
+        if filters:
+            query = query.where(*filters)
         
-        total_result = await db.execute(count_query)
-        total = total_result.scalar()
+        # Revalidate against the newest change in the filtered set before the real query;
+        # the row count is part of the ETag because deleting a float that is not the
+        # most recently updated one leaves max(updated_at) unchanged
+        last_modified_result = await db.execute(
+            select(func.max(Float.updated_at), func.count(Float.id)).where(*filters)
+        )
+        last_modified, row_count = last_modified_result.one()
+        etag = weak_etag(
+            last_modified, row_count, cursor, page, size, status, wmo_id, wmo_id_exact, include_total
+        )
+        check_not_modified(request, response, etag)
+        
+        # Get total count only on request - it costs a full scan of the filter
+        total = None
+        if include_total:
+            if filters:
+                count_query = select(func.count(Float.id)).where(*filters)
+                
+                total_result = await db.execute(count_query)
+                total = total_result.scalar()
+            else:
+                total = await cached_table_count(db, Float.id, "floats")
+        
+        # Get paginated results, seeking past the last row seen when a cursor is given
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor)
+            query = query.where(tuple_(Float.created_at, Float.id) < tuple_(last_created_at, last_id))
+        else:
+            query = query.offset((page - 1) * size)
         
-        # Get paginated results
-        offset = (page - 1) * size
         result = await db.execute(
-            query.offset(offset).limit(size).order_by(Float.created_at.desc())
+            query.limit(size).order_by(Float.created_at.desc(), Float.id.desc())
         )
         floats = result.scalars().all()
         
         # Convert to summary schemas
-        float_summaries = []
-        for float_obj in floats:
-            summary = await geospatial_service._create_float_summary(float_obj)
-            float_summaries.append(summary)
+        float_summaries = [geospatial_service._create_float_summary(float_obj) for float_obj in floats]
         
         return PaginatedResponse(
             items=float_summaries,
             total=total,
             page=page,
             size=size,
-            pages=(total + size - 1) // size if size > 0 else 0
+            next_cursor=encode_cursor(floats[-1].created_at, floats[-1].id) if len(floats) == size else None
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting floats: {e}")
         raise HTTPException(
@@ -96,11 +137,56 @@ async def get_floats(
         )
 
 
+async def _load_profile_measurements(
+    db: AsyncSession,
+    profile_ids: List[int],
+    limit: Optional[int] = None
+) -> Dict[int, List[Measurement]]:
+    """
+    Load measurements for several profiles, grouped by profile ID.
+    
+    Args:
+        db: Database session
+        profile_ids: Profiles to load measurements for
+        limit: Maximum measurements per profile (lowest pressure first), or None for all
+        
+    Returns:
+        Dict mapping profile ID to its measurements ordered by pressure
+    """
+    query = select(Measurement).where(Measurement.profile_id.in_(profile_ids))
+    
+    if limit is not None:
+        # Rank measurements within each profile and keep the first `limit`
+        ranked = (
+            select(
+                Measurement.id,
+                func.row_number().over(
+                    partition_by=Measurement.profile_id,
+                    order_by=Measurement.pressure
+                ).label("position")
+            )
+            .where(Measurement.profile_id.in_(profile_ids))
+            .subquery()
+        )
+        query = query.join(ranked, ranked.c.id == Measurement.id).where(ranked.c.position <= limit)
+    
+    result = await db.execute(query.order_by(Measurement.profile_id, Measurement.pressure))
+    
+    measurements_by_profile: Dict[int, List[Measurement]] = {}
+    for measurement in result.scalars():
+        measurements_by_profile.setdefault(measurement.profile_id, []).append(measurement)
+    
+    return measurements_by_profile
+
+
 @router.get("/{float_id}", response_model=FloatDetailSchema)
 async def get_float(
     float_id: int,
+    request: Request,
+    response: Response,
     include_profiles: bool = Query(True, description="Include profile data"),
     include_measurements: bool = Query(True, description="Include measurement data"),
+    measurement_limit: Optional[int] = Query(None, ge=1, description="Maximum measurements per profile, shallowest first"),
     db: AsyncSession = Depends(get_db)
 ) -> FloatDetailSchema:
     """
@@ -109,96 +195,94 @@ async def get_float(
     Optionally includes:
     - Profile data (timestamps, positions, metadata)
     - Measurement data (temperature, salinity, pressure values)
+    
+    Responses carry a weak ETag; a matching If-None-Match gets 304 before
+    any profiles or measurements are loaded.
     """
-    try:
-        # Build query with appropriate loading
-        query = select(Float).where(Float.id == float_id)
-        
-        if include_profiles:
-            if include_measurements:
-                query = query.options(
-                    selectinload(Float.profiles).selectinload(Profile.measurements)
-                )
-            else:
-                query = query.options(selectinload(Float.profiles))
-        
-        result = await db.execute(query)
-        float_obj = result.scalar_one_or_none()
-        
-        if not float_obj:
-            raise HTTPException(
-                status_code=404,
-                detail={"error": "Not Found", "message": f"Float {float_id} not found"}
-            )
-        
-        # Manually construct the response to avoid greenlet issues
-        profiles_data = []
-        if include_profiles and float_obj.profiles:
-            for profile in float_obj.profiles:
-                measurements_data = []
-                if include_measurements and profile.measurements:
-                    for measurement in profile.measurements:
-                        measurements_data.append(MeasurementSchema(
-                            id=measurement.id,
-                            profile_id=measurement.profile_id,
-                            pressure=measurement.pressure,
-                            depth=measurement.depth,
-                            temperature=measurement.temperature,
-                            salinity=measurement.salinity,
-                            dissolved_oxygen=measurement.dissolved_oxygen,
-                            ph=measurement.ph,
-                            nitrate=measurement.nitrate,
-                            chlorophyll=measurement.chlorophyll,
-                            pressure_qc=measurement.pressure_qc,
-                            temperature_qc=measurement.temperature_qc,
-                            salinity_qc=measurement.salinity_qc,
-                            temperature_adjusted=measurement.temperature_adjusted,
-                            salinity_adjusted=measurement.salinity_adjusted,
-                            measurement_order=measurement.measurement_order,
-                            created_at=measurement.created_at,
-                            updated_at=measurement.updated_at
-                        ))
-                
-                profiles_data.append(ProfileSchema(
-                    id=profile.id,
-                    float_id=profile.float_id,
-                    cycle_number=profile.cycle_number,
-                    profile_id=profile.profile_id,
-                    timestamp=profile.timestamp,
-                    latitude=profile.latitude,
-                    longitude=profile.longitude,
-                    direction=profile.direction,
-                    data_mode=profile.data_mode,
-                    measurements=measurements_data,
-                    created_at=profile.created_at,
-                    updated_at=profile.updated_at
-                ))
-        
-        return FloatDetailSchema(
-            id=float_obj.id,
-            wmo_id=float_obj.wmo_id,
-            deployment_latitude=float_obj.deployment_latitude,
-            deployment_longitude=float_obj.deployment_longitude,
-            platform_type=float_obj.platform_type,
-            institution=float_obj.institution,
-            project_name=float_obj.project_name,
-            pi_name=float_obj.pi_name,
-            status=float_obj.status,
-            deployment_date=float_obj.deployment_date,
-            last_update=float_obj.last_update,
-            profiles=profiles_data,
-            created_at=float_obj.created_at,
-            updated_at=float_obj.updated_at
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting float {float_id}: {e}")
+    result = await db.execute(select(Float).where(Float.id == float_id))
+    float_obj = result.scalar_one_or_none()
+    
+    if not float_obj:
         raise HTTPException(
-            status_code=500,
-            detail={"error": "Database Error", "message": str(e)}
+            status_code=404,
+            detail={"error": "Not Found", "message": f"Float {float_id} not found"}
         )
+    
+    # Adding profiles bumps the float's updated_at, so it versions the whole document
+    etag = weak_etag(float_obj.updated_at, float_obj.id, include_profiles, include_measurements, measurement_limit)
+    check_not_modified(request, response, etag)
+    
+    # Load profiles, then measurements separately so they can be limited per profile
+    profiles: List[Profile] = []
+    if include_profiles:
+        profile_result = await db.execute(select(Profile).where(Profile.float_id == float_id))
+        profiles = profile_result.scalars().all()
+    
+    measurements_by_profile: Dict[int, List[Measurement]] = {}
+    if include_measurements and profiles:
+        measurements_by_profile = await _load_profile_measurements(
+            db, [profile.id for profile in profiles], measurement_limit
+        )
+    
+    # Manually construct the response to avoid greenlet issues
+    profiles_data = []
+    if profiles:
+        for profile in profiles:
+            measurements_data = []
+            if include_measurements:
+                for measurement in measurements_by_profile.get(profile.id, []):
+                    measurements_data.append(MeasurementSchema.model_construct(
+                        id=measurement.id,
+                        profile_id=measurement.profile_id,
+                        pressure=measurement.pressure,
+                        depth=measurement.depth,
+                        temperature=measurement.temperature,
+                        salinity=measurement.salinity,
+                        dissolved_oxygen=measurement.dissolved_oxygen,
+                        ph=measurement.ph,
+                        nitrate=measurement.nitrate,
+                        chlorophyll=measurement.chlorophyll,
+                        pressure_qc=measurement.pressure_qc,
+                        temperature_qc=measurement.temperature_qc,
+                        salinity_qc=measurement.salinity_qc,
+                        temperature_adjusted=measurement.temperature_adjusted,
+                        salinity_adjusted=measurement.salinity_adjusted,
+                        measurement_order=measurement.measurement_order,
+                        created_at=measurement.created_at,
+                        updated_at=measurement.updated_at
+                    ))
+            
+            profiles_data.append(ProfileSchema(
+                id=profile.id,
+                float_id=profile.float_id,
+                cycle_number=profile.cycle_number,
+                profile_id=profile.profile_id,
+                timestamp=profile.timestamp,
+                latitude=profile.latitude,
+                longitude=profile.longitude,
+                direction=profile.direction,
+                data_mode=profile.data_mode,
+                measurements=measurements_data,
+                created_at=profile.created_at,
+                updated_at=profile.updated_at
+            ))
+    
+    return FloatDetailSchema(
+        id=float_obj.id,
+        wmo_id=float_obj.wmo_id,
+        deployment_latitude=float_obj.deployment_latitude,
+        deployment_longitude=float_obj.deployment_longitude,
+        platform_type=float_obj.platform_type,
+        institution=float_obj.institution,
+        project_name=float_obj.project_name,
+        pi_name=float_obj.pi_name,
+        status=float_obj.status,
+        deployment_date=float_obj.deployment_date,
+        last_update=float_obj.last_update,
+        profiles=profiles_data,
+        created_at=float_obj.created_at,
+        updated_at=float_obj.updated_at
+    )
 
 
 @router.get("/wmo/{wmo_id}", response_model=FloatDetailSchema)
@@ -213,37 +297,34 @@ async def get_float_by_wmo(
     
     WMO ID is the standard identifier used in the Argo program.
     """
-    try:
-        # Build query
-        query = select(Float).where(Float.wmo_id == wmo_id)
-        
-        if include_profiles:
-            if include_measurements:
-                query = query.options(
-                    selectinload(Float.profiles).selectinload(Profile.measurements)
-                )
-            else:
-                query = query.options(selectinload(Float.profiles))
-        
-        result = await db.execute(query)
-        float_obj = result.scalar_one_or_none()
-        
-        if not float_obj:
-            raise HTTPException(
-                status_code=404,
-                detail={"error": "Not Found", "message": f"Float with WMO ID {wmo_id} not found"}
+    # Build query
+    query = select(Float).where(Float.wmo_id == wmo_id)
+    
+    if include_profiles:
+        if include_measurements:
+            query = query.options(
+                selectinload(Float.profiles).selectinload(Profile.measurements)
             )
-        
-        return FloatDetailSchema.from_orm(float_obj)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting float by WMO {wmo_id}: {e}")
+        else:
+            query = query.options(selectinload(Float.profiles))
+    
+    result = await db.execute(query)
+    float_obj = result.scalar_one_or_none()
+    
+    if not float_obj:
         raise HTTPException(
-            status_code=500,
-            detail={"error": "Database Error", "message": str(e)}
+            status_code=404,
+            detail={"error": "Not Found", "message": f"Float with WMO ID {wmo_id} not found"}
         )
+    
+    # Relationships that were not requested serialize as empty lists
+    if not include_profiles:
+        set_committed_value(float_obj, "profiles", [])
+    elif not include_measurements:
+        for profile in float_obj.profiles:
+            set_committed_value(profile, "measurements", [])
+    
+    return FloatDetailSchema.from_orm(float_obj)
 
 
 @router.get("/nearby/{latitude}/{longitude}", response_model=List[FloatSummarySchema])
@@ -290,12 +371,13 @@ async def create_float(
     or when ingesting data from external sources.
     """
     try:
-        # Check if float with WMO ID already exists
-        existing_query = select(Float).where(Float.wmo_id == float_data.wmo_id)
-        existing_result = await db.execute(existing_query)
-        existing_float = existing_result.scalar_one_or_none()
-        
-        if existing_float:
+        # Create new float; the unique constraint on wmo_id rejects duplicates
+        float_obj = Float(**float_data.dict())
+        db.add(float_obj)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
             raise HTTPException(
                 status_code=409,
                 detail={
@@ -303,12 +385,9 @@ async def create_float(
                     "message": f"Float with WMO ID {float_data.wmo_id} already exists"
                 }
             )
-        
-        # Create new float
-        float_obj = Float(**float_data.dict())
-        db.add(float_obj)
-        await db.commit()
         await db.refresh(float_obj)
+        set_committed_value(float_obj, "profiles", [])
+        await cache_service.bump_data_version()
         
         logger.info(f"Created new float: {float_obj.wmo_id}")
         return FloatDetailSchema.from_orm(float_obj)
@@ -376,7 +455,7 @@ async def ingest_float_data(
 async def get_float_statistics(
     float_id: int,
     db: AsyncSession = Depends(get_db)
-) -> dict:
+) -> Response:
     """
     Get statistical summary for a float's data.
     
@@ -387,25 +466,47 @@ async def get_float_statistics(
     - Data quality metrics
     """
     try:
-        # Get float with profiles and measurements
-        query = select(Float).where(Float.id == float_id).options(
-            selectinload(Float.profiles).selectinload(Profile.measurements)
+        # Check if float exists
+        float_result = await db.execute(
+            select(Float.wmo_id, Float.updated_at).where(Float.id == float_id)
         )
+        float_row = float_result.first()
         
-        result = await db.execute(query)
-        float_obj = result.scalar_one_or_none()
-        
-        if not float_obj:
+        if float_row is None:
             raise HTTPException(
                 status_code=404,
                 detail={"error": "Not Found", "message": f"Float {float_id} not found"}
             )
         
+        wmo_id = float_row.wmo_id
+        
+        # Serve cached statistics while the float and the ingested data are unchanged
+        data_version = await cache_service.get_data_version()
+        updated_at = float_row.updated_at.timestamp() if float_row.updated_at else 0
+        cache_key = f"floatchat:float_stats:{float_id}:{updated_at}:{data_version}"
+        cached_stats = await cache_service.get_raw(cache_key)
+        if cached_stats is not None:
+            return Response(content=cached_stats, media_type="application/json")
+        
+        # Aggregate profile coverage in the database
+        profile_result = await db.execute(
+            select(
+                func.count(Profile.id).label("profile_count"),
+                func.min(Profile.timestamp).label("start_date"),
+                func.max(Profile.timestamp).label("end_date"),
+                func.min(Profile.latitude).label("min_latitude"),
+                func.max(Profile.latitude).label("max_latitude"),
+                func.min(Profile.longitude).label("min_longitude"),
+                func.max(Profile.longitude).label("max_longitude")
+            ).where(Profile.float_id == float_id)
+        )
+        profile_stats = profile_result.one()
+        
         # Calculate statistics
         stats = {
             "float_id": float_id,
-            "wmo_id": float_obj.wmo_id,
-            "profile_count": len(float_obj.profiles),
+            "wmo_id": wmo_id,
+            "profile_count": profile_stats.profile_count,
             "total_measurements": 0,
             "temporal_coverage": None,
             "spatial_coverage": None,
@@ -414,48 +515,57 @@ async def get_float_statistics(
             "data_quality": {}
         }
         
-        if float_obj.profiles:
+        if profile_stats.profile_count:
             # Temporal coverage
-            timestamps = [p.timestamp for p in float_obj.profiles]
             stats["temporal_coverage"] = {
-                "start_date": min(timestamps),
-                "end_date": max(timestamps),
-                "duration_days": (max(timestamps) - min(timestamps)).days
+                "start_date": profile_stats.start_date,
+                "end_date": profile_stats.end_date,
+                "duration_days": (profile_stats.end_date - profile_stats.start_date).days
             }
             
             # Spatial coverage
-            positions = [(p.latitude, p.longitude) for p in float_obj.profiles]
-            lats, lons = zip(*positions)
             stats["spatial_coverage"] = {
-                "min_latitude": min(lats),
-                "max_latitude": max(lats),
-                "min_longitude": min(lons),
-                "max_longitude": max(lons)
+                "min_latitude": profile_stats.min_latitude,
+                "max_latitude": profile_stats.max_latitude,
+                "min_longitude": profile_stats.min_longitude,
+                "max_longitude": profile_stats.max_longitude
             }
             
-            # Measurement statistics
-            all_measurements = []
-            for profile in float_obj.profiles:
-                all_measurements.extend(profile.measurements)
+            # Measurement statistics, aggregated across all of the float's profiles
+            measurement_result = await db.execute(
+                select(
+                    func.count(Measurement.id).label("total_measurements"),
+                    func.min(Measurement.pressure).label("min_pressure"),
+                    func.max(Measurement.pressure).label("max_pressure"),
+                    func.count(Measurement.temperature).label("temperature"),
+                    func.count(Measurement.salinity).label("salinity"),
+                    func.count(Measurement.dissolved_oxygen).label("dissolved_oxygen"),
+                    func.count(Measurement.ph).label("ph")
+                )
+                .join(Profile, Measurement.profile_id == Profile.id)
+                .where(Profile.float_id == float_id)
+            )
+            measurement_stats = measurement_result.one()
             
-            stats["total_measurements"] = len(all_measurements)
+            stats["total_measurements"] = measurement_stats.total_measurements
             
-            if all_measurements:
-                # Depth range
-                pressures = [m.pressure for m in all_measurements if m.pressure]
-                if pressures:
-                    stats["depth_range"] = {
-                        "min_pressure": min(pressures),
-                        "max_pressure": max(pressures)
-                    }
-                
-                # Variable counts
-                for var in ["temperature", "salinity", "dissolved_oxygen", "ph"]:
-                    count = sum(1 for m in all_measurements if getattr(m, var) is not None)
-                    if count > 0:
-                        stats["variable_counts"][var] = count
+            # Depth range
+            if measurement_stats.min_pressure is not None:
+                stats["depth_range"] = {
+                    "min_pressure": measurement_stats.min_pressure,
+                    "max_pressure": measurement_stats.max_pressure
+                }
+            
+            # Variable counts
+            stats["variable_counts"] = {
+                var: count
+                for var, count in measurement_stats._mapping.items()
+                if var in _VARIABLE_NAMES and count > 0
+            }
         
-        return stats
+        content = orjson.dumps(stats)
+        await cache_service.set_raw(cache_key, content.decode(), _STATISTICS_TTL)
+        return Response(content=content, media_type="application/json")
         
     except HTTPException:
         raise
@@ -3,14 +3,17 @@ Profile endpoints for oceanographic profile data management.
 """
 
 import logging
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, or_, tuple_, lambda_stmt
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.database import get_db
+from app.database import get_db, AsyncSessionLocal
 from app.models import Profile, Float, Measurement
 from app.schemas import (
     ProfileSchema,
@@ -19,15 +22,112 @@ from app.schemas import (
     ErrorResponse
 )
 from app.services.geospatial import geospatial_service
+from app.services.cache import cache_service
+from app.pagination import encode_cursor, decode_cursor, cached_table_count
+from app.http_cache import weak_etag, check_not_modified
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Content type for line-delimited JSON list responses, and rows fetched per batch
+_NDJSON_MEDIA_TYPE = "application/x-ndjson"
+_STREAM_BATCH_SIZE = 200
+
+# Time to live for cached statistics, in seconds
+_STATISTICS_TTL = 3600
+
+# Correlated measurement count for streamed profile summaries
+_MEASUREMENT_COUNT = (
+    select(func.count(Measurement.id))
+    .where(Measurement.profile_id == Profile.id)
+    .correlate(Profile)
+    .scalar_subquery()
+    .label("measurement_count")
+)
+
+# Measurement variables that can be requested by name
+_MEASUREMENT_VARIABLES = ("temperature", "salinity", "dissolved_oxygen", "ph", "nitrate", "chlorophyll")
+
+
+def _filter_profiles(
+    stmt: StatementLambdaElement,
+    float_id: Optional[int],
+    wmo_id: Optional[str],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    min_lat: Optional[float],
+    max_lat: Optional[float],
+    min_lon: Optional[float],
+    max_lon: Optional[float]
+) -> StatementLambdaElement:
+    """
+    Add the profile list filters to a lambda statement.
+    
+    Each filter is a separate lambda, so SQLAlchemy caches the compiled SQL
+    per combination of applied filters and only binds new values per request.
+    """
+    if float_id:
+        stmt += lambda s: s.where(Profile.float_id == float_id)
+    
+    if wmo_id:
+        stmt += lambda s: s.where(Float.wmo_id == wmo_id)
+    
+    if start_date:
+        stmt += lambda s: s.where(Profile.timestamp >= start_date)
+    
+    if end_date:
+        stmt += lambda s: s.where(Profile.timestamp <= end_date)
+    
+    if min_lat is not None:
+        stmt += lambda s: s.where(Profile.latitude >= min_lat)
+    
+    if max_lat is not None:
+        stmt += lambda s: s.where(Profile.latitude <= max_lat)
+    
+    if min_lon is not None:
+        stmt += lambda s: s.where(Profile.longitude >= min_lon)
+    
+    if max_lon is not None:
+        stmt += lambda s: s.where(Profile.longitude <= max_lon)
+    
+    return stmt
+
+
+def _page_profiles(
+    stmt: StatementLambdaElement,
+    cursor_position: Optional[Tuple[datetime, int]],
+    offset: int,
+    size: int
+) -> StatementLambdaElement:
+    """Restrict a lambda statement to one page, newest first."""
+    if cursor_position:
+        last_timestamp, last_id = cursor_position
+        stmt += lambda s: s.where(tuple_(Profile.timestamp, Profile.id) < tuple_(last_timestamp, last_id))
+    else:
+        stmt += lambda s: s.offset(offset)
+    
+    stmt += lambda s: s.limit(size).order_by(Profile.timestamp.desc(), Profile.id.desc())
+    return stmt
+
+
+async def _stream_profile_summaries(stmt: StatementLambdaElement) -> AsyncIterator[bytes]:
+    """
+    Stream profile summaries as NDJSON, fetched in server-side cursor batches.
+    
+    The generator uses its own session because it outlives the request handler.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(stmt, execution_options={"yield_per": _STREAM_BATCH_SIZE})
+        async for row in result.mappings():
+            yield orjson.dumps(dict(row)) + b"\n"
 
 
 @router.get("/", response_model=PaginatedResponse)
 async def get_profiles(
-    page: int = Query(1, ge=1, description="Page number"),
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    page: int = Query(1, ge=1, description="Page number (deprecated, use cursor)", deprecated=True),
     size: int = Query(50, ge=1, le=1000, description="Page size"),
     float_id: Optional[int] = Query(None, description="Filter by float ID"),
     wmo_id: Optional[str] = Query(None, description="Filter by float WMO ID"),
@@ -37,6 +137,7 @@ async def get_profiles(
     max_lat: Optional[float] = Query(None, ge=-90, le=90, description="Maximum latitude"),
     min_lon: Optional[float] = Query(None, ge=-180, le=180, description="Minimum longitude"),
     max_lon: Optional[float] = Query(None, ge=-180, le=180, description="Maximum longitude"),
+    include_total: bool = Query(False, description="Include the total item count"),
     db: AsyncSession = Depends(get_db)
 ) -> PaginatedResponse:
     """
@@ -46,67 +147,61 @@ async def get_profiles(
     - Float ID or WMO ID
     - Date range
     - Geographic bounding box
+    
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next
+    page; offset-based ``page`` is kept for backwards compatibility.
+    
+    With ``Accept: application/x-ndjson`` the page's items are streamed one
+    JSON object per line instead (no envelope, total or cursor).
     """
     try:
-        # Build base query
-        query = select(Profile).join(Float)
-        count_query = select(func.count(Profile.id)).select_from(Profile).join(Float)
-        
-        # Apply filters
-        filters = []
-        
-        if float_id:
-            filters.append(Profile.float_id == float_id)
-        
-        if wmo_id:
-            filters.append(Float.wmo_id == wmo_id)
-        
-        if start_date:
-            filters.append(Profile.timestamp >= start_date)
-        
-        if end_date:
-            filters.append(Profile.timestamp <= end_date)
-        
-        if min_lat is not None:
-            filters.append(Profile.latitude >= min_lat)
-        
-        if max_lat is not None:
-            filters.append(Profile.latitude <= max_lat)
-        
-        if min_lon is not None:
-            filters.append(Profile.longitude >= min_lon)
-        
-        if max_lon is not None:
-            filters.append(Profile.longitude <= max_lon)
+        filter_args = (float_id, wmo_id, start_date, end_date, min_lat, max_lat, min_lon, max_lon)
+        cursor_position = decode_cursor(cursor) if cursor else None
+        offset = (page - 1) * size
         
-        if filters:
-            query = query.where(and_(*filters))
-            count_query = count_query.where(and_(*filters))
+        # Stream summaries with measurement counts joined into the same query
+        if _NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            stmt = lambda_stmt(lambda: select(
+                Profile.id,
+                Profile.cycle_number,
+                Profile.timestamp,
+                Profile.latitude,
+                Profile.longitude,
+                _MEASUREMENT_COUNT
+            ).join(Float))
+            stmt = _page_profiles(_filter_profiles(stmt, *filter_args), cursor_position, offset, size)
+            return StreamingResponse(_stream_profile_summaries(stmt), media_type=_NDJSON_MEDIA_TYPE)
+        
+        # Get total count only on request - it costs a full scan of the filter
+        total = None
+        if include_total:
+            if any(arg is not None for arg in filter_args):
+                count_stmt = lambda_stmt(lambda: select(func.count(Profile.id)).select_from(Profile).join(Float))
+                total_result = await db.execute(_filter_profiles(count_stmt, *filter_args))
+                total = total_result.scalar()
+            else:
+                total = await cached_table_count(db, Profile.id, "profiles")
         
-        # Get total count
-        total_result = await db.execute(count_query)
-        total = total_result.scalar()
+        # Get paginated results, seeking past the last row seen when a cursor is given
+        stmt = lambda_stmt(lambda: select(Profile).join(Float))
+        stmt = _page_profiles(_filter_profiles(stmt, *filter_args), cursor_position, offset, size)
         
-        # Get paginated results
-        offset = (page - 1) * size
-        result = await db.execute(
-            query.offset(offset).limit(size).order_by(Profile.timestamp.desc())
-        )
+        result = await db.execute(stmt)
         profiles = result.scalars().all()
         
+        # Count measurements for the whole page at once
+        measurement_counts = await geospatial_service._count_measurements(db, [p.id for p in profiles])
+        
         # Convert to summary schemas
         profile_summaries = []
         for profile in profiles:
-            # Count measurements
-            measurement_count = await geospatial_service._count_measurements(db, profile.id)
-            
-            summary = ProfileSummary(
+            summary = ProfileSummary.model_construct(
                 id=profile.id,
                 cycle_number=profile.cycle_number,
                 timestamp=profile.timestamp,
                 latitude=profile.latitude,
                 longitude=profile.longitude,
-                measurement_count=measurement_count
+                measurement_count=measurement_counts.get(profile.id, 0)
             )
             profile_summaries.append(summary)
         
@@ -114,9 +209,12 @@ async def get_profiles(
             items=profile_summaries,
             total=total,
             page=page,
-            size=size
+            size=size,
+            next_cursor=encode_cursor(profiles[-1].timestamp, profiles[-1].id) if len(profiles) == size else None
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting profiles: {e}")
         raise HTTPException(
@@ -128,6 +226,8 @@ async def get_profiles(
 @router.get("/{profile_id}", response_model=ProfileSchema)
 async def get_profile(
     profile_id: int,
+    request: Request,
+    response: Response,
     include_measurements: bool = Query(True, description="Include measurement data"),
     db: AsyncSession = Depends(get_db)
 ) -> ProfileSchema:
@@ -135,34 +235,31 @@ async def get_profile(
     Get detailed information about a specific profile.
     
     Optionally includes all measurement data (temperature, salinity, etc.)
-    for the profile.
+    for the profile. Responses carry a weak ETag; a matching If-None-Match
+    gets 304 before any measurements are loaded.
     """
-    try:
-        # Build query
-        query = select(Profile).where(Profile.id == profile_id)
-        
-        if include_measurements:
-            query = query.options(selectinload(Profile.measurements))
-        
-        result = await db.execute(query)
-        profile = result.scalar_one_or_none()
-        
-        if not profile:
-            raise HTTPException(
-                status_code=404,
-                detail={"error": "Not Found", "message": f"Profile {profile_id} not found"}
-            )
-        
-        return ProfileSchema.from_orm(profile)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting profile {profile_id}: {e}")
+    result = await db.execute(select(Profile).where(Profile.id == profile_id))
+    profile = result.scalar_one_or_none()
+    
+    if not profile:
         raise HTTPException(
-            status_code=500,
-            detail={"error": "Database Error", "message": str(e)}
+            status_code=404,
+            detail={"error": "Not Found", "message": f"Profile {profile_id} not found"}
+        )
+    
+    etag = weak_etag(profile.updated_at, profile.id, include_measurements)
+    check_not_modified(request, response, etag)
+    
+    # Attach measurements without a lazy load (empty when not requested)
+    measurements = []
+    if include_measurements:
+        measurement_result = await db.execute(
+            select(Measurement).where(Measurement.profile_id == profile_id)
         )
+        measurements = measurement_result.scalars().all()
+    set_committed_value(profile, "measurements", measurements)
+    
+    return ProfileSchema.from_orm(profile)
 
 
 @router.get("/region/bbox", response_model=List[ProfileSummary])
@@ -179,7 +276,7 @@ async def get_profiles_in_bbox(
     """
     Get profiles within a geographic bounding box.
     
-    Uses PostGIS spatial queries for efficient geographic filtering.
+    Uses a GiST-indexed point-in-box search for efficient geographic filtering.
     Optionally filters by date range.
     """
     try:
@@ -226,86 +323,83 @@ async def get_profile_measurements(
     - Variable type (temperature, salinity, etc.)
     - Pressure/depth range
     """
-    try:
-        # Check if profile exists
-        profile_result = await db.execute(
-            select(Profile).where(Profile.id == profile_id)
+    # Check if profile exists
+    profile_result = await db.execute(
+        select(Profile).where(Profile.id == profile_id)
+    )
+    profile = profile_result.scalar_one_or_none()
+    
+    if not profile:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "Not Found", "message": f"Profile {profile_id} not found"}
         )
-        profile = profile_result.scalar_one_or_none()
-        
-        if not profile:
+    
+    # Select only the requested variable and skip rows where it is missing
+    if variable:
+        if variable not in _MEASUREMENT_VARIABLES:
             raise HTTPException(
-                status_code=404,
-                detail={"error": "Not Found", "message": f"Profile {profile_id} not found"}
+                status_code=400,
+                detail={
+                    "error": "Invalid Variable",
+                    "message": f"Unknown variable '{variable}'. Supported: {', '.join(_MEASUREMENT_VARIABLES)}"
+                }
             )
         
-        # Build measurement query
+        variable_column = getattr(Measurement, variable)
+        query = select(
+            Measurement.id,
+            Measurement.pressure,
+            Measurement.depth,
+            Measurement.measurement_order,
+            variable_column
+        ).where(
+            Measurement.profile_id == profile_id,
+            variable_column.isnot(None)
+        )
+    else:
         query = select(Measurement).where(Measurement.profile_id == profile_id)
+    
+    # Apply pressure filters
+    if min_pressure is not None:
+        query = query.where(Measurement.pressure >= min_pressure)
+    
+    if max_pressure is not None:
+        query = query.where(Measurement.pressure <= max_pressure)
+    
+    # Order by pressure (depth)
+    query = query.order_by(Measurement.pressure)
+    
+    result = await db.execute(query)
+    
+    if variable:
+        return [dict(row) for row in result.mappings()]
+    
+    # Convert to dictionaries with all available variables
+    measurement_data = []
+    for measurement in result.scalars():
+        data = {
+            "id": measurement.id,
+            "pressure": measurement.pressure,
+            "depth": measurement.depth,
+            "measurement_order": measurement.measurement_order
+        }
         
-        # Apply pressure filters
-        if min_pressure is not None:
-            query = query.where(Measurement.pressure >= min_pressure)
-        
-        if max_pressure is not None:
-            query = query.where(Measurement.pressure <= max_pressure)
-        
-        # Order by pressure (depth)
-        query = query.order_by(Measurement.pressure)
-        
-        result = await db.execute(query)
-        measurements = result.scalars().all()
-        
-        # Convert to dictionaries and optionally filter by variable
-        measurement_data = []
-        for measurement in measurements:
-            data = {
-                "id": measurement.id,
-                "pressure": measurement.pressure,
-                "depth": measurement.depth,
-                "measurement_order": measurement.measurement_order
-            }
-            
-            # Add variables
-            variables = {
-                "temperature": measurement.temperature,
-                "salinity": measurement.salinity,
-                "dissolved_oxygen": measurement.dissolved_oxygen,
-                "ph": measurement.ph,
-                "nitrate": measurement.nitrate,
-                "chlorophyll": measurement.chlorophyll
-            }
-            
-            # Filter by specific variable if requested
-            if variable:
-                if variable in variables and variables[variable] is not None:
-                    data[variable] = variables[variable]
-                else:
-                    continue  # Skip this measurement if variable not available
-            else:
-                # Include all available variables
-                for var_name, var_value in variables.items():
-                    if var_value is not None:
-                        data[var_name] = var_value
-            
-            measurement_data.append(data)
-        
-        return measurement_data
+        for var_name in _MEASUREMENT_VARIABLES:
+            var_value = getattr(measurement, var_name)
+            if var_value is not None:
+                data[var_name] = var_value
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting measurements for profile {profile_id}: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail={"error": "Database Error", "message": str(e)}
-        )
+        measurement_data.append(data)
+    
+    return measurement_data
 
 
 @router.get("/{profile_id}/statistics")
 async def get_profile_statistics(
     profile_id: int,
     db: AsyncSession = Depends(get_db)
-) -> dict:
+) -> Response:
     """
     Get statistical summary for a profile's measurements.
     
@@ -316,9 +410,7 @@ async def get_profile_statistics(
     try:
         # Check if profile exists
         profile_result = await db.execute(
-            select(Profile).where(Profile.id == profile_id).options(
-                selectinload(Profile.measurements)
-            )
+            select(Profile).where(Profile.id == profile_id)
         )
         profile = profile_result.scalar_one_or_none()
         
@@ -328,7 +420,37 @@ async def get_profile_statistics(
                 detail={"error": "Not Found", "message": f"Profile {profile_id} not found"}
             )
         
-        measurements = profile.measurements
+        # Serve cached statistics while the profile and the ingested data are unchanged
+        data_version = await cache_service.get_data_version()
+        updated_at = profile.updated_at.timestamp() if profile.updated_at else 0
+        cache_key = f"floatchat:profile_stats:{profile_id}:{updated_at}:{data_version}"
+        cached_stats = await cache_service.get_raw(cache_key)
+        if cached_stats is not None:
+            return Response(content=cached_stats, media_type="application/json")
+        
+        # Aggregate every variable in a single query
+        variables = _MEASUREMENT_VARIABLES
+        columns = [
+            func.count(Measurement.id).label("measurement_count"),
+            func.count(Measurement.pressure).label("pressure_count"),
+            func.min(Measurement.pressure).label("min_pressure"),
+            func.max(Measurement.pressure).label("max_pressure")
+        ]
+        for var_name in variables:
+            column = getattr(Measurement, var_name)
+            columns.extend([
+                func.count(column).label(f"{var_name}_count"),
+                func.min(column).label(f"{var_name}_min"),
+                func.max(column).label(f"{var_name}_max"),
+                func.avg(column).label(f"{var_name}_mean"),
+                func.stddev_samp(column).label(f"{var_name}_stddev"),
+                func.percentile_cont(0.5).within_group(column.asc()).label(f"{var_name}_median")
+            ])
+        
+        aggregate_result = await db.execute(
+            select(*columns).where(Measurement.profile_id == profile_id)
+        )
+        aggregates = aggregate_result.one()._mapping
         
         stats = {
             "profile_id": profile_id,
@@ -336,43 +458,39 @@ async def get_profile_statistics(
             "timestamp": profile.timestamp,
             "latitude": profile.latitude,
             "longitude": profile.longitude,
-            "measurement_count": len(measurements),
+            "measurement_count": aggregates["measurement_count"],
             "variables": {}
         }
         
-        if measurements:
-            # Pressure/depth statistics
-            pressures = [m.pressure for m in measurements if m.pressure is not None]
-            if pressures:
-                stats["depth_range"] = {
-                    "min_pressure": min(pressures),
-                    "max_pressure": max(pressures),
-                    "pressure_count": len(pressures)
-                }
-            
-            # Variable statistics
-            variables = ["temperature", "salinity", "dissolved_oxygen", "ph", "nitrate", "chlorophyll"]
+        # Pressure/depth statistics
+        if aggregates["pressure_count"]:
+            stats["depth_range"] = {
+                "min_pressure": aggregates["min_pressure"],
+                "max_pressure": aggregates["max_pressure"],
+                "pressure_count": aggregates["pressure_count"]
+            }
+        
+        # Variable statistics
+        for var_name in variables:
+            count = aggregates[f"{var_name}_count"]
             
-            for var_name in variables:
-                values = [getattr(m, var_name) for m in measurements if getattr(m, var_name) is not None]
+            if count:
+                var_stats = {
+                    "count": count,
+                    "min": aggregates[f"{var_name}_min"],
+                    "max": aggregates[f"{var_name}_max"],
+                    "mean": aggregates[f"{var_name}_mean"]
+                }
                 
-                if values:
-                    import statistics
-                    
-                    var_stats = {
-                        "count": len(values),
-                        "min": min(values),
-                        "max": max(values),
-                        "mean": statistics.mean(values)
-                    }
-                    
-                    if len(values) > 1:
-                        var_stats["stddev"] = statistics.stdev(values)
-                        var_stats["median"] = statistics.median(values)
-                    
-                    stats["variables"][var_name] = var_stats
+                if count > 1:
+                    var_stats["stddev"] = aggregates[f"{var_name}_stddev"]
+                    var_stats["median"] = aggregates[f"{var_name}_median"]
+                
+                stats["variables"][var_name] = var_stats
         
-        return stats
+        content = orjson.dumps(stats)
+        await cache_service.set_raw(cache_key, content.decode(), _STATISTICS_TTL)
+        return Response(content=content, media_type="application/json")
         
     except HTTPException:
         raise
@@ -418,18 +536,19 @@ async def get_latest_profiles(
         result = await db.execute(query)
         profiles = result.scalars().all()
         
+        # Count measurements for all profiles at once
+        measurement_counts = await geospatial_service._count_measurements(db, [p.id for p in profiles])
+        
         # Convert to summaries
         profile_summaries = []
         for profile in profiles:
-            measurement_count = await geospatial_service._count_measurements(db, profile.id)
-            
-            summary = ProfileSummary(
+            summary = ProfileSummary.model_construct(
                 id=profile.id,
                 cycle_number=profile.cycle_number,
                 timestamp=profile.timestamp,
                 latitude=profile.latitude,
                 longitude=profile.longitude,
-                measurement_count=measurement_count
+                measurement_count=measurement_counts.get(profile.id, 0)
             )
             profile_summaries.append(summary)
         
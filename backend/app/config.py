@@ -2,56 +2,120 @@
 Application configuration management.
 """
 
+import functools
+import json
 import os
+from dataclasses import dataclass, field
 from typing import List, Optional
-from pydantic_settings import BaseSettings
-from pydantic import validator
+from dotenv import load_dotenv
 
 
-class Settings(BaseSettings):
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable."""
+    value = os.environ.get(name)
+    return default if value is None else value.strip().lower() in _TRUE_VALUES
+
+
+def _env_required(name: str) -> str:
+    """Read an environment variable that has no default."""
+    value = os.environ.get(name)
+    if not value:
+        raise ValueError(f"{name} environment variable is required")
+    return value
+
+
+def _env_list(name: str, default: List[str]) -> List[str]:
+    """Read a list from a JSON array or a comma-separated environment variable."""
+    value = os.environ.get(name)
+    if value is None:
+        return list(default)
+    if value.strip().startswith("["):
+        return json.loads(value)
+    return [i.strip() for i in value.split(",")]
+
+
+@dataclass(frozen=True)
+class Settings:
     """Application settings."""
-    
+
+    # Database
+    DATABASE_URL: str
+
+    # Security
+    SECRET_KEY: str
+
     # Application
     APP_NAME: str = "FloatChat"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
-    
-    # Database
-    DATABASE_URL: str
-    
+
     # AI/LLM
     GROQ_API_KEY: Optional[str] = None
     OPENAI_API_KEY: Optional[str] = None
-    
+
     # Oceanographic Data Sources
     FTP_HOST: str = "ftp.ifremer.fr"
     FTP_PATH: str = "/ifremer/argo/dac/"
     ARGO_DATA_URL: str = "https://data-argo.ifremer.fr"
-    
-    # Security
-    SECRET_KEY: str
+
+    # Token signing
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    
+
     # CORS
-    CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8080"]
-    
+    CORS_ORIGINS: List[str] = field(default_factory=lambda: ["http://localhost:3000", "http://localhost:8080"])
+
     # Redis
     REDIS_URL: Optional[str] = None
-    
+    REDIS_MAX_CONNECTIONS: int = 50
+
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "logs/floatchat.log"
-    
-    @validator('CORS_ORIGINS', pre=True)
-    def assemble_cors_origins(cls, v):
-        if isinstance(v, str):
-            return [i.strip() for i in v.split(",")]
-        return v
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-
-
-settings = Settings()
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Build settings from environment variables and the local .env file.
+
+        Returns:
+            Settings: Parsed application settings
+        """
+        load_dotenv(".env")
+        defaults = cls.__dataclass_fields__
+
+        return cls(
+            DATABASE_URL=_env_required("DATABASE_URL"),
+            SECRET_KEY=_env_required("SECRET_KEY"),
+            APP_NAME=os.environ.get("APP_NAME", defaults["APP_NAME"].default),
+            APP_VERSION=os.environ.get("APP_VERSION", defaults["APP_VERSION"].default),
+            DEBUG=_env_bool("DEBUG", defaults["DEBUG"].default),
+            GROQ_API_KEY=os.environ.get("GROQ_API_KEY"),
+            OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY"),
+            FTP_HOST=os.environ.get("FTP_HOST", defaults["FTP_HOST"].default),
+            FTP_PATH=os.environ.get("FTP_PATH", defaults["FTP_PATH"].default),
+            ARGO_DATA_URL=os.environ.get("ARGO_DATA_URL", defaults["ARGO_DATA_URL"].default),
+            ALGORITHM=os.environ.get("ALGORITHM", defaults["ALGORITHM"].default),
+            ACCESS_TOKEN_EXPIRE_MINUTES=int(
+                os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", defaults["ACCESS_TOKEN_EXPIRE_MINUTES"].default)
+            ),
+            CORS_ORIGINS=_env_list("CORS_ORIGINS", defaults["CORS_ORIGINS"].default_factory()),
+            REDIS_URL=os.environ.get("REDIS_URL"),
+            REDIS_MAX_CONNECTIONS=int(
+                os.environ.get("REDIS_MAX_CONNECTIONS", defaults["REDIS_MAX_CONNECTIONS"].default)
+            ),
+            LOG_LEVEL=os.environ.get("LOG_LEVEL", defaults["LOG_LEVEL"].default),
+            LOG_FILE=os.environ.get("LOG_FILE", defaults["LOG_FILE"].default),
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Get the process-wide settings, parsed once."""
+    return Settings.from_env()
+
+
+settings = get_settings()
@@ -2,57 +2,231 @@
 CRUD operations for FloatChat backend.
 """
 
+import functools
+import io
 import logging
-from typing import Optional, List, Dict, Any
+import math
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Tuple
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, and_, case, exists, text, cast, bindparam, Float as FloatType
 from sqlalchemy.orm import selectinload, joinedload
 
+from app.database import AsyncSessionLocal
 from app.models import Float, Profile, Measurement
+from app.services.geospatial import profile_in_bbox
+from app.services.cache import cache_service, make_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Profiles fetched per server-side cursor batch when streaming
+_PROFILE_STREAM_BATCH_SIZE = 50
 
-async def get_float_data_by_wmo_id(db: AsyncSession, wmo_id: str) -> Optional[Float]:
+# Measurement columns by name, resolved once instead of per lookup
+_MEASUREMENT_COLUMNS = {column.key: column for column in Measurement.__table__.columns}
+
+# Raw measurement values of one float for binary COPY; NULLs become NaN so
+# every row has the same width
+_MEASUREMENT_ARRAYS_SQL = (
+    "SELECT m.pressure, "
+    "COALESCE(m.temperature, 'NaN'::float8), "
+    "COALESCE(m.salinity, 'NaN'::float8) "
+    "FROM measurements m "
+    "JOIN profiles p ON p.id = m.profile_id "
+    "JOIN floats f ON f.id = p.float_id "
+    "WHERE f.wmo_id = $1"
+)
+
+# Binary COPY tuple layout: field count, then (length, float8) per column
+_MEASUREMENT_ARRAYS_DTYPE = np.dtype([
+    ("field_count", ">i2"),
+    ("pressure_length", ">i4"), ("pressure", ">f8"),
+    ("temperature_length", ">i4"), ("temperature", ">f8"),
+    ("salinity_length", ">i4"), ("salinity", ">f8"),
+])
+
+# Time to live for cached per-float lookups, in seconds
+_LOOKUP_CACHE_TTL = 300
+
+# Anomaly baselines cover a 30-day window keyed by day, so they keep for a day
+_ANOMALY_DATA_CACHE_TTL = 24 * 60 * 60
+
+# Latest profile position of one float; an index-only scan of ix_profiles_float_id_timestamp
+_LATEST_LOCATION_SQL = text(
+    "SELECT f.wmo_id, p.latitude, p.longitude, p.timestamp "
+    "FROM floats f JOIN profiles p ON p.float_id = f.id "
+    "WHERE f.wmo_id = :wmo_id "
+    "ORDER BY p.timestamp DESC LIMIT 1"
+)
+
+# Latest profile position of each of several floats (one DISTINCT ON pass over
+# ix_profiles_float_id_timestamp)
+_LATEST_LOCATIONS_SQL = text(
+    "SELECT DISTINCT ON (p.float_id) f.wmo_id, p.latitude, p.longitude, p.timestamp "
+    "FROM floats f JOIN profiles p ON p.float_id = f.id "
+    "WHERE f.wmo_id = ANY(:wmo_ids) "
+    "ORDER BY p.float_id, p.timestamp DESC"
+)
+
+# Float metadata with profile count and latest profile date
+_FLOAT_SUMMARY_STMT = (
+    select(
+        Float.id,
+        Float.wmo_id,
+        Float.status,
+        Float.platform_type,
+        Float.institution,
+        Float.deployment_latitude,
+        Float.deployment_longitude,
+        Float.last_update,
+        func.count(Profile.id).label('profile_count'),
+        func.max(Profile.timestamp).label('latest_profile_date')
+    )
+    .outerjoin(Profile, Float.id == Profile.float_id)
+    .where(Float.wmo_id == bindparam('wmo_id'))
+    .group_by(Float.id)
+)
+
+# Whether a float exists; stops at the first match on the unique wmo_id index
+_FLOAT_EXISTS_STMT = select(exists().where(Float.wmo_id == bindparam('wmo_id')))
+
+# Measurement statistics; aggregates are cast to double precision so rows
+# carry plain floats (NULL when there are no values)
+_MEASUREMENT_STATISTICS_STMT = (
+    select(
+        func.count(Measurement.id).label('total_measurements'),
+        cast(func.min(Measurement.pressure), FloatType).label('min_pressure'),
+        cast(func.max(Measurement.pressure), FloatType).label('max_pressure'),
+        cast(func.avg(Measurement.temperature), FloatType).label('avg_temperature'),
+        cast(func.min(Measurement.temperature), FloatType).label('min_temperature'),
+        cast(func.max(Measurement.temperature), FloatType).label('max_temperature'),
+        cast(func.avg(Measurement.salinity), FloatType).label('avg_salinity'),
+        cast(func.min(Measurement.salinity), FloatType).label('min_salinity'),
+        cast(func.max(Measurement.salinity), FloatType).label('max_salinity'),
+        func.count(Measurement.temperature).label('temp_count'),
+        func.count(Measurement.salinity).label('sal_count')
+    )
+    .join(Profile, Measurement.profile_id == Profile.id)
+    .join(Float, Profile.float_id == Float.id)
+    .where(Float.wmo_id == bindparam('wmo_id'))
+)
+
+# Placeholder WMO ID used when warming the statement cache at startup
+_WARMUP_WMO_ID = "__warmup__"
+
+# Redis set of WMO IDs known to exist in the database
+_KNOWN_WMO_IDS_KEY = "floatchat:known_wmo_ids"
+
+
+def _cached_by_wmo_id(namespace: str, datetime_fields: Tuple[str, ...] = ()) -> Callable:
     """
-    Fetch a Float object with all related Profiles and Measurements by WMO ID.
+    Read-through Redis cache for per-float lookups keyed by WMO ID.
     
-    Uses eager loading to avoid N+1 queries and fetch all related data in a single query.
+    Keys include the data version, so ingestion and float creation invalidate
+    them. Lookups that find nothing are not cached.
+    
+    Args:
+        namespace: Key prefix for this lookup
+        datetime_fields: Result keys holding datetimes, restored after JSON decoding
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(db: AsyncSession, wmo_id: str) -> Optional[Dict[str, Any]]:
+            if not cache_service.is_available():
+                return await func(db, wmo_id)
+            
+            data_version = await cache_service.get_data_version()
+            key = f"floatchat:{namespace}:{data_version}:{wmo_id}"
+            cached = await cache_service.get_json(key)
+            if cached is not None:
+                for field in datetime_fields:
+                    if cached.get(field):
+                        cached[field] = datetime.fromisoformat(cached[field])
+                return cached
+            
+            result = await func(db, wmo_id)
+            if result is not None:
+                await cache_service.set_json(key, result, _LOOKUP_CACHE_TTL)
+            return result
+        
+        return wrapper
+    
+    return decorator
+
+
+async def warm_statement_cache() -> None:
+    """
+    Execute the module-level CRUD statements once so their compiled SQL is cached.
+    
+    Uses a WMO ID that matches nothing and rolls back, so no data is read or changed.
+    """
+    async with AsyncSessionLocal() as session:
+        for statement in (_FLOAT_SUMMARY_STMT, _FLOAT_EXISTS_STMT, _MEASUREMENT_STATISTICS_STMT, _LATEST_LOCATION_SQL):
+            await session.execute(statement, {"wmo_id": _WARMUP_WMO_ID})
+        await session.rollback()
+
+
+async def get_float_data_by_wmo_id(
+    db: AsyncSession,
+    wmo_id: str,
+    load_measurements: bool = False
+) -> Optional[Float]:
+    """
+    Fetch a Float object by WMO ID together with its profile and measurement counts.
+    
+    The counts are computed in the database and stored on the returned object as
+    ``_profile_count`` and ``_measurement_count``. Profiles and their measurements
+    are only loaded (with batched selectin queries) when requested.
     
     Args:
         db: Database session
         wmo_id: WMO identifier of the float
+        load_measurements: Whether to eagerly load all profiles and measurements
         
     Returns:
-        Float object with all relationships loaded, or None if not found
+        Float object, or None if not found
     """
     try:
         logger.info(f"Fetching float data for WMO ID: {wmo_id}")
         
-        # Build query with eager loading of all relationships
-        query = select(Float).where(Float.wmo_id == wmo_id).options(
-            selectinload(Float.profiles).selectinload(Profile.measurements)
+        # Count measurements in the database instead of loading them to take their length
+        measurement_count = (
+            select(func.count(Measurement.id))
+            .join(Profile, Measurement.profile_id == Profile.id)
+            .where(Profile.float_id == Float.id)
+            .correlate(Float)
+            .scalar_subquery()
         )
+        query = select(Float, measurement_count.label('measurement_count')).where(Float.wmo_id == wmo_id)
+        
+        if load_measurements:
+            query = query.options(
+                selectinload(Float.profiles).selectinload(Profile.measurements)
+            )
         
         result = await db.execute(query)
-        float_obj = result.scalar_one_or_none()
+        row = result.first()
         
-        if float_obj:
-            logger.info(f"Found float {wmo_id} with {len(float_obj.profiles)} profiles")
-            
-            # Log measurement counts for debugging
-            total_measurements = sum(len(profile.measurements) for profile in float_obj.profiles)
-            logger.info(f"Float {wmo_id} has {total_measurements} total measurements")
-        else:
-            logger.warning(f"Float with WMO ID {wmo_id} not found")
+        if row:
+            float_obj = row.Float
+            float_obj._profile_count = float_obj.profile_count
+            float_obj._measurement_count = row.measurement_count
+            logger.info(
+                f"Found float {wmo_id} with {float_obj._profile_count} profiles "
+                f"and {float_obj._measurement_count} total measurements"
+            )
+            return float_obj
         
-        return float_obj
+        logger.warning(f"Float with WMO ID {wmo_id} not found")
+        return None
         
     except Exception as e:
         logger.error(f"Error fetching float data for WMO ID {wmo_id}: {e}")
         raise
 
 
+@_cached_by_wmo_id("float_location", datetime_fields=("timestamp",))
 async def get_latest_float_location(db: AsyncSession, wmo_id: str) -> Optional[Dict[str, Any]]:
     """
     Get the most recent location of a float by WMO ID.
@@ -70,15 +244,7 @@ async def get_latest_float_location(db: AsyncSession, wmo_id: str) -> Optional[D
         logger.info(f"Fetching latest location for WMO ID: {wmo_id}")
         
         # Query for the most recent profile of the specified float
-        query = (
-            select(Float.wmo_id, Profile.latitude, Profile.longitude, Profile.timestamp)
-            .join(Profile, Float.id == Profile.float_id)
-            .where(Float.wmo_id == wmo_id)
-            .order_by(desc(Profile.timestamp))
-            .limit(1)
-        )
-        
-        result = await db.execute(query)
+        result = await db.execute(_LATEST_LOCATION_SQL, {"wmo_id": wmo_id})
         row = result.first()
         
         if row:
@@ -99,6 +265,35 @@ async def get_latest_float_location(db: AsyncSession, wmo_id: str) -> Optional[D
         raise
 
 
+async def get_latest_float_locations(db: AsyncSession, wmo_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get the most recent locations of several floats in one query.
+    
+    Args:
+        db: Database session
+        wmo_ids: WMO identifiers of the floats
+        
+    Returns:
+        Dictionary mapping each found WMO ID to its wmo_id, latitude, longitude and timestamp
+    """
+    try:
+        if not wmo_ids:
+            return {}
+        
+        logger.info(f"Fetching latest locations for {len(wmo_ids)} floats")
+        
+        result = await db.execute(_LATEST_LOCATIONS_SQL, {"wmo_ids": list(wmo_ids)})
+        locations = {row["wmo_id"]: dict(row) for row in result.mappings()}
+        
+        logger.info(f"Found latest locations for {len(locations)} of {len(wmo_ids)} floats")
+        return locations
+        
+    except Exception as e:
+        logger.error(f"Error fetching latest locations for {len(wmo_ids)} floats: {e}")
+        raise
+
+
+@_cached_by_wmo_id("float_summary", datetime_fields=("last_update", "latest_profile_date"))
 async def get_float_summary_by_wmo_id(db: AsyncSession, wmo_id: str) -> Optional[Dict[str, Any]]:
     """
     Get summary information for a float by WMO ID.
@@ -114,25 +309,7 @@ async def get_float_summary_by_wmo_id(db: AsyncSession, wmo_id: str) -> Optional
         logger.info(f"Fetching float summary for WMO ID: {wmo_id}")
         
         # Query for float with profile count and latest profile date
-        query = (
-            select(
-                Float.id,
-                Float.wmo_id,
-                Float.status,
-                Float.platform_type,
-                Float.institution,
-                Float.deployment_latitude,
-                Float.deployment_longitude,
-                Float.last_update,
-                func.count(Profile.id).label('profile_count'),
-                func.max(Profile.timestamp).label('latest_profile_date')
-            )
-            .outerjoin(Profile, Float.id == Profile.float_id)
-            .where(Float.wmo_id == wmo_id)
-            .group_by(Float.id)
-        )
-        
-        result = await db.execute(query)
+        result = await db.execute(_FLOAT_SUMMARY_STMT, {"wmo_id": wmo_id})
         row = result.first()
         
         if row:
@@ -164,9 +341,13 @@ async def get_float_profiles_by_wmo_id(
     wmo_id: str, 
     limit: int = 100,
     include_measurements: bool = False
-) -> List[Profile]:
+) -> AsyncIterator[Profile]:
     """
-    Get profiles for a float by WMO ID.
+    Stream profiles for a float by WMO ID, newest first.
+    
+    Profiles are fetched from a server-side cursor in batches of
+    ``_PROFILE_STREAM_BATCH_SIZE``; with ``include_measurements`` each batch
+    loads its measurements with one IN query.
     
     Args:
         db: Database session
@@ -174,8 +355,8 @@ async def get_float_profiles_by_wmo_id(
         limit: Maximum number of profiles to return
         include_measurements: Whether to include measurement data
         
-    Returns:
-        List of Profile objects
+    Yields:
+        Profile objects
     """
     try:
         logger.info(f"Fetching profiles for WMO ID: {wmo_id} (limit: {limit})")
@@ -187,16 +368,19 @@ async def get_float_profiles_by_wmo_id(
             .where(Float.wmo_id == wmo_id)
             .order_by(desc(Profile.timestamp))
             .limit(limit)
+            .execution_options(yield_per=_PROFILE_STREAM_BATCH_SIZE)
         )
         
         if include_measurements:
             query = query.options(selectinload(Profile.measurements))
         
-        result = await db.execute(query)
-        profiles = result.scalars().all()
+        result = await db.stream_scalars(query)
+        profile_count = 0
+        async for profile in result:
+            profile_count += 1
+            yield profile
         
-        logger.info(f"Found {len(profiles)} profiles for float {wmo_id}")
-        return profiles
+        logger.info(f"Streamed {profile_count} profiles for float {wmo_id}")
         
     except Exception as e:
         logger.error(f"Error fetching profiles for WMO ID {wmo_id}: {e}")
@@ -217,47 +401,27 @@ async def get_measurement_statistics_by_wmo_id(db: AsyncSession, wmo_id: str) ->
     try:
         logger.info(f"Calculating measurement statistics for WMO ID: {wmo_id}")
         
-        # Query for measurement statistics
-        query = (
-            select(
-                func.count(Measurement.id).label('total_measurements'),
-                func.min(Measurement.pressure).label('min_pressure'),
-                func.max(Measurement.pressure).label('max_pressure'),
-                func.avg(Measurement.temperature).label('avg_temperature'),
-                func.min(Measurement.temperature).label('min_temperature'),
-                func.max(Measurement.temperature).label('max_temperature'),
-                func.avg(Measurement.salinity).label('avg_salinity'),
-                func.min(Measurement.salinity).label('min_salinity'),
-                func.max(Measurement.salinity).label('max_salinity'),
-                func.count(Measurement.temperature).filter(Measurement.temperature.isnot(None)).label('temp_count'),
-                func.count(Measurement.salinity).filter(Measurement.salinity.isnot(None)).label('sal_count')
-            )
-            .join(Profile, Measurement.profile_id == Profile.id)
-            .join(Float, Profile.float_id == Float.id)
-            .where(Float.wmo_id == wmo_id)
-        )
-        
-        result = await db.execute(query)
+        result = await db.execute(_MEASUREMENT_STATISTICS_STMT, {"wmo_id": wmo_id})
         row = result.first()
         
         if row and row.total_measurements > 0:
             stats = {
                 "total_measurements": row.total_measurements,
                 "pressure_range": {
-                    "min": float(row.min_pressure) if row.min_pressure else None,
-                    "max": float(row.max_pressure) if row.max_pressure else None
+                    "min": row.min_pressure,
+                    "max": row.max_pressure
                 },
                 "temperature": {
                     "count": row.temp_count,
-                    "avg": float(row.avg_temperature) if row.avg_temperature else None,
-                    "min": float(row.min_temperature) if row.min_temperature else None,
-                    "max": float(row.max_temperature) if row.max_temperature else None
+                    "avg": row.avg_temperature,
+                    "min": row.min_temperature,
+                    "max": row.max_temperature
                 },
                 "salinity": {
                     "count": row.sal_count,
-                    "avg": float(row.avg_salinity) if row.avg_salinity else None,
-                    "min": float(row.min_salinity) if row.min_salinity else None,
-                    "max": float(row.max_salinity) if row.max_salinity else None
+                    "avg": row.avg_salinity,
+                    "min": row.min_salinity,
+                    "max": row.max_salinity
                 }
             }
             logger.info(f"Statistics for {wmo_id}: {row.total_measurements} measurements")
@@ -276,6 +440,60 @@ async def get_measurement_statistics_by_wmo_id(db: AsyncSession, wmo_id: str) ->
         raise
 
 
+def _decode_measurement_arrays(data: memoryview) -> Dict[str, np.ndarray]:
+    """
+    Decode a binary COPY of ``_MEASUREMENT_ARRAYS_SQL`` into float64 arrays.
+    
+    Args:
+        data: Complete COPY output: header, tuples and trailer
+        
+    Returns:
+        Dictionary of float64 arrays keyed by pressure, temperature and salinity
+    """
+    # Skip the 11-byte signature, 4-byte flags and the header extension; drop the -1 trailer
+    extension_length = int.from_bytes(data[15:19], "big")
+    body = data[19 + extension_length:len(data) - 2]
+    records = np.frombuffer(body, dtype=_MEASUREMENT_ARRAYS_DTYPE)
+    
+    return {
+        name: records[name].astype(np.float64)
+        for name in ("pressure", "temperature", "salinity")
+    }
+
+
+async def get_measurement_arrays_by_wmo_id(db: AsyncSession, wmo_id: str) -> Dict[str, np.ndarray]:
+    """
+    Bulk-fetch a float's raw pressure, temperature and salinity values.
+    
+    Rows are streamed with a binary COPY over the session's asyncpg connection
+    and decoded with a structured numpy dtype, without per-row Python objects.
+    Missing temperature/salinity values are returned as NaN.
+    
+    Args:
+        db: Database session (PostgreSQL with asyncpg)
+        wmo_id: WMO identifier of the float
+        
+    Returns:
+        Dictionary of float64 arrays keyed by pressure, temperature and salinity
+    """
+    try:
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        
+        buffer = io.BytesIO()
+        await raw_connection.driver_connection.copy_from_query(
+            _MEASUREMENT_ARRAYS_SQL, wmo_id, output=buffer, format="binary"
+        )
+        arrays = _decode_measurement_arrays(buffer.getbuffer())
+        
+        logger.info(f"Fetched {len(arrays['pressure'])} measurement rows for float {wmo_id}")
+        return arrays
+        
+    except Exception as e:
+        logger.error(f"Error fetching measurement arrays for WMO ID {wmo_id}: {e}")
+        raise
+
+
 async def check_float_exists(db: AsyncSession, wmo_id: str) -> bool:
     """
     Check if a float exists by WMO ID.
@@ -288,13 +506,17 @@ async def check_float_exists(db: AsyncSession, wmo_id: str) -> bool:
         True if float exists, False otherwise
     """
     try:
-        query = select(func.count(Float.id)).where(Float.wmo_id == wmo_id)
-        result = await db.execute(query)
-        count = result.scalar()
+        # Known floats are answered from the Redis set without touching the database
+        if await cache_service.is_member(_KNOWN_WMO_IDS_KEY, wmo_id):
+            return True
+        
+        result = await db.execute(_FLOAT_EXISTS_STMT, {"wmo_id": wmo_id})
         
-        exists = count > 0
-        logger.info(f"Float {wmo_id} exists: {exists}")
-        return exists
+        float_exists = bool(result.scalar())
+        if float_exists:
+            await cache_service.add_member(_KNOWN_WMO_IDS_KEY, wmo_id, _LOOKUP_CACHE_TTL)
+        logger.info(f"Float {wmo_id} exists: {float_exists}")
+        return float_exists
         
     except Exception as e:
         logger.error(f"Error checking if float {wmo_id} exists: {e}")
@@ -303,7 +525,7 @@ async def check_float_exists(db: AsyncSession, wmo_id: str) -> bool:
 
 async def find_floats_by_params(db: AsyncSession, params) -> List[Dict[str, Any]]:
     """
-    Find floats based on QueryParameters with PostGIS spatial filtering.
+    Find floats based on QueryParameters with spatial, temporal and variable filtering.
     
     Args:
         db: Database session
@@ -313,10 +535,10 @@ async def find_floats_by_params(db: AsyncSession, params) -> List[Dict[str, Any]
         List of FloatSummarySchema-compatible dictionaries
     """
     try:
-        from geoalchemy2.functions import ST_Contains, ST_GeomFromText, ST_Intersects
-        from sqlalchemy import and_, or_, desc
+        from sqlalchemy import or_
         
-        logger.info(f"Searching floats with parameters: {params.dict() if hasattr(params, 'dict') else params}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Searching floats with parameters: %s", params.model_dump() if hasattr(params, 'model_dump') else params)
         
         # Base query with latest profile information
         subquery = (
@@ -335,19 +557,18 @@ async def find_floats_by_params(db: AsyncSession, params) -> List[Dict[str, Any]
         
         latest_profiles = select(subquery).where(subquery.c.rn == 1).subquery()
         
-        # Main query joining floats with their latest profiles
+        # Main query joining floats with their latest profiles; the selected
+        # column names are exactly the FloatSummarySchema fields
         query = (
             select(
                 Float.id,
                 Float.wmo_id,
-                Float.status,
-                Float.platform_type,
-                Float.institution,
-                Float.last_update,
                 latest_profiles.c.latitude,
                 latest_profiles.c.longitude,
-                latest_profiles.c.timestamp.label('latest_profile_date'),
-                func.count(Profile.id).label('profile_count')
+                Float.status,
+                Float.last_update,
+                func.count(Profile.id).label('profile_count'),
+                latest_profiles.c.timestamp.label('latest_profile_date')
             )
             .outerjoin(latest_profiles, Float.id == latest_profiles.c.float_id)
             .outerjoin(Profile, Float.id == Profile.float_id)
@@ -364,22 +585,14 @@ async def find_floats_by_params(db: AsyncSession, params) -> List[Dict[str, Any]
             )
         )
         
+        # Collect profile-level predicates into one matching-floats CTE so the
+        # profiles table is scanned once instead of once per filter
+        profile_filters = []
+        variable_filters = []
+        
         # Apply spatial filters
         if hasattr(params, 'bbox') and params.bbox:
-            min_lon, min_lat, max_lon, max_lat = params.bbox
-            
-            # Create bounding box geometry
-            bbox_wkt = f'POLYGON(({min_lon} {min_lat}, {max_lon} {min_lat}, {max_lon} {max_lat}, {min_lon} {max_lat}, {min_lon} {min_lat}))'
-            bbox_geom = ST_GeomFromText(bbox_wkt, 4326)
-            
-            # Filter profiles within bounding box
-            spatial_filter = (
-                select(Profile.float_id)
-                .where(ST_Intersects(Profile.location, bbox_geom))
-                .distinct()
-            )
-            
-            query = query.where(Float.id.in_(spatial_filter))
+            profile_filters.append(profile_in_bbox(params.bbox))
             logger.info(f"Applied bbox filter: {params.bbox}")
         
         # Apply temporal filters
@@ -390,32 +603,32 @@ async def find_floats_by_params(db: AsyncSession, params) -> List[Dict[str, Any]
             temporal_filters.append(Profile.timestamp <= params.end_date)
         
         if temporal_filters:
-            temporal_subquery = (
-                select(Profile.float_id)
-                .where(and_(*temporal_filters))
-                .distinct()
-            )
-            query = query.where(Float.id.in_(temporal_subquery))
+            profile_filters.extend(temporal_filters)
             logger.info(f"Applied temporal filters: {params.start_date} to {params.end_date}")
         
         # Apply variable filters (check if floats have measurements for requested variables)
         if hasattr(params, 'variables') and params.variables:
-            variable_filters = []
             for variable in params.variables:
-                if hasattr(Measurement, variable):
-                    column = getattr(Measurement, variable)
+                if variable in _MEASUREMENT_COLUMNS:
+                    column = _MEASUREMENT_COLUMNS[variable]
                     variable_filters.append(column.isnot(None))
-            
             if variable_filters:
-                variable_subquery = (
-                    select(Profile.float_id)
-                    .join(Measurement, Profile.id == Measurement.profile_id)
-                    .where(or_(*variable_filters))
-                    .distinct()
-                )
-                query = query.where(Float.id.in_(variable_subquery))
                 logger.info(f"Applied variable filters: {params.variables}")
         
+        if profile_filters or variable_filters:
+            matching_floats = select(Profile.float_id)
+            if variable_filters:
+                matching_floats = matching_floats.join(Measurement, Profile.id == Measurement.profile_id)
+                profile_filters.append(or_(*variable_filters))
+            matching_floats = (
+                matching_floats
+                .where(and_(*profile_filters))
+                .distinct()
+                .cte('matching_floats')
+                .prefix_with('MATERIALIZED')
+            )
+            query = query.join(matching_floats, Float.id == matching_floats.c.float_id)
+        
         # Apply text search
         if hasattr(params, 'general_search_term') and params.general_search_term:
             search_term = f"%{params.general_search_term}%"
@@ -431,22 +644,9 @@ async def find_floats_by_params(db: AsyncSession, params) -> List[Dict[str, Any]
         # Execute query with limit
         query = query.limit(100)  # Limit results for performance
         result = await db.execute(query)
-        rows = result.fetchall()
         
-        # Convert to FloatSummarySchema format
-        floats = []
-        for row in rows:
-            float_summary = {
-                "id": row.id,
-                "wmo_id": row.wmo_id,
-                "latitude": row.latitude,
-                "longitude": row.longitude,
-                "status": row.status,
-                "last_update": row.last_update,
-                "profile_count": row.profile_count,
-                "latest_profile_date": row.latest_profile_date
-            }
-            floats.append(float_summary)
+        # Rows map straight onto FloatSummarySchema fields
+        floats = [dict(row) for row in result.mappings()]
         
         logger.info(f"Found {len(floats)} floats matching criteria")
         return floats
@@ -456,134 +656,143 @@ async def find_floats_by_params(db: AsyncSession, params) -> List[Dict[str, Any]
         raise
 
 
-async def get_recent_measurements_for_anomaly_detection(
+async def _query_anomaly_detection_data(
     db: AsyncSession, 
     float_ids: List[int], 
     variables: List[str],
-    days_back: int = 30
-) -> Dict[str, List[float]]:
+    days_back: int
+) -> Tuple[Dict[str, Tuple[int, float, float]], Dict[int, Dict[str, float]]]:
     """
-    Get recent measurements for anomaly detection.
+    Compute anomaly baselines and latest measurements in a single query.
     
-    Args:
-        db: Database session
-        float_ids: List of float IDs to check
-        variables: Variables to analyze (temperature, salinity, etc.)
-        days_back: Number of days to look back for baseline
-        
-    Returns:
-        Dictionary with variable names as keys and lists of values
+    A single scan of the floats' measurements computes the baseline count, mean
+    and standard deviation per variable as window aggregates over the rows
+    inside the look-back window, and ranks each float's rows so only its latest
+    one (newest profile, deepest level) is returned, however old it is.
     """
-    try:
-        from datetime import datetime, timedelta
-        
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-        
-        # Build query for recent measurements
-        query = (
-            select(Measurement)
-            .join(Profile, Measurement.profile_id == Profile.id)
-            .join(Float, Profile.float_id == Float.id)
-            .where(
-                and_(
-                    Profile.timestamp >= cutoff_date,
-                    Float.id.in_(float_ids) if float_ids else True
-                )
-            )
-            .limit(1000)  # Limit for performance
+    columns = [_MEASUREMENT_COLUMNS[variable] for variable in variables if variable in _MEASUREMENT_COLUMNS]
+    if not columns or not float_ids:
+        return {}, {}
+    
+    cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+    is_postgresql = db.get_bind().dialect.name == "postgresql"
+    
+    # Baseline aggregates over the recent rows only, repeated on each output row;
+    # older rows are NULL here, which the aggregates skip
+    is_recent = Profile.timestamp >= cutoff_date
+    aggregates = []
+    for column in columns:
+        recent_value = case((is_recent, column))
+        aggregates.append(func.count(recent_value).over().label(f"{column.key}_count"))
+        aggregates.append(func.avg(recent_value).over().label(f"{column.key}_mean"))
+        if is_postgresql:
+            aggregates.append(func.stddev_samp(recent_value).over().label(f"{column.key}_spread"))
+        else:
+            # SQLite has no STDDEV; fetch the mean square and finish in Python
+            aggregates.append(func.avg(recent_value * recent_value).over().label(f"{column.key}_spread"))
+    
+    ranked = (
+        select(
+            Profile.float_id,
+            *columns,
+            *aggregates,
+            func.row_number().over(
+                partition_by=Profile.float_id,
+                order_by=(Profile.timestamp.desc(), Measurement.pressure.desc())
+            ).label('rn')
         )
-        
-        result = await db.execute(query)
-        measurements = result.scalars().all()
-        
-        # Extract values for each variable
-        variable_data = {}
-        for variable in variables:
-            if hasattr(Measurement, variable):
-                values = []
-                for measurement in measurements:
-                    value = getattr(measurement, variable)
-                    if value is not None:
-                        values.append(float(value))
-                variable_data[variable] = values
-        
-        logger.info(f"Retrieved {len(measurements)} recent measurements for anomaly detection")
-        return variable_data
-        
-    except Exception as e:
-        logger.error(f"Error getting recent measurements: {e}")
-        return {}
+        .select_from(Measurement)
+        .join(Profile, Measurement.profile_id == Profile.id)
+        .where(Profile.float_id.in_(float_ids))
+        .subquery()
+    )
+    
+    result = await db.execute(select(ranked).where(ranked.c.rn == 1))
+    rows = result.mappings().all()
+    
+    latest_measurements = {}
+    for row in rows:
+        measurements = {}
+        for column in columns:
+            value = row[column.key]
+            if value is not None:
+                measurements[column.key] = float(value)
+        latest_measurements[row['float_id']] = measurements
+    
+    baseline_stats = {}
+    if rows:
+        first = rows[0]
+        for column in columns:
+            count = first[f"{column.key}_count"]
+            if count < 2:
+                continue
+            mean = float(first[f"{column.key}_mean"])
+            spread = float(first[f"{column.key}_spread"])
+            if is_postgresql:
+                std = spread
+            else:
+                std = math.sqrt(max(spread - mean * mean, 0.0) * count / (count - 1))
+            baseline_stats[column.key] = (count, mean, std)
+    
+    logger.info(
+        "Retrieved anomaly baselines for %d variables and latest measurements for %d floats",
+        len(baseline_stats), len(latest_measurements)
+    )
+    return baseline_stats, latest_measurements
 
 
-async def get_latest_measurements_for_floats(
+async def get_anomaly_detection_data(
     db: AsyncSession, 
     float_ids: List[int], 
-    variables: List[str]
-) -> Dict[int, Dict[str, float]]:
+    variables: List[str],
+    days_back: int = 30
+) -> Tuple[Dict[str, Tuple[int, float, float]], Dict[int, Dict[str, float]]]:
     """
-    Get latest measurements for specific floats.
+    Get baseline statistics and each float's latest measurement for anomaly detection.
+    
+    Results are cached in Redis under the data version and the current day, so
+    repeated queries over the same floats skip the database until new data is
+    ingested or the look-back window moves.
     
     Args:
         db: Database session
-        float_ids: List of float IDs
-        variables: Variables to retrieve
+        float_ids: List of float IDs to check
+        variables: Variables to analyze (temperature, salinity, etc.)
+        days_back: Number of days to look back for baseline
         
     Returns:
-        Dictionary mapping float_id to variable values
+        Tuple of (variable -> (count, mean, std) baseline statistics,
+        float_id -> latest variable values from each float's newest profile,
+        whatever its age)
     """
     try:
-        # Subquery for latest profile per float
-        latest_profile_subquery = (
-            select(
-                Profile.float_id,
-                func.max(Profile.timestamp).label('max_timestamp')
-            )
-            .where(Profile.float_id.in_(float_ids))
-            .group_by(Profile.float_id)
-            .subquery()
+        if not cache_service.is_available():
+            return await _query_anomaly_detection_data(db, float_ids, variables, days_back)
+        
+        data_version = await cache_service.get_data_version()
+        key = make_cache_key(
+            f"anomaly_data:{data_version}",
+            sorted(float_ids),
+            sorted(variables),
+            days_back,
+            datetime.utcnow().date().isoformat()
         )
-        
-        # Query for latest measurements
-        query = (
-            select(
-                Float.id.label('float_id'),
-                Measurement.temperature,
-                Measurement.salinity,
-                Measurement.pressure,
-                Measurement.dissolved_oxygen,
-                Measurement.ph
-            )
-            .join(Profile, Float.id == Profile.float_id)
-            .join(Measurement, Profile.id == Measurement.profile_id)
-            .join(
-                latest_profile_subquery,
-                and_(
-                    Profile.float_id == latest_profile_subquery.c.float_id,
-                    Profile.timestamp == latest_profile_subquery.c.max_timestamp
-                )
+        cached = await cache_service.get_json(key)
+        if cached is not None:
+            # JSON turns tuples into lists and integer keys into strings
+            return (
+                {variable: tuple(stats) for variable, stats in cached["baseline"].items()},
+                {int(float_id): values for float_id, values in cached["latest"].items()}
             )
-            .where(Float.id.in_(float_ids))
-            .order_by(Measurement.pressure.desc())  # Get surface measurements first
-        )
         
-        result = await db.execute(query)
-        rows = result.fetchall()
-        
-        # Group by float_id and get first (surface) measurement
-        float_measurements = {}
-        for row in rows:
-            if row.float_id not in float_measurements:
-                measurements = {}
-                for variable in variables:
-                    if hasattr(row, variable):
-                        value = getattr(row, variable)
-                        if value is not None:
-                            measurements[variable] = float(value)
-                float_measurements[row.float_id] = measurements
-        
-        logger.info(f"Retrieved latest measurements for {len(float_measurements)} floats")
-        return float_measurements
+        baseline_stats, latest_measurements = await _query_anomaly_detection_data(db, float_ids, variables, days_back)
+        await cache_service.set_json(
+            key,
+            {"baseline": baseline_stats, "latest": latest_measurements},
+            _ANOMALY_DATA_CACHE_TTL
+        )
+        return baseline_stats, latest_measurements
         
     except Exception as e:
-        logger.error(f"Error getting latest measurements for floats: {e}")
-        return {}
+        logger.error(f"Error getting anomaly detection data: {e}")
+        return {}, {}
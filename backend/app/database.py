@@ -3,10 +3,13 @@ Database configuration and session management for FloatChat backend.
 """
 
 import os
+import uuid
 from typing import AsyncGenerator
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -17,19 +20,55 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is required")
 
-# Create async engine
+# Connection pool configuration
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+DB_BEHIND_PGBOUNCER = os.getenv("DB_BEHIND_PGBOUNCER", "False").lower() == "true"
+
+# Cache prepared statements per connection so repeated query shapes skip parsing
+connect_args = {}
+if DATABASE_URL.startswith("postgresql+asyncpg"):
+    connect_args = {
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+    }
+    if DB_BEHIND_PGBOUNCER:
+        # Unique names keep statements from colliding on shared server connections
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+
+# Create async engine with a persistent connection pool
 engine = create_async_engine(
     DATABASE_URL,
     echo=os.getenv("DEBUG", "False").lower() == "true",
-    poolclass=NullPool,  # Use NullPool for async connections
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
     pool_pre_ping=True,
     pool_recycle=300,
+    connect_args=connect_args,
+    query_cache_size=DB_QUERY_CACHE_SIZE,
 )
 
+
+
+class FloatChatSession(Session):
+    """
+    Sync session class behind every AsyncSession of the application.
+    
+    Flush-time model hooks are registered on this class rather than on
+    Session itself, so they only run for FloatChat's own sessions.
+    """
+
+
 # Create async session maker
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=FloatChatSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
@@ -64,10 +103,27 @@ async def init_db() -> None:
         # Import all models to ensure they are registered
         from app.models import Float, Profile, Measurement
         
+        # Trigram indexes need pg_trgm
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def warm_db_pool() -> None:
+    """
+    Open the pool's connections up front so early requests skip connection setup.
+    """
+    import asyncio
+    
+    async def _checkout() -> None:
+        async with engine.connect():
+            pass
+    
+    await asyncio.gather(*(_checkout() for _ in range(DB_POOL_SIZE)))
+
+
 async def close_db() -> None:
     """
     Close database connections.
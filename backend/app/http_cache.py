@@ -0,0 +1,51 @@
+"""
+HTTP conditional-request helpers (ETag / If-None-Match) for read endpoints.
+"""
+
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request, Response
+
+# Clients may reuse a response but must revalidate it with the ETag first
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(updated_at: Optional[datetime], *parts: Any) -> str:
+    """
+    Build a weak ETag from a last-modified time and the representation's parameters.
+
+    Args:
+        updated_at: Last modification time of the underlying data
+        parts: Identifiers and query parameters that change the representation
+
+    Returns:
+        str: Weak ETag header value
+    """
+    version = updated_at.timestamp() if updated_at else 0
+    return 'W/"' + "-".join(str(part) for part in (version, *parts)) + '"'
+
+
+def check_not_modified(request: Request, response: Response, etag: str) -> None:
+    """
+    Answer with 304 Not Modified if the client already holds this representation.
+
+    Otherwise the ETag and Cache-Control headers are set on the outgoing response.
+
+    Args:
+        request: Incoming request
+        response: Response whose headers are being prepared
+        etag: Current ETag of the resource
+
+    Raises:
+        HTTPException: 304 when If-None-Match matches the current ETag
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            raise HTTPException(status_code=304, headers=headers)
+
+    response.headers.update(headers)
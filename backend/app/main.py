@@ -3,36 +3,94 @@ FastAPI main application entry point for FloatChat backend.
 """
 
 from fastapi import FastAPI, Request, HTTPException, Depends
-from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+import math
 import time
 import logging
+import logging.handlers
+import queue
+from datetime import datetime, timedelta
+from typing import Optional
+import numpy as np
+import orjson
 
 from app.config import settings
-from app.database import init_db, close_db, get_db, check_db_health
-from app.schemas import ErrorResponse, FloatDetailSchema, AIQueryInput, AIQueryResponse, FloatSummarySchema
+from app.metrics import start_stage_timing, stage, get_stage_timings
+from app.services.anomaly_kernels import zscore_outliers, warm_anomaly_kernels
+from app.database import init_db, warm_db_pool, close_db, get_db, check_db_health
+from app.schemas import ErrorResponse, FloatDetailSchema, AIQueryInput, AIQueryResponse, FloatSummarySchema, StatusEnum
 from app.crud import (
     get_float_data_by_wmo_id, 
     find_floats_by_params,
-    get_recent_measurements_for_anomaly_detection,
-    get_latest_measurements_for_floats
+    get_anomaly_detection_data,
+    warm_statement_cache
 )
 
 
-# Configure logging
+# Configure logging; records are queued and written by a background thread
+# so file and console I/O never blocks the event loop
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.FileHandler(settings.LOG_FILE),
+    logging.StreamHandler(),
+    respect_handler_level=True
+)
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(settings.LOG_FILE),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_listener.start()
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize resources on startup and release them on shutdown."""
+    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    
+    # Initialize database
+    try:
+        await init_db()
+        await warm_db_pool()
+        await warm_statement_cache()
+        logger.info("Database initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize database: {e}")
+        raise
+    
+    # Compile numeric kernels up front so the first anomaly query skips the JIT
+    warm_anomaly_kernels()
+    
+    yield
+    
+    logger.info("Shutting down application")
+    
+    # Close database connections
+    try:
+        await close_db()
+        logger.info("Database connections closed")
+    except Exception as e:
+        logger.error(f"Error closing database connections: {e}")
+    
+    # Close cache and LLM client connections
+    from app.services.cache import cache_service
+    from app.services.ai_service import ai_service
+    await cache_service.close()
+    await ai_service.close()
+    
+    # Flush queued log records and stop the writer thread
+    _log_listener.stop()
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.APP_NAME,
@@ -40,6 +98,8 @@ app = FastAPI(
     description="Oceanographic AI Explorer Backend API",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -56,66 +116,61 @@ app.add_middleware(
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     """Add processing time to response headers."""
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-Process-Time"] = f"{(time.perf_counter_ns() - start_ns) / 1e9:.6f}"
     return response
 
 
+# Pre-serialized body for database errors escaping read endpoints
+_DATABASE_ERROR_JSON = orjson.dumps({
+    "detail": {"error": "Database Error", "message": "A database error occurred while processing the request"}
+})
+
+
+# Database exception handler
+@app.exception_handler(SQLAlchemyError)
+async def database_exception_handler(request: Request, exc: SQLAlchemyError):
+    """Translate database errors escaping read endpoints into a 500 response."""
+    # The exception text carries SQL and bound parameters; log it, never return it
+    logger.error("Database error on %s: %s", request.url.path, exc)
+    
+    return Response(content=_DATABASE_ERROR_JSON, status_code=500, media_type="application/json")
+
+
+# Longest exception message echoed back in an error response
+_MAX_ERROR_MESSAGE_LENGTH = 256
+
+
+def _describe_error(exc: Exception) -> str:
+    """Describe an exception for an error response, capping the message length."""
+    return f"{type(exc).__name__}: {str(exc)[:_MAX_ERROR_MESSAGE_LENGTH]}"
+
+
+# Pre-serialized 500 body up to its timestamp, the only part that varies per error
+_INTERNAL_ERROR_JSON_HEAD = orjson.dumps(ErrorResponse(
+    error="Internal Server Error",
+    details=[{
+        "message": "An unexpected error occurred",
+        "code": "INTERNAL_ERROR"
+    }]
+).model_dump(mode="json", exclude={"timestamp"}))[:-1] + b',"timestamp":"'
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for unhandled errors."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     
-    error_response = ErrorResponse(
-        error="Internal Server Error",
-        details=[{
-            "message": "An unexpected error occurred",
-            "code": "INTERNAL_ERROR"
-        }]
-    )
-    
-    return JSONResponse(
-        status_code=500,
-        content=jsonable_encoder(error_response)
-    )
-
-
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize application on startup."""
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
-    
-    # Initialize database
-    try:
-        await init_db()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
-        raise
+    content = _INTERNAL_ERROR_JSON_HEAD + datetime.utcnow().isoformat().encode() + b'"}'
+    return Response(content=content, status_code=500, media_type="application/json")
 
 
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up resources on shutdown."""
-    logger.info("Shutting down application")
-    
-    # Close database connections
-    try:
-        await close_db()
-        logger.info("Database connections closed")
-    except Exception as e:
-        logger.error(f"Error closing database connections: {e}")
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Basic health check endpoint."""
-    from datetime import datetime
-    
     db_healthy = await check_db_health()
     
     return {
@@ -127,15 +182,26 @@ async def health_check():
 
 
 # Root endpoint
+# Static API information, serialized once at import time
+_ROOT_JSON = orjson.dumps({
+    "message": f"Welcome to {settings.APP_NAME} API",
+    "version": settings.APP_VERSION,
+    "docs": "/docs",
+    "health": "/health"
+})
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
-        "message": f"Welcome to {settings.APP_NAME} API",
-        "version": settings.APP_VERSION,
-        "docs": "/docs",
-        "health": "/health"
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
+
+
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose Prometheus metrics for scraping."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 # Float detail endpoint
@@ -163,10 +229,10 @@ async def get_float_by_wmo_id(
         HTTPException: 404 if float not found
     """
     try:
-        logger.info(f"API request for float WMO ID: {wmo_id}")
+        logger.info("API request for float WMO ID: %s", wmo_id)
         
         # Fetch float data with all relationships
-        float_data = await get_float_data_by_wmo_id(db, wmo_id)
+        float_data = await get_float_data_by_wmo_id(db, wmo_id, load_measurements=True)
         
         if not float_data:
             logger.warning(f"Float {wmo_id} not found")
@@ -179,7 +245,7 @@ async def get_float_by_wmo_id(
                 }
             )
         
-        logger.info(f"Successfully retrieved float {wmo_id} with {len(float_data.profiles)} profiles")
+        logger.info("Successfully retrieved float %s with %d profiles", wmo_id, float_data._profile_count)
         
         # Convert to Pydantic schema
         return FloatDetailSchema.from_orm(float_data)
@@ -194,7 +260,7 @@ async def get_float_by_wmo_id(
             status_code=500,
             detail={
                 "error": "Internal Server Error",
-                "message": f"An error occurred while retrieving float data: {str(e)}",
+                "message": f"An error occurred while retrieving float data: {_describe_error(e)}",
                 "wmo_id": wmo_id
             }
         )
@@ -222,27 +288,31 @@ async def process_intelligent_query(
     Returns:
         AIQueryResponse: Complete response with floats, insights, and recommendations
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
+    start_stage_timing()
     
     try:
-        logger.info(f"Processing intelligent query: {query_input.question[:100]}...")
+        logger.info("Processing intelligent query: %s...", query_input.question[:100])
         
         # Step 1: Use AI to extract structured parameters
         from app.services.ai_query_service import ai_query_service
         
-        parameters = await ai_query_service.process_ai_query(query_input.question)
-        logger.info(f"AI extracted parameters: {parameters.dict()}")
+        with stage("extract"):
+            parameters = await ai_query_service.process_ai_query(query_input.question)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("AI extracted parameters: %s", parameters.model_dump())
         
         # Step 2: Search for matching floats
-        matching_floats = await find_floats_by_params(db, parameters)
+        with stage("db"):
+            matching_floats = await find_floats_by_params(db, parameters)
         
-        # Convert to FloatSummarySchema objects
-        float_summaries = []
-        for float_data in matching_floats:
-            summary = FloatSummarySchema(**float_data)
-            float_summaries.append(summary)
+        # Convert to FloatSummarySchema objects; rows come from our own query, so skip validation
+        float_summaries = [
+            FloatSummarySchema.model_construct(**{**float_data, "status": StatusEnum(float_data["status"])})
+            for float_data in matching_floats
+        ]
         
-        logger.info(f"Found {len(float_summaries)} matching floats")
+        logger.info("Found %d matching floats", len(float_summaries))
         
         # Step 3: Proactive AI Scientific Assistant - Anomaly Detection
         insights = ""
@@ -253,42 +323,38 @@ async def process_intelligent_query(
             anomaly_variables = [v for v in parameters.variables if v in ['temperature', 'salinity', 'dissolved_oxygen']]
             
             if anomaly_variables:
-                logger.info(f"Performing anomaly detection for variables: {anomaly_variables}")
+                logger.info("Performing anomaly detection for variables: %s", anomaly_variables)
                 
                 float_ids = [f.id for f in float_summaries]
                 
-                # Get baseline data from recent measurements
-                baseline_data = await get_recent_measurements_for_anomaly_detection(
-                    db, float_ids, anomaly_variables, days_back=30
-                )
-                
-                # Get latest measurements for the found floats
-                latest_measurements = await get_latest_measurements_for_floats(
-                    db, float_ids, anomaly_variables
-                )
-                
-                # Perform anomaly detection
-                anomalies = await _detect_anomalies(
-                    baseline_data, latest_measurements, float_summaries, anomaly_variables
-                )
+                with stage("anomaly_detection"):
+                    # Baseline statistics and the floats' latest measurements in one query
+                    baseline_stats, latest_measurements = await get_anomaly_detection_data(
+                        db, float_ids, anomaly_variables, days_back=30
+                    )
+                    
+                    # Perform anomaly detection in a worker thread; the kernel releases the GIL
+                    anomalies = await asyncio.to_thread(
+                        _detect_anomalies, baseline_stats, latest_measurements, float_summaries, anomaly_variables
+                    )
                 
                 if anomalies:
                     anomaly_insights.extend(anomalies)
-                    logger.info(f"Detected {len(anomalies)} anomalies")
+                    logger.info("Detected %d anomalies", len(anomalies))
         
         # Step 4: Generate comprehensive insights
         if anomaly_insights:
             insights = "🔬 **Proactive Scientific Analysis:**\n\n" + "\n".join(anomaly_insights)
         else:
-            insights = await _generate_standard_insights(float_summaries, parameters)
+            insights = _generate_standard_insights(float_summaries, parameters)
         
         # Step 5: Generate data summary
         data_summary = _create_data_summary(float_summaries, parameters)
         
         # Step 6: Generate AI recommendations
-        recommendations = await _generate_recommendations(parameters, float_summaries, anomaly_insights)
+        recommendations = _generate_recommendations(parameters, float_summaries, anomaly_insights)
         
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) * 1e-9
         
         # Create comprehensive response
         response = AIQueryResponse(
@@ -301,7 +367,9 @@ async def process_intelligent_query(
             processing_time=processing_time
         )
         
-        logger.info(f"Query processed successfully in {processing_time:.2f}s")
+        logger.info("Query processed successfully in %.2fs", processing_time)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Stage timings: %s", get_stage_timings())
         return response
         
     except Exception as e:
@@ -311,14 +379,49 @@ async def process_intelligent_query(
             status_code=500,
             detail={
                 "error": "Query Processing Error",
-                "message": f"Failed to process intelligent query: {str(e)}",
+                "message": f"Failed to process intelligent query: {_describe_error(e)}",
                 "query": query_input.question
             }
         )
 
 
-async def _detect_anomalies(
-    baseline_data: dict,
+# Insight and recommendation text, built once at import
+_ANOMALY_TEMPLATE = (
+    "🚨 **Anomaly Alert**: Float {wmo_id} shows unusually {direction} "
+    "{variable} ({current:.2f}) - {z_score:.1f}σ from regional mean ({mean:.2f})"
+)
+
+# Baselines with less spread than this are treated as uniform and skipped
+_MIN_BASELINE_STD = 1e-12
+
+# Scientific context appended to an anomaly, keyed by (variable, direction)
+_ANOMALY_CONTEXT = {
+    ("temperature", "high"): " - Possible marine heatwave or warm water intrusion",
+    ("salinity", "low"): " - Possible freshwater input or precipitation event",
+    ("dissolved_oxygen", "low"): " - Possible hypoxic conditions or biological activity",
+}
+
+_ANOMALY_RECOMMENDATIONS = (
+    "🔍 Investigate anomalous floats for potential oceanographic events",
+    "📈 Compare with satellite data and regional climate indices",
+    "🌊 Check for correlation with ocean current patterns",
+)
+
+# Variable-specific recommendations, in display order
+_VARIABLE_RECOMMENDATIONS = (
+    ("temperature", "🌡️ Analyze temperature profiles for thermocline depth variations"),
+    ("salinity", "🧂 Examine salinity gradients for water mass identification"),
+    ("dissolved_oxygen", "💨 Monitor oxygen levels for marine ecosystem health"),
+)
+
+_NO_RESULTS_RECOMMENDATIONS = (
+    "🔄 Try expanding search criteria or different time periods",
+    "🗺️ Consider broader geographic regions",
+)
+
+
+def _detect_anomalies(
+    baseline_stats: dict,
     latest_measurements: dict,
     float_summaries: list,
     variables: list
@@ -327,7 +430,7 @@ async def _detect_anomalies(
     Detect anomalies in oceanographic measurements.
     
     Args:
-        baseline_data: Historical data for baseline statistics
+        baseline_stats: Baseline (count, mean, std) of each variable
         latest_measurements: Latest measurements from floats
         float_summaries: List of float summaries
         variables: Variables to analyze
@@ -335,8 +438,6 @@ async def _detect_anomalies(
     Returns:
         List of anomaly insight strings
     """
-    import statistics
-    
     anomalies = []
     
     try:
@@ -344,46 +445,44 @@ async def _detect_anomalies(
         float_lookup = {f.id: f for f in float_summaries}
         
         for variable in variables:
-            if variable not in baseline_data or len(baseline_data[variable]) < 10:
+            if variable not in baseline_stats:
+                continue
+            count, mean_val, std_val = baseline_stats[variable]
+            # Too few samples, or a uniform baseline (e.g. a stuck sensor) that gives no z-scores
+            if count < 10 or std_val < _MIN_BASELINE_STD:
                 continue
             
-            # Calculate baseline statistics
-            baseline_values = baseline_data[variable]
-            mean_val = statistics.mean(baseline_values)
-            std_val = statistics.stdev(baseline_values) if len(baseline_values) > 1 else 0
-            
-            if std_val == 0:
+            # Latest measurement of every float that reports this variable
+            float_ids = [float_id for float_id, measurements in latest_measurements.items() if variable in measurements]
+            if not float_ids:
                 continue
+            currents = np.fromiter(
+                (latest_measurements[float_id][variable] for float_id in float_ids),
+                dtype=np.float64,
+                count=len(float_ids)
+            )
             
-            # Check each float's latest measurement
-            for float_id, measurements in latest_measurements.items():
-                if variable not in measurements:
-                    continue
-                
-                current_value = measurements[variable]
-                z_score = abs(current_value - mean_val) / std_val
-                
-                # Anomaly threshold: 2 standard deviations
-                if z_score > 2.0:
-                    float_info = float_lookup.get(float_id)
-                    if float_info:
-                        direction = "high" if current_value > mean_val else "low"
-                        
-                        anomaly_text = (
-                            f"🚨 **Anomaly Alert**: Float {float_info.wmo_id} shows unusually {direction} "
-                            f"{variable.replace('_', ' ')} ({current_value:.2f}) - "
-                            f"{z_score:.1f}σ from regional mean ({mean_val:.2f})"
-                        )
-                        
-                        # Add scientific context
-                        if variable == 'temperature' and direction == 'high':
-                            anomaly_text += " - Possible marine heatwave or warm water intrusion"
-                        elif variable == 'salinity' and direction == 'low':
-                            anomaly_text += " - Possible freshwater input or precipitation event"
-                        elif variable == 'dissolved_oxygen' and direction == 'low':
-                            anomaly_text += " - Possible hypoxic conditions or biological activity"
-                        
-                        anomalies.append(anomaly_text)
+            # Anomaly threshold: 2 standard deviations from the baseline mean
+            indices, z_scores = zscore_outliers(currents, mean_val, std_val, 2.0)
+            variable_label = variable.replace('_', ' ')
+            
+            for index, z_score in zip(indices, z_scores):
+                float_info = float_lookup.get(float_ids[index])
+                if float_info:
+                    current_value = currents[index]
+                    direction = "high" if current_value > mean_val else "low"
+                    
+                    anomaly_text = _ANOMALY_TEMPLATE.format_map({
+                        "wmo_id": float_info.wmo_id,
+                        "direction": direction,
+                        "variable": variable_label,
+                        "current": current_value,
+                        "z_score": z_score,
+                        "mean": mean_val
+                    })
+                    
+                    # Add scientific context
+                    anomalies.append(anomaly_text + _ANOMALY_CONTEXT.get((variable, direction), ""))
         
         return anomalies
         
@@ -392,7 +491,71 @@ async def _detect_anomalies(
         return []
 
 
-async def _generate_standard_insights(float_summaries: list, parameters) -> str:
+def _scan_float_summaries(float_summaries: list, recent_cutoff: Optional[datetime] = None) -> dict:
+    """
+    Collect the spatial and temporal extents of float summaries in a single pass.
+    
+    Args:
+        float_summaries: List of float summaries
+        recent_cutoff: Count floats whose latest profile is newer than this, if given
+        
+    Returns:
+        Dictionary of lat/lon bounds (None when no positions), earliest/latest
+        profile dates, recent float count and total profile count
+    """
+    min_lat = min_lon = math.inf
+    max_lat = max_lon = -math.inf
+    earliest = latest = None
+    recent_count = 0
+    total_profiles = 0
+    
+    for f in float_summaries:
+        lat = f.latitude
+        if lat is not None:
+            if lat < min_lat:
+                min_lat = lat
+            if lat > max_lat:
+                max_lat = lat
+        
+        lon = f.longitude
+        if lon is not None:
+            if lon < min_lon:
+                min_lon = lon
+            if lon > max_lon:
+                max_lon = lon
+        
+        date = f.latest_profile_date
+        if date is not None:
+            if earliest is None or date < earliest:
+                earliest = date
+            if latest is None or date > latest:
+                latest = date
+            if recent_cutoff is not None and date > recent_cutoff:
+                recent_count += 1
+        
+        if f.profile_count:
+            total_profiles += f.profile_count
+    
+    has_position = min_lat != math.inf and min_lon != math.inf
+    return {
+        "min_latitude": min_lat if has_position else None,
+        "max_latitude": max_lat if has_position else None,
+        "min_longitude": min_lon if has_position else None,
+        "max_longitude": max_lon if has_position else None,
+        "earliest_profile": earliest,
+        "latest_profile": latest,
+        "recent_count": recent_count,
+        "total_profiles": total_profiles
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _recent_cutoff(second: int) -> datetime:
+    """Start of the 30-day "recent data" window, recomputed at most once per second."""
+    return datetime.utcnow() - timedelta(days=30)
+
+
+def _generate_standard_insights(float_summaries: list, parameters) -> str:
     """Generate standard insights when no anomalies are detected."""
     try:
         insights = []
@@ -400,27 +563,20 @@ async def _generate_standard_insights(float_summaries: list, parameters) -> str:
         if float_summaries:
             insights.append(f"📊 Found {len(float_summaries)} active oceanographic floats matching your criteria.")
             
+            extents = _scan_float_summaries(float_summaries, recent_cutoff=_recent_cutoff(int(time.time())))
+            
             # Spatial distribution insight
-            if len(float_summaries) > 1:
-                lats = [f.latitude for f in float_summaries if f.latitude]
-                lons = [f.longitude for f in float_summaries if f.longitude]
+            if len(float_summaries) > 1 and extents["min_latitude"] is not None:
+                lat_range = extents["max_latitude"] - extents["min_latitude"]
+                lon_range = extents["max_longitude"] - extents["min_longitude"]
                 
-                if lats and lons:
-                    lat_range = max(lats) - min(lats)
-                    lon_range = max(lons) - min(lons)
-                    
-                    insights.append(
-                        f"🌍 Spatial coverage: {lat_range:.1f}° latitude × {lon_range:.1f}° longitude"
-                    )
+                insights.append(
+                    f"🌍 Spatial coverage: {lat_range:.1f}° latitude × {lon_range:.1f}° longitude"
+                )
             
             # Temporal insight
-            recent_floats = [f for f in float_summaries if f.latest_profile_date]
-            if recent_floats:
-                from datetime import datetime, timedelta
-                recent_cutoff = datetime.utcnow() - timedelta(days=30)
-                recent_count = sum(1 for f in recent_floats if f.latest_profile_date > recent_cutoff)
-                
-                insights.append(f"📅 {recent_count} floats have reported data in the last 30 days")
+            if extents["latest_profile"] is not None:
+                insights.append(f"📅 {extents['recent_count']} floats have reported data in the last 30 days")
             
             # Variable-specific insights
             if hasattr(parameters, 'variables') and parameters.variables:
@@ -441,31 +597,28 @@ async def _generate_standard_insights(float_summaries: list, parameters) -> str:
 def _create_data_summary(float_summaries: list, parameters) -> dict:
     """Create data summary dictionary."""
     try:
+        extents = _scan_float_summaries(float_summaries)
         summary = {
             "float_count": len(float_summaries),
-            "total_profiles": sum(f.profile_count for f in float_summaries if f.profile_count),
+            "total_profiles": extents["total_profiles"],
             "query_parameters": parameters.dict() if hasattr(parameters, 'dict') else {}
         }
         
         if float_summaries:
             # Spatial extent
-            lats = [f.latitude for f in float_summaries if f.latitude]
-            lons = [f.longitude for f in float_summaries if f.longitude]
-            
-            if lats and lons:
+            if extents["min_latitude"] is not None:
                 summary["spatial_extent"] = {
-                    "min_latitude": min(lats),
-                    "max_latitude": max(lats),
-                    "min_longitude": min(lons),
-                    "max_longitude": max(lons)
+                    "min_latitude": extents["min_latitude"],
+                    "max_latitude": extents["max_latitude"],
+                    "min_longitude": extents["min_longitude"],
+                    "max_longitude": extents["max_longitude"]
                 }
             
             # Temporal extent
-            dates = [f.latest_profile_date for f in float_summaries if f.latest_profile_date]
-            if dates:
+            if extents["latest_profile"] is not None:
                 summary["temporal_extent"] = {
-                    "earliest_profile": min(dates),
-                    "latest_profile": max(dates)
+                    "earliest_profile": extents["earliest_profile"],
+                    "latest_profile": extents["latest_profile"]
                 }
         
         return summary
@@ -475,15 +628,13 @@ def _create_data_summary(float_summaries: list, parameters) -> dict:
         return {"float_count": len(float_summaries)}
 
 
-async def _generate_recommendations(parameters, float_summaries: list, anomaly_insights: list) -> list:
+def _generate_recommendations(parameters, float_summaries: list, anomaly_insights: list) -> list:
     """Generate AI recommendations based on query results."""
     try:
         recommendations = []
         
         if anomaly_insights:
-            recommendations.append("🔍 Investigate anomalous floats for potential oceanographic events")
-            recommendations.append("📈 Compare with satellite data and regional climate indices")
-            recommendations.append("🌊 Check for correlation with ocean current patterns")
+            recommendations.extend(_ANOMALY_RECOMMENDATIONS)
         
         if float_summaries:
             if len(float_summaries) > 10:
@@ -491,16 +642,11 @@ async def _generate_recommendations(parameters, float_summaries: list, anomaly_i
             
             # Variable-specific recommendations
             if hasattr(parameters, 'variables') and parameters.variables:
-                if 'temperature' in parameters.variables:
-                    recommendations.append("🌡️ Analyze temperature profiles for thermocline depth variations")
-                if 'salinity' in parameters.variables:
-                    recommendations.append("🧂 Examine salinity gradients for water mass identification")
-                if 'dissolved_oxygen' in parameters.variables:
-                    recommendations.append("💨 Monitor oxygen levels for marine ecosystem health")
+                variables = set(parameters.variables)
+                recommendations.extend(text for variable, text in _VARIABLE_RECOMMENDATIONS if variable in variables)
         
         else:
-            recommendations.append("🔄 Try expanding search criteria or different time periods")
-            recommendations.append("🗺️ Consider broader geographic regions")
+            recommendations.extend(_NO_RESULTS_RECOMMENDATIONS)
         
         # Add temporal recommendations
         if not (hasattr(parameters, 'start_date') and parameters.start_date):
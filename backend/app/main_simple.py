@@ -4,17 +4,24 @@ Simplified FastAPI main application for development without database.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
+from dataclasses import dataclass
+import asyncio
+import math
 import time
 import random
+import re
 from datetime import datetime, timedelta
+import numpy as np
 
 # Create FastAPI application
 app = FastAPI(
     title="FloatChat Backend (Simplified)",
     version="1.0.0",
     description="Simplified Oceanographic AI Explorer Backend API for development",
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -102,13 +109,89 @@ class AIQueryResponse(BaseModel):
     recommendations: List[str]
     processing_time: float
 
-# Sample data generator
-def generate_sample_floats(count: int = 50) -> List[FloatSummary]:
-    """Generate sample float data for development with realistic ocean positions."""
-    floats = []
-    institutions = ["WHOI", "SIO", "UW", "CSIRO", "BIO", "IFREMER", "JMA", "KORDI"]
-    statuses = ["active", "active", "active", "maintenance", "inactive"]  # More active floats
+# Random generator for vectorized sample data
+_rng = np.random.default_rng()
+
+# Float status values; FloatStore keeps each float's status as an index into this
+_FLOAT_STATUSES = ("active", "maintenance", "inactive")
+_STATUS_ACTIVE = _FLOAT_STATUSES.index("active")
+
+@dataclass
+class FloatStore:
+    """
+    Float summaries stored column-wise (struct of arrays).
+    
+    Filters scan the NumPy columns; FloatSummary models are only built for
+    the rows a response actually returns.
+    """
+    ids: np.ndarray  # int64
+    wmo_ids: List[str]
+    latitudes: np.ndarray  # float64, NaN when unknown
+    longitudes: np.ndarray  # float64, NaN when unknown
+    status_codes: np.ndarray  # uint8 indices into _FLOAT_STATUSES
+    profile_counts: np.ndarray  # int64
+    last_updates: List[Optional[str]]
+    latest_profile_dates: List[Optional[str]]
     
+    @classmethod
+    def empty(cls) -> "FloatStore":
+        """Create a store with no floats."""
+        return cls(
+            ids=np.empty(0, dtype=np.int64),
+            wmo_ids=[],
+            latitudes=np.empty(0, dtype=np.float64),
+            longitudes=np.empty(0, dtype=np.float64),
+            status_codes=np.empty(0, dtype=np.uint8),
+            profile_counts=np.empty(0, dtype=np.int64),
+            last_updates=[],
+            latest_profile_dates=[]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.wmo_ids)
+    
+    def summaries(self, indices: np.ndarray) -> List[FloatSummary]:
+        """Build FloatSummary models for the given rows."""
+        return [
+            FloatSummary.model_construct(
+                id=float_id,
+                wmo_id=self.wmo_ids[i],
+                latitude=None if math.isnan(lat) else lat,
+                longitude=None if math.isnan(lon) else lon,
+                status=_FLOAT_STATUSES[status_code],
+                last_update=self.last_updates[i],
+                profile_count=profile_count,
+                latest_profile_date=self.latest_profile_dates[i]
+            )
+            for i, float_id, lat, lon, status_code, profile_count in zip(
+                indices.tolist(),
+                self.ids[indices].tolist(),
+                self.latitudes[indices].tolist(),
+                self.longitudes[indices].tolist(),
+                self.status_codes[indices].tolist(),
+                self.profile_counts[indices].tolist()
+            )
+        ]
+
+def filter_by_region(
+    store: FloatStore,
+    lon_min: float,
+    lon_max: float,
+    status: Optional[str] = None
+) -> np.ndarray:
+    """Indices of floats with longitude in [lon_min, lon_max] and, if given, the status."""
+    # NaN longitudes compare False, so floats without a position never match
+    mask = (store.longitudes >= lon_min) & (store.longitudes <= lon_max)
+    if status is not None:
+        if status not in _FLOAT_STATUSES:
+            return np.empty(0, dtype=np.intp)
+        mask &= store.status_codes == _FLOAT_STATUSES.index(status)
+    return np.flatnonzero(mask)
+
+# Sample data generators; every field is generated locally, so models are
+# built with model_construct and skip validation
+def generate_sample_float_store(count: int = 50) -> FloatStore:
+    """Generate sample float data for development with realistic ocean positions."""
     # Define realistic ocean regions with approximate boundaries
     ocean_regions = [
         # North Pacific
@@ -137,95 +220,147 @@ def generate_sample_floats(count: int = 50) -> List[FloatSummary]:
         # Mediterranean-like regions
         {"lat_range": (30, 45), "lon_range": (-10, 40), "name": "North Atlantic East"},
     ]
+    lat_ranges = np.array([region["lat_range"] for region in ocean_regions], dtype=np.float64)
+    lon_ranges = np.array([region["lon_range"] for region in ocean_regions], dtype=np.float64)
     
-    for i in range(count):
-        wmo_id = f"190{1000 + i}"
-        
-        # Select a random ocean region
-        region = random.choice(ocean_regions)
-        
-        # Generate coordinates within that ocean region
-        lat = random.uniform(region["lat_range"][0], region["lat_range"][1])
-        lon = random.uniform(region["lon_range"][0], region["lon_range"][1])
-        
-        # Add some variation to avoid perfect grid patterns
-        lat += random.uniform(-2, 2)
-        lon += random.uniform(-5, 5)
-        
-        # Ensure coordinates stay within valid ranges
-        lat = max(-85, min(85, lat))
-        lon = max(-180, min(180, lon))
-        
-        float_data = FloatSummary(
-            id=i + 1,
-            wmo_id=wmo_id,
-            latitude=lat,
-            longitude=lon,
-            status=random.choice(statuses),
-            last_update=(datetime.utcnow() - timedelta(days=random.randint(0, 30))).isoformat(),
-            profile_count=random.randint(10, 200),
-            latest_profile_date=(datetime.utcnow() - timedelta(days=random.randint(0, 7))).isoformat()
-        )
-        floats.append(float_data)
+    # Select a random ocean region per float
+    regions = _rng.integers(0, len(ocean_regions), count)
     
-    return floats
+    # Generate coordinates within each float's region, plus some variation
+    # to avoid perfect grid patterns
+    lats = _rng.uniform(lat_ranges[regions, 0], lat_ranges[regions, 1]) + _rng.uniform(-2, 2, count)
+    lons = _rng.uniform(lon_ranges[regions, 0], lon_ranges[regions, 1]) + _rng.uniform(-5, 5, count)
+    
+    # More active floats than maintenance or inactive ones
+    status_codes = _rng.choice(len(_FLOAT_STATUSES), size=count, p=[0.6, 0.2, 0.2]).astype(np.uint8)
+    
+    now = datetime.utcnow()
+    return FloatStore(
+        ids=np.arange(1, count + 1, dtype=np.int64),
+        wmo_ids=[f"190{1000 + i}" for i in range(count)],
+        # Ensure coordinates stay within valid ranges
+        latitudes=np.clip(lats, -85, 85),
+        longitudes=np.clip(lons, -180, 180),
+        status_codes=status_codes,
+        profile_counts=_rng.integers(10, 201, count),
+        last_updates=[(now - timedelta(days=days)).isoformat() for days in _rng.integers(0, 31, count).tolist()],
+        latest_profile_dates=[(now - timedelta(days=days)).isoformat() for days in _rng.integers(0, 8, count).tolist()]
+    )
 
-def generate_sample_measurements(profile_id: int, count: int = 20) -> List[MeasurementSchema]:
-    """Generate sample measurements for a profile."""
-    measurements = []
-    now = datetime.utcnow().isoformat()
+def generate_sample_floats(count: int = 50) -> List[FloatSummary]:
+    """Generate sample float summaries for development."""
+    store = generate_sample_float_store(count)
+    return store.summaries(np.arange(len(store)))
+
+def generate_sample_measurements(
+    profile_id: int,
+    count: int = 20,
+    now_iso: Optional[str] = None
+) -> List[MeasurementSchema]:
+    """Generate sample measurements for a profile, stamped with ``now_iso`` if given."""
+    now = now_iso or datetime.utcnow().isoformat()
     
-    for i in range(count):
-        pressure = i * 50 + random.uniform(0, 20)  # Increasing pressure with depth
-        temperature = 20 - (pressure * 0.01) + random.uniform(-2, 2)  # Decreasing with depth
-        salinity = 34.5 + random.uniform(-0.5, 0.5)
-        
-        measurement = MeasurementSchema(
+    # Draw every level of the profile at once; tolist() yields plain Python floats
+    pressures = np.arange(count) * 50 + _rng.uniform(0, 20, count)  # Increasing pressure with depth
+    temperatures = 20 - (pressures * 0.01) + _rng.uniform(-2, 2, count)  # Decreasing with depth
+    salinities = 34.5 + _rng.uniform(-0.5, 0.5, count)
+    oxygen = _rng.uniform(150, 300, count)
+    ph = _rng.uniform(7.8, 8.2, count)
+    
+    # Randomly missing values, one mask per optional variable
+    has_temperature = _rng.random(count) > 0.1
+    has_salinity = _rng.random(count) > 0.1
+    has_oxygen = _rng.random(count) > 0.3
+    has_ph = _rng.random(count) > 0.5
+    
+    return [
+        MeasurementSchema.model_construct(
             id=i + 1,
             profile_id=profile_id,
             pressure=pressure,
             depth=pressure * 0.98,
-            temperature=temperature if random.random() > 0.1 else None,
-            salinity=salinity if random.random() > 0.1 else None,
-            dissolved_oxygen=random.uniform(150, 300) if random.random() > 0.3 else None,
-            ph=random.uniform(7.8, 8.2) if random.random() > 0.5 else None,
+            temperature=temperature if temperature_ok else None,
+            salinity=salinity if salinity_ok else None,
+            dissolved_oxygen=dissolved_oxygen if oxygen_ok else None,
+            ph=ph_value if ph_ok else None,
             measurement_order=i,
             created_at=now,
             updated_at=now
         )
-        measurements.append(measurement)
-    
-    return measurements
+        for i, (pressure, temperature, salinity, dissolved_oxygen, ph_value,
+                temperature_ok, salinity_ok, oxygen_ok, ph_ok) in enumerate(zip(
+            pressures.tolist(), temperatures.tolist(), salinities.tolist(), oxygen.tolist(), ph.tolist(),
+            has_temperature.tolist(), has_salinity.tolist(), has_oxygen.tolist(), has_ph.tolist()
+        ))
+    ]
 
 def generate_sample_profiles(float_id: int, count: int = 10) -> List[ProfileSchema]:
     """Generate sample profiles for a float."""
-    profiles = []
+    # Format shared timestamps once rather than per profile
     now = datetime.utcnow()
+    now_iso = now.isoformat()
+    profile_dates = [(now - timedelta(days=i * 10)).isoformat() for i in range(count)]
     
-    for i in range(count):
-        profile_date = now - timedelta(days=i * 10)
-        lat = random.uniform(-70, 70)
-        lon = random.uniform(-180, 180)
-        
-        profile = ProfileSchema(
+    latitudes = _rng.uniform(-70, 70, count).tolist()
+    longitudes = _rng.uniform(-180, 180, count).tolist()
+    measurement_counts = _rng.integers(15, 26, count).tolist()
+    
+    return [
+        ProfileSchema.model_construct(
             id=i + 1,
             float_id=float_id,
             cycle_number=i + 1,
             profile_id=f"FLOAT_{float_id}_CYCLE_{i+1:03d}",
-            timestamp=profile_date.isoformat(),
+            timestamp=profile_dates[i],
             latitude=lat,
             longitude=lon,
             direction="A",
             data_mode="R",
-            measurements=generate_sample_measurements(i + 1, random.randint(15, 25)),
-            created_at=now.isoformat(),
-            updated_at=now.isoformat()
+            measurements=generate_sample_measurements(i + 1, measurement_count, now_iso),
+            created_at=now_iso,
+            updated_at=now_iso
         )
-        profiles.append(profile)
-    
-    return profiles
+        for i, (lat, lon, measurement_count) in enumerate(zip(latitudes, longitudes, measurement_counts))
+    ]
 
 # No sample data - all floats removed
+_FLOAT_STORE = FloatStore.empty()
+
+# Keywords recognised by the simplified parameter extraction; longer
+# alternatives come first so "temperature" is not cut short at "temp"
+_KEYWORD_RE = re.compile(r"pacific|atlantic|indian|temperature|temp|salinity|salt|oxygen")
+
+# Locations in priority order, for questions that name more than one
+_LOCATION_KEYWORDS = (
+    ("pacific", "Pacific Ocean"),
+    ("atlantic", "Atlantic Ocean"),
+    ("indian", "Indian Ocean"),
+)
+
+# Longitude band searched for each location; filter_by_region is inclusive, so the
+# Pacific and Indian bands stop just short of -30/30 and the Atlantic alone owns them
+_LOCATION_LONGITUDE_BOUNDS = {
+    "Pacific Ocean": (-180.0, float(np.nextafter(-30.0, -np.inf))),
+    "Atlantic Ocean": (-30.0, 30.0),
+    "Indian Ocean": (float(np.nextafter(30.0, np.inf)), 180.0),
+}
+
+# Insight text for simplified query responses, built once at import
+_INSIGHTS_TEMPLATE = (
+    "🌊 **AI Analysis Results**\n\n"
+    "Found {float_count} oceanographic floats{location}{variables}.\n\n"
+    "{details}"
+    "💡 **Note**: This is a simplified development version with simulated data."
+)
+_STATUS_SUMMARY_TEMPLATE = "📊 **Status Summary**: {active_count} active floats out of {float_count} total.\n\n"
+_VARIABLES_AVAILABLE_TEMPLATE = "🔬 **Variables Available**: Monitoring {variables} across the selected region.\n\n"
+
+# Variables in output order, with the keywords that select each
+_VARIABLE_KEYWORDS = (
+    ("temperature", ("temperature", "temp")),
+    ("salinity", ("salinity", "salt")),
+    ("dissolved_oxygen", ("oxygen",)),
+)
 
 # API Endpoints
 @app.get("/")
@@ -260,23 +395,14 @@ async def process_ai_query(query_input: AIQueryInput) -> AIQueryResponse:
     # Simple parameter extraction based on keywords
     question = query_input.question.lower()
     
+    # Find every known keyword in a single scan
+    keywords = set(_KEYWORD_RE.findall(question))
+    
     # Extract location
-    location = None
-    if "pacific" in question:
-        location = "Pacific Ocean"
-    elif "atlantic" in question:
-        location = "Atlantic Ocean"
-    elif "indian" in question:
-        location = "Indian Ocean"
+    location = next((name for keyword, name in _LOCATION_KEYWORDS if keyword in keywords), None)
     
     # Extract variables
-    variables = []
-    if "temperature" in question or "temp" in question:
-        variables.append("temperature")
-    if "salinity" in question or "salt" in question:
-        variables.append("salinity")
-    if "oxygen" in question:
-        variables.append("dissolved_oxygen")
+    variables = [variable for variable, aliases in _VARIABLE_KEYWORDS if not keywords.isdisjoint(aliases)]
     
     # Create parameters
     parameters = QueryParameters(
@@ -285,38 +411,35 @@ async def process_ai_query(query_input: AIQueryInput) -> AIQueryResponse:
         general_search_term=query_input.question if not variables and not location else None
     )
     
-    # Filter floats based on simple criteria - NO FLOATS
-    matching_floats = []  # Empty list - no sample floats
-    
-    # Simple location filtering
+    # Filter floats based on simple criteria - NO FLOATS (the store is empty)
     if location:
-        if "pacific" in location.lower():
-            matching_floats = [f for f in matching_floats if f.longitude and f.longitude < -30]
-        elif "atlantic" in location.lower():
-            matching_floats = [f for f in matching_floats if f.longitude and -30 <= f.longitude <= 30]
-        elif "indian" in location.lower():
-            matching_floats = [f for f in matching_floats if f.longitude and f.longitude > 30]
+        lon_min, lon_max = _LOCATION_LONGITUDE_BOUNDS[location]
+        indices = filter_by_region(_FLOAT_STORE, lon_min, lon_max)
+    else:
+        indices = np.arange(len(_FLOAT_STORE))
     
-    # Limit results
-    matching_floats = matching_floats[:20]
+    # Limit results; only the returned rows become FloatSummary objects
+    top_indices = indices[:20]
+    matching_floats = _FLOAT_STORE.summaries(top_indices)
     
     # Generate insights
-    insights = f"🌊 **AI Analysis Results**\n\n"
-    insights += f"Found {len(matching_floats)} oceanographic floats"
-    if location:
-        insights += f" in the {location}"
-    if variables:
-        insights += f" with {', '.join(variables)} measurements"
-    insights += ".\n\n"
+    float_count = len(matching_floats)
+    variable_names = ", ".join(variables)
     
-    if len(matching_floats) > 0:
-        active_count = len([f for f in matching_floats if f.status == "active"])
-        insights += f"📊 **Status Summary**: {active_count} active floats out of {len(matching_floats)} total.\n\n"
+    details = ""
+    if float_count > 0:
+        active_count = int((_FLOAT_STORE.status_codes[top_indices] == _STATUS_ACTIVE).sum())
+        details = _STATUS_SUMMARY_TEMPLATE.format_map({"active_count": active_count, "float_count": float_count})
         
         if variables:
-            insights += f"🔬 **Variables Available**: Monitoring {', '.join(variables)} across the selected region.\n\n"
+            details += _VARIABLES_AVAILABLE_TEMPLATE.format_map({"variables": variable_names})
     
-    insights += "💡 **Note**: This is a simplified development version with simulated data."
+    insights = _INSIGHTS_TEMPLATE.format_map({
+        "float_count": float_count,
+        "location": f" in the {location}" if location else "",
+        "variables": f" with {variable_names} measurements" if variables else "",
+        "details": details
+    })
     
     # Generate recommendations
     recommendations = [
@@ -334,14 +457,16 @@ async def process_ai_query(query_input: AIQueryInput) -> AIQueryResponse:
     # Create data summary
     data_summary = {
         "float_count": len(matching_floats),
-        "total_profiles": sum(f.profile_count for f in matching_floats),
+        "total_profiles": int(_FLOAT_STORE.profile_counts[top_indices].sum()),
         "query_parameters": parameters.dict(),
         "simulated": True
     }
     
     processing_time = time.time() - start_time
     
-    return AIQueryResponse(
+    # Every field is built above from validated models, so skip re-validation
+    # and hand the dumped dict straight to orjson
+    response = AIQueryResponse.model_construct(
         query=query_input.question,
         parameters=parameters,
         floats=matching_floats,
@@ -350,6 +475,7 @@ async def process_ai_query(query_input: AIQueryInput) -> AIQueryResponse:
         recommendations=recommendations,
         processing_time=processing_time
     )
+    return ORJSONResponse(content=response.model_dump())
 
 @app.get("/api/v1/float/{wmo_id}", response_model=FloatDetail)
 async def get_float_by_wmo_id(wmo_id: str) -> FloatDetail:
@@ -365,13 +491,14 @@ async def get_float_by_wmo_id(wmo_id: str) -> FloatDetail:
     
     # Generate detailed float data
     now = datetime.utcnow().isoformat()
-    profiles = generate_sample_profiles(float_data.id, random.randint(5, 15))
+    # Generation is CPU-bound; run it in a worker thread to keep the event loop free
+    profiles = await asyncio.to_thread(generate_sample_profiles, float_data.id, random.randint(5, 15))
     
     institutions = ["Woods Hole Oceanographic Institution", "Scripps Institution of Oceanography", 
                    "University of Washington", "CSIRO", "Bedford Institute of Oceanography"]
     platforms = ["APEX", "SOLO", "PROVOR", "ARVOR", "NOVA"]
     
-    detailed_float = FloatDetail(
+    detailed_float = FloatDetail.model_construct(
         id=float_data.id,
         wmo_id=float_data.wmo_id,
         deployment_latitude=float_data.latitude,
@@ -388,7 +515,7 @@ async def get_float_by_wmo_id(wmo_id: str) -> FloatDetail:
         updated_at=now
     )
     
-    return detailed_float
+    return ORJSONResponse(content=detailed_float.model_dump())
 
 @app.get("/api/v1/floats")
 @app.get("/api/v1/floats-empty")
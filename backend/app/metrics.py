@@ -0,0 +1,71 @@
+"""
+Prometheus metrics and per-request stage timing for FloatChat backend.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from prometheus_client import Counter, Histogram
+
+
+# Latency of each AI query processing stage (parameter extraction, DB, LLM, ...)
+STAGE_LATENCY = Histogram(
+    "floatchat_query_stage_seconds",
+    "Time spent in each AI query processing stage",
+    ["stage"]
+)
+
+# End-to-end latency of AI queries, whatever their outcome
+AI_QUERY_LATENCY = Histogram(
+    "floatchat_ai_query_seconds",
+    "End-to-end AI query processing time",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10)
+)
+
+# Processed AI queries by outcome
+AI_QUERY_COUNT = Counter(
+    "floatchat_ai_query_total",
+    "AI queries processed",
+    ["status"]
+)
+
+# Questions rejected as off-topic before reaching the LLM
+OFF_TOPIC_REJECTIONS = Counter(
+    "floatchat_off_topic_rejections_total",
+    "AI queries rejected by the keyword pre-filter"
+)
+
+# Stage durations in nanoseconds for the current request
+_stage_timings: ContextVar[Optional[Dict[str, int]]] = ContextVar("stage_timings", default=None)
+
+
+def start_stage_timing() -> None:
+    """Begin collecting stage timings for the current request."""
+    _stage_timings.set({})
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a processing stage with a monotonic clock.
+
+    Args:
+        name: Stage label used in metrics and timing summaries
+    """
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        timings = _stage_timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0) + elapsed
+        STAGE_LATENCY.labels(stage=name).observe(elapsed / 1e9)
+
+
+def get_stage_timings() -> Dict[str, float]:
+    """Get the stage timings collected for the current request, in seconds."""
+    timings = _stage_timings.get() or {}
+    return {name: elapsed / 1e9 for name, elapsed in timings.items()}
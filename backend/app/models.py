@@ -4,13 +4,13 @@ SQLAlchemy ORM models for FloatChat oceanographic data.
 
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import Column, Integer, String, Float as FloatType, DateTime, ForeignKey, Text, Boolean
-from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy import Column, Integer, String, Float as FloatType, DateTime, ForeignKey, Text, Boolean, Index, event, func, inspect, select
+from sqlalchemy.orm import relationship, Mapped, mapped_column, Session
 from sqlalchemy.dialects.postgresql import UUID
 # from geoalchemy2 import Geometry  # Commented out - requires PostGIS extension
 import uuid
 
-from app.database import Base
+from app.database import Base, FloatChatSession
 
 
 class Float(Base):
@@ -18,6 +18,19 @@ class Float(Base):
     Oceanographic float model representing Argo floats.
     """
     __tablename__ = "floats"
+    __table_args__ = (
+        # Keyset pagination of the float list (newest first)
+        Index("ix_floats_created_at_id", "created_at", "id"),
+        # Last-modified lookups for list ETags
+        Index("ix_floats_updated_at", "updated_at"),
+        # Substring (ILIKE '%...%') search on WMO ID; requires the pg_trgm extension
+        Index(
+            "ix_floats_wmo_id_trgm",
+            "wmo_id",
+            postgresql_using="gin",
+            postgresql_ops={"wmo_id": "gin_trgm_ops"}
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     wmo_id: Mapped[str] = mapped_column(String(20), unique=True, index=True, nullable=False)
@@ -37,12 +50,18 @@ class Float(Base):
     deployment_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     last_update: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
+    # Latest profile position and profile count, recomputed whenever profiles are flushed
+    last_profile_timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_latitude: Mapped[Optional[float]] = mapped_column(FloatType, nullable=True)
+    last_longitude: Mapped[Optional[float]] = mapped_column(FloatType, nullable=True)
+    profile_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
-    profiles: Mapped[List["Profile"]] = relationship("Profile", back_populates="float", cascade="all, delete-orphan")
+    # Relationships (lazy="raise": load collections explicitly, never on attribute access)
+    profiles: Mapped[List["Profile"]] = relationship("Profile", back_populates="float", cascade="all, delete-orphan", lazy="raise")
 
     def __repr__(self):
         return f"<Float(wmo_id='{self.wmo_id}', status='{self.status}')>"
@@ -53,6 +72,19 @@ class Profile(Base):
     Profile model representing a single oceanographic profile from a float.
     """
     __tablename__ = "profiles"
+    __table_args__ = (
+        # Keyset pagination of the profile list (newest first)
+        Index("ix_profiles_timestamp_id", "timestamp", "id"),
+        # Bounding-box prefilter for nearby-float searches
+        Index("ix_profiles_latitude_longitude", "latitude", "longitude"),
+        # Latest profile of a float, answered by an index-only (backward) scan
+        Index(
+            "ix_profiles_float_id_timestamp",
+            "float_id",
+            "timestamp",
+            postgresql_include=["latitude", "longitude"]
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
@@ -91,12 +123,76 @@ class Profile(Base):
     
     # Relationships
     float: Mapped["Float"] = relationship("Float", back_populates="profiles")
-    measurements: Mapped[List["Measurement"]] = relationship("Measurement", back_populates="profile", cascade="all, delete-orphan")
+    measurements: Mapped[List["Measurement"]] = relationship("Measurement", back_populates="profile", cascade="all, delete-orphan", lazy="raise")
 
     def __repr__(self):
         return f"<Profile(profile_id='{self.profile_id}', timestamp='{self.timestamp}')>"
 
 
+# R-tree index on profile positions for bounding-box (point <@ box) searches;
+# point() and GiST exist only on PostgreSQL
+Index(
+    "ix_profiles_position_gist",
+    func.point(Profile.longitude, Profile.latitude),
+    postgresql_using="gist"
+).ddl_if(dialect="postgresql")
+
+
+# Profile columns whose changes move a float's count or latest position
+_PROFILE_STATS_ATTRS = ("float_id", "timestamp", "latitude", "longitude")
+
+
+@event.listens_for(FloatChatSession, "after_flush")
+def _refresh_float_profile_stats(session: Session, flush_context) -> None:
+    """
+    Recompute the denormalized latest-profile columns of floats whose profiles changed.
+    
+    Inserted, deleted and moved or re-timed profiles are collected for the
+    whole flush and their floats recomputed from ``profiles`` in a single
+    UPDATE, so a float ingested in one flush costs one extra statement.
+    """
+    float_ids = set()
+    for instance in (*session.new, *session.deleted):
+        if isinstance(instance, Profile):
+            float_ids.add(instance.float_id)
+    for instance in session.dirty:
+        if not isinstance(instance, Profile):
+            continue
+        state = inspect(instance)
+        for attr in _PROFILE_STATS_ATTRS:
+            history = state.attrs[attr].history
+            if history.has_changes():
+                float_ids.add(instance.float_id)
+                if attr == "float_id":
+                    float_ids.update(history.deleted)
+    float_ids.discard(None)
+    if not float_ids:
+        return
+    
+    floats = Float.__table__
+    profiles = Profile.__table__
+    
+    def latest(column):
+        return (
+            select(column)
+            .where(profiles.c.float_id == floats.c.id)
+            .order_by(profiles.c.timestamp.desc(), profiles.c.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+    
+    session.connection().execute(
+        floats.update()
+        .where(floats.c.id.in_(float_ids))
+        .values(
+            profile_count=select(func.count()).where(profiles.c.float_id == floats.c.id).scalar_subquery(),
+            last_profile_timestamp=latest(profiles.c.timestamp),
+            last_latitude=latest(profiles.c.latitude),
+            last_longitude=latest(profiles.c.longitude)
+        )
+    )
+
+
 class Measurement(Base):
     """
     Measurement model representing individual oceanographic measurements within a profile.
@@ -143,3 +239,40 @@ class Measurement(Base):
 
     def __repr__(self):
         return f"<Measurement(pressure={self.pressure}, temperature={self.temperature}, salinity={self.salinity})>"
+
+
+@event.listens_for(FloatChatSession, "after_flush")
+def _touch_parents_of_changed_measurements(session: Session, flush_context) -> None:
+    """
+    Advance updated_at on the profiles and floats whose measurements changed.
+    
+    Measurement rewrites do not otherwise touch either parent row, so their
+    ETags (derived from updated_at) would keep validating stale payloads.
+    Dirty measurements without a net change to their columns are ignored.
+    """
+    changed = (
+        *session.new,
+        *session.deleted,
+        *(instance for instance in session.dirty if session.is_modified(instance))
+    )
+    profile_ids = {
+        instance.profile_id
+        for instance in changed
+        if isinstance(instance, Measurement) and instance.profile_id is not None
+    }
+    if not profile_ids:
+        return
+    
+    now = datetime.utcnow()
+    profiles = Profile.__table__
+    floats = Float.__table__
+    connection = session.connection()
+    
+    connection.execute(
+        profiles.update().where(profiles.c.id.in_(profile_ids)).values(updated_at=now)
+    )
+    connection.execute(
+        floats.update()
+        .where(floats.c.id.in_(select(profiles.c.float_id).where(profiles.c.id.in_(profile_ids))))
+        .values(updated_at=now)
+    )
@@ -0,0 +1,82 @@
+"""
+Pagination helpers for list endpoints: keyset cursors and cached totals.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.services.cache import cache_service
+
+# Time to live for cached unfiltered table counts, in seconds
+_TABLE_COUNT_TTL = 60
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """
+    Encode the position of the last row on a page as an opaque cursor.
+
+    Args:
+        sort_value: Value of the sort column for the last row
+        row_id: Primary key of the last row, used as a tie-breaker
+
+    Returns:
+        str: URL-safe base64 cursor
+    """
+    payload = json.dumps({"ts": sort_value.isoformat(), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor from a previous page's ``next_cursor``
+
+    Returns:
+        Tuple[datetime, int]: Sort value and id of the last row seen
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["ts"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "Invalid Cursor", "message": f"Malformed pagination cursor: {e}"}
+        )
+
+
+async def cached_table_count(db: AsyncSession, column: InstrumentedAttribute, name: str) -> int:
+    """
+    Count all rows of a table, caching the result briefly in Redis.
+
+    Only unfiltered totals are cached; they are shared by every client
+    paging through the same list.
+
+    Args:
+        db: Database session
+        column: Primary key column of the table to count
+        name: Table name used in the cache key
+
+    Returns:
+        int: Row count
+    """
+    key = f"floatchat:count:{name}"
+    cached: Optional[int] = await cache_service.get_json(key)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(func.count(column)))
+    total = result.scalar()
+    await cache_service.set_json(key, total, _TABLE_COUNT_TTL)
+    return total
@@ -2,8 +2,9 @@
 Pydantic schemas for FloatChat API request/response models.
 """
 
+import sys
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Literal
 from pydantic import BaseModel, Field, validator, ConfigDict
 from enum import Enum
 
@@ -163,6 +164,35 @@ class AIQueryInput(BaseModel):
         return v.strip()
 
 
+class FloatIdIntent(BaseModel):
+    """Query intent targeting a single float by database ID or WMO ID."""
+    kind: Literal["float_id"] = "float_id"
+    float_id: int = Field(..., description="Float database ID or WMO ID")
+
+
+# Canonical ocean region names, interned so dict lookups compare by identity
+OCEAN_NAMES = frozenset(map(sys.intern, (
+    "Pacific Ocean",
+    "Atlantic Ocean",
+    "Indian Ocean",
+    "Arctic Ocean",
+    "Southern Ocean"
+)))
+
+
+class ComparisonIntent(BaseModel):
+    """Query intent comparing two or more ocean regions."""
+    kind: Literal["comparison"] = "comparison"
+    oceans: List[str] = Field(..., min_length=2, description="Ocean regions to compare")
+    
+    @validator('oceans', each_item=True)
+    def validate_ocean(cls, v):
+        v = sys.intern(v.strip())
+        if v not in OCEAN_NAMES:
+            raise ValueError(f'Unknown ocean region: {v}')
+        return v
+
+
 class QueryParameters(BaseModel):
     """Schema for structured AI query parameters."""
     location: Optional[str] = Field(None, description="Geographic location or region")
@@ -173,6 +203,9 @@ class QueryParameters(BaseModel):
     depth_range: Optional[List[float]] = Field(None, description="Depth range [min_depth, max_depth] in meters")
     status: Optional[str] = Field(None, description="Float status filter (active, inactive, maintenance)")
     general_search_term: Optional[str] = Field(None, description="General search term for text matching")
+    intent: Optional[Union[FloatIdIntent, ComparisonIntent]] = Field(
+        None, discriminator="kind", description="Special query intent (float lookup or ocean comparison)"
+    )
     
     @validator('bbox')
     def validate_bbox(cls, v):
@@ -244,13 +277,16 @@ class PaginationParams(BaseModel):
 class PaginatedResponse(BaseModel):
     """Paginated response schema."""
     items: List[Any] = Field(..., description="Items in current page")
-    total: int = Field(..., description="Total number of items")
+    total: Optional[int] = Field(None, description="Total number of items, if requested")
     page: int = Field(..., description="Current page number")
     size: int = Field(..., description="Page size")
-    pages: int = Field(..., description="Total number of pages")
+    pages: Optional[int] = Field(None, description="Total number of pages, if the total was requested")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there is one")
     
     @validator('pages', pre=True, always=True)
     def calculate_pages(cls, v, values):
-        total = values.get('total', 0)
+        total = values.get('total')
+        if total is None:
+            return None
         size = values.get('size', 1)
         return (total + size - 1) // size if total > 0 else 0
@@ -18,6 +18,7 @@ from pydantic import ValidationError
 
 from app.config import settings
 from app.schemas import QueryParameters
+from app.services.cache import semantic_cache
 
 logger = logging.getLogger(__name__)
 
@@ -172,7 +173,7 @@ Response:"""
             return self._fallback_extraction(question)
         
         try:
-            logger.info(f"Processing AI query: {question[:100]}...")
+            logger.info("Processing AI query: %s...", question[:100])
             
             # Invoke the chain asynchronously
             response = await self._invoke_chain_async(question)
@@ -180,7 +181,8 @@ Response:"""
             # Parse the response
             parameters = self._parse_llm_response(response, question)
             
-            logger.info(f"Successfully extracted parameters: {parameters.dict()}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully extracted parameters: %s", parameters.model_dump())
             return parameters
             
         except Exception as e:
@@ -188,8 +190,9 @@ Response:"""
             logger.info("Falling back to basic parameter extraction")
             return self._fallback_extraction(question)
     
+    @semantic_cache(namespace=f"query_params:{settings.APP_VERSION}", ttl=3600, normalize_strings=True)
     async def _invoke_chain_async(self, question: str) -> str:
-        """Invoke the LangChain asynchronously."""
+        """Invoke the LangChain asynchronously (cached by normalized question)."""
         loop = asyncio.get_event_loop()
         
         def _invoke():
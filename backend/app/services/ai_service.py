@@ -4,15 +4,35 @@ AI service for processing natural language queries about oceanographic data.
 
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import re
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import httpx
+import orjson
 
 from app.config import settings
-from app.schemas import AIQueryInput, QueryParameters, AIQueryResponse
+from app.schemas import AIQueryInput, QueryParameters, AIQueryResponse, FloatIdIntent, ComparisonIntent
+from app.services.cache import semantic_cache
 
 logger = logging.getLogger(__name__)
 
+# Float ID query patterns (e.g., "show me float 123", "data for float id 5904818")
+_FLOAT_ID_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'float\s+(?:id\s+)?(\d+)',
+    r'float\s+#(\d+)',
+    r'id\s+(\d+)',
+    r'wmo\s+(?:id\s+)?(\d+)',
+))
+
+# Keywords that select each ocean for comparison queries, in output order
+_COMPARISON_OCEAN_KEYWORDS = (
+    ('Pacific Ocean', ('pacific',)),
+    ('Atlantic Ocean', ('atlantic',)),
+    ('Indian Ocean', ('indian',)),
+    ('Arctic Ocean', ('arctic',)),
+    ('Southern Ocean', ('southern', 'south')),
+)
+
 
 class AIService:
     """Service for AI-powered query processing using Groq Llama."""
@@ -21,6 +41,7 @@ class AIService:
         self.groq_api_key = settings.GROQ_API_KEY
         self.groq_api_url = "https://api.groq.com/openai/v1/chat/completions"
         self.model = "gemma2-9b-it"  # Fast and efficient model
+        self._client: Optional[httpx.AsyncClient] = None
         
         if not self.groq_api_key:
             logger.warning("No Groq API key configured - AI features will be limited")
@@ -58,11 +79,34 @@ class AIService:
             # Fallback to basic extraction
             return self._extract_basic_parameters(query_input.question)
     
+    def build_prompt_context(
+        self, 
+        parameters: QueryParameters, 
+        data_summary: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        """
+        Serialize query parameters and data summary for LLM prompts.
+        
+        Callers generating both insights and recommendations can build this
+        once and pass it to each, instead of serializing the data summary twice.
+        
+        Args:
+            parameters: Extracted query parameters
+            data_summary: Summary of retrieved data
+            
+        Returns:
+            Tuple[str, str]: JSON-encoded parameters and data summary
+        """
+        parameters_json = parameters.model_dump_json()
+        summary_json = orjson.dumps(data_summary, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        return parameters_json, summary_json
+    
     async def generate_insights(
         self, 
         query: str, 
         parameters: QueryParameters, 
-        data_summary: Dict[str, Any]
+        data_summary: Dict[str, Any],
+        prompt_context: Optional[Tuple[str, str]] = None
     ) -> str:
         """
         Generate AI insights about the oceanographic data.
@@ -71,6 +115,7 @@ class AIService:
             query: Original user query
             parameters: Extracted query parameters
             data_summary: Summary of retrieved data
+            prompt_context: Pre-serialized parameters and data summary, if available
             
         Returns:
             str: AI-generated insights
@@ -79,7 +124,9 @@ class AIService:
             return self._generate_basic_insights(data_summary)
         
         try:
-            prompt = self._create_insights_prompt(query, parameters, data_summary)
+            if prompt_context is None:
+                prompt_context = self.build_prompt_context(parameters, data_summary)
+            prompt = self._create_insights_prompt(query, *prompt_context)
             insights = await self._call_llm(prompt)
             return insights
             
@@ -91,7 +138,8 @@ class AIService:
         self, 
         query: str, 
         parameters: QueryParameters, 
-        data_summary: Dict[str, Any]
+        data_summary: Dict[str, Any],
+        prompt_context: Optional[Tuple[str, str]] = None
     ) -> List[str]:
         """
         Generate AI recommendations for further analysis.
@@ -100,6 +148,7 @@ class AIService:
             query: Original user query
             parameters: Extracted query parameters
             data_summary: Summary of retrieved data
+            prompt_context: Pre-serialized parameters and data summary, if available
             
         Returns:
             List[str]: List of recommendations
@@ -108,7 +157,9 @@ class AIService:
             return self._generate_basic_recommendations(parameters)
         
         try:
-            prompt = self._create_recommendations_prompt(query, parameters, data_summary)
+            if prompt_context is None:
+                prompt_context = self.build_prompt_context(parameters, data_summary)
+            prompt = self._create_recommendations_prompt(query, *prompt_context)
             response = await self._call_llm(prompt)
             
             # Parse recommendations from response
@@ -144,8 +195,8 @@ class AIService:
     def _create_insights_prompt(
         self, 
         query: str, 
-        parameters: QueryParameters, 
-        data_summary: Dict[str, Any]
+        parameters_json: str, 
+        summary_json: str
     ) -> str:
         """Create prompt for generating insights."""
         template = """
@@ -168,15 +219,15 @@ class AIService:
         
         return template.format(
             query=query,
-            parameters=parameters.dict(),
-            data_summary=data_summary
+            parameters=parameters_json,
+            data_summary=summary_json
         )
     
     def _create_recommendations_prompt(
         self, 
         query: str, 
-        parameters: QueryParameters, 
-        data_summary: Dict[str, Any]
+        parameters_json: str, 
+        summary_json: str
     ) -> str:
         """Create prompt for generating recommendations."""
         template = """
@@ -198,43 +249,55 @@ class AIService:
         
         return template.format(
             query=query,
-            parameters=parameters.dict(),
-            data_summary=data_summary
+            parameters=parameters_json,
+            data_summary=summary_json
         )
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client so concurrent LLM calls reuse connections."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient()
+        return self._client
+    
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    @semantic_cache(namespace="llm", ttl=3600)
     async def _call_llm(self, prompt: str) -> str:
-        """Call Groq Llama model with the given prompt."""
+        """Call Groq Llama model with the given prompt (cached by exact prompt)."""
         if not self.groq_api_key:
             raise ValueError("No Groq API key configured")
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.groq_api_url,
-                    headers={
-                        "Authorization": f"Bearer {self.groq_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an expert oceanographic data analyst. Provide concise, accurate responses."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "temperature": 0.1,
-                        "max_tokens": 1000
-                    },
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
+            response = await self._get_client().post(
+                self.groq_api_url,
+                headers={
+                    "Authorization": f"Bearer {self.groq_api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are an expert oceanographic data analyst. Provide concise, accurate responses."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    "temperature": 0.1,
+                    "max_tokens": 1000
+                },
+                timeout=30.0
+            )
+            response.raise_for_status()
+            result = response.json()
+            return result["choices"][0]["message"]["content"].strip()
                 
         except Exception as e:
             logger.error(f"Groq API call failed: {e}")
@@ -287,21 +350,11 @@ class AIService:
         """Basic parameter extraction without AI."""
         question_lower = question.lower()
         
-        # Check for float ID queries (e.g., "show me float 123", "data for float id 5904818")
-        import re
-        float_id_patterns = [
-            r'float\s+(?:id\s+)?(\d+)',
-            r'float\s+#(\d+)',
-            r'id\s+(\d+)',
-            r'wmo\s+(?:id\s+)?(\d+)',
-        ]
-        
-        for pattern in float_id_patterns:
-            match = re.search(pattern, question_lower)
+        # Check for float ID queries
+        for pattern in _FLOAT_ID_PATTERNS:
+            match = pattern.search(question_lower)
             if match:
-                float_id = match.group(1)
-                # Store float ID in general_search_term with special prefix
-                return QueryParameters(general_search_term=f"FLOAT_ID:{float_id}")
+                return QueryParameters(intent=FloatIdIntent(float_id=int(match.group(1))))
         
         # Check if query is relevant to oceanographic data
         irrelevant_keywords = ['weather', 'stock', 'news', 'sports', 'movie', 'music', 'recipe', 'game', 'joke', 'story', 'song']
@@ -339,17 +392,10 @@ class AIService:
         comparison_match = None
         if 'compare' in question_lower or 'between' in question_lower or 'versus' in question_lower or 'vs' in question_lower:
             # Extract all ocean names for comparison
-            oceans = []
-            if 'pacific' in question_lower:
-                oceans.append('Pacific Ocean')
-            if 'atlantic' in question_lower:
-                oceans.append('Atlantic Ocean')
-            if 'indian' in question_lower:
-                oceans.append('Indian Ocean')
-            if 'arctic' in question_lower:
-                oceans.append('Arctic Ocean')
-            if 'southern' in question_lower or 'south' in question_lower:
-                oceans.append('Southern Ocean')
+            oceans = [
+                ocean for ocean, keywords in _COMPARISON_OCEAN_KEYWORDS
+                if any(keyword in question_lower for keyword in keywords)
+            ]
             
             if len(oceans) >= 2:
                 comparison_match = oceans
@@ -377,10 +423,9 @@ class AIService:
         elif 'maintenance' in question_lower:
             status = 'maintenance'
         
-        # Store comparison info in general_search_term temporarily
-        if comparison_match:
-            general_search_term = f"COMPARISON:{','.join(comparison_match)}"
-        elif not (status or location or variables):
+        intent = ComparisonIntent(oceans=comparison_match) if comparison_match else None
+        
+        if not (comparison_match or status or location or variables):
             # Only use text search if no specific filters found
             general_search_term = question
         else:
@@ -390,7 +435,8 @@ class AIService:
             location=location,
             variables=variables,
             status=status,
-            general_search_term=general_search_term
+            general_search_term=general_search_term,
+            intent=intent
         )
     
     def _generate_basic_insights(self, data_summary: Dict[str, Any]) -> str:
@@ -468,7 +514,7 @@ class AIService:
             recommendations.append("Filter by active floats only")
         
         # Always add a comparison suggestion if not already comparing
-        if parameters.location and not (parameters.general_search_term and 'COMPARISON' in parameters.general_search_term):
+        if parameters.location and not isinstance(parameters.intent, ComparisonIntent):
             recommendations.append(f"Compare temperature between {parameters.location} and Atlantic Ocean")
         
         return recommendations[:5]  # Limit to 5
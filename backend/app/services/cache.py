@@ -0,0 +1,282 @@
+"""
+Redis-backed caching service for expensive AI and database results.
+"""
+
+import functools
+import hashlib
+import logging
+import re
+from typing import Any, Callable, Optional, Type
+
+import orjson
+import redis.asyncio as aioredis
+from pydantic import BaseModel
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+DATA_VERSION_KEY = "floatchat:data_version"
+
+# Cached values may hold integer-keyed dicts and NumPy scalars
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class CacheService:
+    """Service for caching JSON-serializable results in Redis."""
+
+    def __init__(self):
+        self.redis_url = settings.REDIS_URL
+        self.client: Optional[aioredis.Redis] = None
+
+        if not self.redis_url:
+            logger.warning("No Redis URL configured - response caching disabled")
+        else:
+            self.client = aioredis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                max_connections=settings.REDIS_MAX_CONNECTIONS
+            )
+            logger.info("Cache service initialized with Redis")
+
+    def is_available(self) -> bool:
+        """Check if the Redis cache is configured."""
+        return self.client is not None
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        """
+        Fetch and decode a cached JSON value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Decoded value, or None on a miss or if Redis is unavailable
+        """
+        if not self.client:
+            return None
+
+        try:
+            cached = await self.client.get(key)
+            return orjson.loads(cached) if cached is not None else None
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+
+    async def set_json(self, key: str, value: Any, ttl: int) -> None:
+        """
+        Encode and store a value as JSON with an expiry.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl: Time to live in seconds
+        """
+        if not self.client:
+            return
+
+        try:
+            await self.client.set(key, orjson.dumps(value, default=str, option=_JSON_OPTIONS), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+    async def get_raw(self, key: str) -> Optional[str]:
+        """
+        Fetch a cached value without decoding it.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stored string, or None on a miss or if Redis is unavailable
+        """
+        if not self.client:
+            return None
+
+        try:
+            return await self.client.get(key)
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+
+    async def set_raw(self, key: str, value: str, ttl: int) -> None:
+        """
+        Store an already-serialized value with an expiry.
+
+        Args:
+            key: Cache key
+            value: Serialized value
+            ttl: Time to live in seconds
+        """
+        if not self.client:
+            return
+
+        try:
+            await self.client.set(key, value, ex=ttl)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+    async def is_member(self, key: str, member: str) -> bool:
+        """
+        Check whether a value is in a cached set.
+
+        Args:
+            key: Set key
+            member: Value to look up
+
+        Returns:
+            True if the value is in the set; False on a miss or if Redis is unavailable
+        """
+        if not self.client:
+            return False
+
+        try:
+            return bool(await self.client.sismember(key, member))
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return False
+
+    async def add_member(self, key: str, member: str, ttl: int) -> None:
+        """
+        Add a value to a cached set and refresh the set's expiry.
+
+        Args:
+            key: Set key
+            member: Value to add
+            ttl: Time to live of the whole set in seconds
+        """
+        if not self.client:
+            return
+
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.sadd(key, member)
+                pipe.expire(key, ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+    async def get_data_version(self) -> str:
+        """
+        Get the current data version epoch.
+        
+        The epoch is part of response cache keys, so bumping it after data
+        ingestion invalidates every cached response at once.
+        """
+        if not self.client:
+            return "0"
+
+        try:
+            return await self.client.get(DATA_VERSION_KEY) or "0"
+        except Exception as e:
+            logger.warning(f"Cache read failed for {DATA_VERSION_KEY}: {e}")
+            return "0"
+
+    async def bump_data_version(self) -> None:
+        """Advance the data version epoch after floats or profiles change."""
+        if not self.client:
+            return
+
+        try:
+            await self.client.incr(DATA_VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Failed to bump data version: {e}")
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self.client:
+            await self.client.close()
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question so trivially different phrasings share a cache key."""
+    return _WHITESPACE_RE.sub(" ", question.strip().lower()).rstrip("?!. ")
+
+
+def _normalize_value(value: Any, normalize_strings: bool = False) -> Any:
+    """
+    Recursively convert call arguments into a stable, hashable form.
+
+    Strings are kept verbatim unless ``normalize_strings`` is set, in which
+    case they go through normalize_question.
+    """
+    if isinstance(value, BaseModel):
+        return _normalize_value(value.model_dump(mode="json"), normalize_strings)
+    if isinstance(value, str):
+        return normalize_question(value) if normalize_strings else value
+    if isinstance(value, dict):
+        return {str(k): _normalize_value(v, normalize_strings) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v, normalize_strings) for v in value]
+    return value
+
+
+def make_cache_key(namespace: str, *parts: Any, normalize_strings: bool = False) -> str:
+    """
+    Build a cache key from a namespace and arguments.
+
+    Args:
+        namespace: Key prefix grouping related entries
+        parts: Values the cached result depends on
+        normalize_strings: Normalize string parts with normalize_question, for
+            user questions; other text (e.g. LLM prompts) is hashed verbatim
+
+    Returns:
+        Key of the form ``floatchat:<namespace>:<sha256>``
+    """
+    payload = orjson.dumps(
+        _normalize_value(list(parts), normalize_strings),
+        default=str,
+        option=orjson.OPT_SORT_KEYS
+    )
+    digest = hashlib.sha256(payload).hexdigest()
+    return f"floatchat:{namespace}:{digest}"
+
+
+def semantic_cache(
+    namespace: str,
+    ttl: int = 3600,
+    model: Optional[Type[BaseModel]] = None,
+    normalize_strings: bool = False
+) -> Callable:
+    """
+    Cache the result of an async service method in Redis.
+
+    The key is derived from the call arguments (excluding ``self``). Methods
+    that take a user question set ``normalize_strings`` so trivially
+    rephrased questions skip the LLM round-trip; anything else is keyed on
+    its exact arguments.
+
+    Args:
+        namespace: Key prefix for this method's entries
+        ttl: Time to live in seconds
+        model: Pydantic model used to rebuild cached results, if any
+        normalize_strings: Normalize string arguments with normalize_question
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if not cache_service.is_available():
+                return await func(self, *args, **kwargs)
+
+            key = make_cache_key(namespace, list(args), kwargs, normalize_strings=normalize_strings)
+            cached = await cache_service.get_json(key)
+            if cached is not None:
+                logger.debug(f"Cache hit for {namespace}")
+                return model(**cached) if model else cached
+
+            result = await func(self, *args, **kwargs)
+            value = result.model_dump(mode="json") if isinstance(result, BaseModel) else result
+            await cache_service.set_json(key, value, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# Global cache service instance
+cache_service = CacheService()
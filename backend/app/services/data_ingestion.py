@@ -21,6 +21,7 @@ from app.database import AsyncSessionLocal
 from app.models import Float, Profile, Measurement
 from app.schemas import FloatCreate, ProfileCreate, MeasurementCreate
 from app.config import settings
+from app.services.cache import cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +69,7 @@ class ArgoDataIngestionService:
                     float_obj = await self._create_float(session, wmo_id, float_data)
                 
                 await session.commit()
+                await cache_service.bump_data_version()
                 logger.info(f"Successfully ingested float {wmo_id}")
                 return float_obj
                 
@@ -311,9 +313,9 @@ class ArgoDataIngestionService:
                 )
                 
                 session.add(profile)
-                await session.flush()  # Get profile ID
                 
-                # Create measurements for this profile
+                # Create measurements for this profile; they are linked through the
+                # relationship, so every profile of the float goes out in one flush
                 await self._create_measurements_from_profile(
                     session, profile, data, prof_idx, n_levels
                 )
@@ -353,7 +355,7 @@ class ArgoDataIngestionService:
                 
                 # Create measurement
                 measurement = Measurement(
-                    profile_id=profile.id,
+                    profile=profile,
                     pressure=float(pressure),
                     temperature=float(temperature) if temperature is not None and not np.isnan(temperature) else None,
                     salinity=float(salinity) if salinity is not None and not np.isnan(salinity) else None,
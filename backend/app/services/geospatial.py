@@ -3,22 +3,46 @@ Geospatial query service for oceanographic data.
 """
 
 import logging
+import math
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_
 from sqlalchemy.orm import selectinload
-from geoalchemy2.functions import ST_DWithin, ST_GeomFromText, ST_Distance, ST_Contains
 from geoalchemy2.shape import to_shape
 from shapely.geometry import Point, Polygon
 
 from app.models import Float, Profile, Measurement
-from app.schemas import QueryParameters, FloatSummarySchema, ProfileSummary
+from app.schemas import QueryParameters, FloatSummarySchema, ProfileSummary, StatusEnum
 from app.database import AsyncSessionLocal
 
 logger = logging.getLogger(__name__)
 
 
+def profile_in_bbox(bbox: List[float]):
+    """
+    Build a point-in-box predicate on profile positions.
+    
+    Matches the expression of the GiST index on profiles, so the whole box is
+    answered by a single R-tree range scan.
+    
+    Args:
+        bbox: Bounding box [min_lon, min_lat, max_lon, max_lat]
+        
+    Returns:
+        SQL boolean expression
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return func.point(Profile.longitude, Profile.latitude).op("<@", is_comparison=True)(
+        func.box(func.point(min_lon, min_lat), func.point(max_lon, max_lat))
+    )
+
+
+# Mean Earth radius and length of one degree of latitude, in kilometers
+_EARTH_RADIUS_KM = 6371.0
+_KM_PER_DEGREE_LAT = 111.0
+
+
 class GeospatialQueryService:
     """Service for geospatial queries on oceanographic data."""
     
@@ -77,10 +101,7 @@ class GeospatialQueryService:
             floats = result.scalars().all()
             
             # Convert to summary schemas
-            float_summaries = []
-            for float_obj in floats:
-                summary = await self._create_float_summary(float_obj, session)
-                float_summaries.append(summary)
+            float_summaries = [self._create_float_summary(float_obj) for float_obj in floats]
             
             # Generate data summary
             data_summary = await self._generate_data_summary(session, floats, parameters)
@@ -97,6 +118,8 @@ class GeospatialQueryService:
         """
         Find floats within a specified radius of a point.
         
+        Floats are ordered by the distance of their closest profile.
+        
         Args:
             latitude: Center latitude
             longitude: Center longitude
@@ -107,34 +130,50 @@ class GeospatialQueryService:
             List of nearby floats
         """
         async with AsyncSessionLocal() as session:
-            # Create point geometry
-            center_point = ST_GeomFromText(f'POINT({longitude} {latitude})', 4326)
-            
-            # Query for nearby profiles (which link to floats)
-            query = select(Profile).join(Float).where(
-                ST_DWithin(Profile.location, center_point, radius_km * 1000)  # Convert km to meters
-            ).order_by(
-                ST_Distance(Profile.location, center_point)
-            ).limit(limit)
+            # Bounding box around the center - cheap, indexable range checks
+            # that narrow the candidates before any trigonometry is evaluated
+            lat_delta = radius_km / _KM_PER_DEGREE_LAT
+            lon_delta = radius_km / (_KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 1e-6))
+            
+            filters = [Profile.latitude.between(latitude - lat_delta, latitude + lat_delta)]
+            # Skip the longitude range when the box wraps the antimeridian
+            if -180 <= longitude - lon_delta and longitude + lon_delta <= 180:
+                filters.append(Profile.longitude.between(longitude - lon_delta, longitude + lon_delta))
+            
+            # Exact great-circle (haversine) distance for the remaining candidates
+            distance_km = 2 * _EARTH_RADIUS_KM * func.asin(func.sqrt(
+                func.power(func.sin(func.radians(Profile.latitude - latitude) / 2), 2) +
+                math.cos(math.radians(latitude)) * func.cos(func.radians(Profile.latitude)) *
+                func.power(func.sin(func.radians(Profile.longitude - longitude) / 2), 2)
+            ))
+            nearest_distance = func.min(distance_km)
+            
+            # Nearest floats, by their closest profile
+            query = (
+                select(Profile.float_id)
+                .where(*filters)
+                .group_by(Profile.float_id)
+                .having(nearest_distance <= radius_km)
+                .order_by(nearest_distance)
+                .limit(limit)
+            )
             
             result = await session.execute(query)
-            profiles = result.scalars().all()
+            float_ids = result.scalars().all()
             
-            # Get unique floats from profiles
-            float_ids = list(set(profile.float_id for profile in profiles))
+            if not float_ids:
+                return []
             
-            # Fetch float details
-            float_query = select(Float).where(Float.id.in_(float_ids))
-            float_result = await session.execute(float_query)
-            floats = float_result.scalars().all()
-            
-            # Convert to summaries
-            summaries = []
-            for float_obj in floats:
-                summary = await self._create_float_summary(float_obj)
-                summaries.append(summary)
+            # Fetch float summaries, keeping distance order
+            float_result = await session.execute(
+                select(Float).where(Float.id.in_(float_ids))
+            )
+            summaries = {
+                float_obj.id: self._create_float_summary(float_obj)
+                for float_obj in float_result.scalars()
+            }
             
-            return summaries
+            return [summaries[float_id] for float_id in float_ids if float_id in summaries]
     
     async def get_profiles_in_region(
         self,
@@ -156,15 +195,8 @@ class GeospatialQueryService:
             List of profile summaries
         """
         async with AsyncSessionLocal() as session:
-            # Create bounding box polygon
-            min_lon, min_lat, max_lon, max_lat = bbox
-            bbox_wkt = f'POLYGON(({min_lon} {min_lat}, {max_lon} {min_lat}, {max_lon} {max_lat}, {min_lon} {max_lat}, {min_lon} {min_lat}))'
-            bbox_geom = ST_GeomFromText(bbox_wkt, 4326)
-            
             # Build query
-            query = select(Profile).where(
-                ST_Contains(bbox_geom, Profile.location)
-            )
+            query = select(Profile).where(profile_in_bbox(bbox))
             
             # Apply temporal filters
             if start_date:
@@ -178,19 +210,19 @@ class GeospatialQueryService:
             result = await session.execute(query)
             profiles = result.scalars().all()
             
+            # Count measurements for all profiles at once
+            measurement_counts = await self._count_measurements(session, [p.id for p in profiles])
+            
             # Convert to summaries
             summaries = []
             for profile in profiles:
-                # Count measurements
-                measurement_count = await self._count_measurements(session, profile.id)
-                
-                summary = ProfileSummary(
+                summary = ProfileSummary.model_construct(
                     id=profile.id,
                     cycle_number=profile.cycle_number,
                     timestamp=profile.timestamp,
                     latitude=profile.latitude,
                     longitude=profile.longitude,
-                    measurement_count=measurement_count
+                    measurement_count=measurement_counts.get(profile.id, 0)
                 )
                 summaries.append(summary)
             
@@ -265,17 +297,8 @@ class GeospatialQueryService:
     
     def _apply_bbox_filter(self, query, bbox: List[float]):
         """Apply bounding box filter to query."""
-        min_lon, min_lat, max_lon, max_lat = bbox
-        
         # Use subquery to avoid conflicts with other filters
-        subq = select(Profile.float_id).where(
-            and_(
-                Profile.latitude >= min_lat,
-                Profile.latitude <= max_lat,
-                Profile.longitude >= min_lon,
-                Profile.longitude <= max_lon
-            )
-        ).distinct()
+        subq = select(Profile.float_id).where(profile_in_bbox(bbox)).distinct()
         
         return query.where(Float.id.in_(subq))
     
@@ -383,11 +406,7 @@ class GeospatialQueryService:
     
     def _apply_measurement_bbox_filter(self, query, bbox: List[float]):
         """Apply bounding box filter to measurement query."""
-        min_lon, min_lat, max_lon, max_lat = bbox
-        bbox_wkt = f'POLYGON(({min_lon} {min_lat}, {max_lon} {min_lat}, {max_lon} {max_lat}, {min_lon} {max_lat}, {min_lon} {min_lat}))'
-        bbox_geom = ST_GeomFromText(bbox_wkt, 4326)
-        
-        return query.where(ST_Contains(bbox_geom, Profile.location))
+        return query.where(profile_in_bbox(bbox))
     
     def _apply_measurement_temporal_filter(
         self, 
@@ -403,37 +422,28 @@ class GeospatialQueryService:
         
         return query
     
-    async def _create_float_summary(self, float_obj: Float, session: AsyncSession = None) -> FloatSummarySchema:
-        """Create float summary from float object - optimized to query only latest profile."""
-        import math
-        
-        # Query for latest profile and profile count efficiently
-        if session:
-            # Get profile count
-            count_result = await session.execute(
-                select(func.count(Profile.id)).where(Profile.float_id == float_obj.id)
-            )
-            profile_count = count_result.scalar() or 0
-            
-            # Get latest profile for position (only 1 profile, not all)
-            latest_result = await session.execute(
-                select(Profile)
-                .where(Profile.float_id == float_obj.id)
-                .order_by(Profile.timestamp.desc())
-                .limit(1)
-            )
-            latest_profile = latest_result.scalar_one_or_none()
-        else:
-            # Fallback to loaded profiles if no session provided
-            latest_profile = None
-            profile_count = 0
-            if hasattr(float_obj, 'profiles') and float_obj.profiles:
-                latest_profile = max(float_obj.profiles, key=lambda p: p.timestamp)
-                profile_count = len(float_obj.profiles)
-        
-        # Get latitude/longitude, handling NaN values
-        lat = latest_profile.latitude if latest_profile else float_obj.deployment_latitude
-        lon = latest_profile.longitude if latest_profile else float_obj.deployment_longitude
+    def _create_float_summary(self, float_obj: Float) -> FloatSummarySchema:
+        """Create float summary from the float's denormalized latest-profile columns."""
+        return self._build_float_summary(
+            float_obj,
+            float_obj.profile_count or 0,
+            float_obj.last_latitude,
+            float_obj.last_longitude,
+            float_obj.last_profile_timestamp
+        )
+    
+    def _build_float_summary(
+        self,
+        float_obj: Float,
+        profile_count: int,
+        latitude: Optional[float],
+        longitude: Optional[float],
+        latest_profile_date: Optional[datetime]
+    ) -> FloatSummarySchema:
+        """Build a float summary from already-fetched latest profile values."""
+        # Get latitude/longitude, falling back to deployment position
+        lat = latitude if latest_profile_date else float_obj.deployment_latitude
+        lon = longitude if latest_profile_date else float_obj.deployment_longitude
         
         # Replace NaN with None
         if lat is not None and (math.isnan(lat) or math.isinf(lat)):
@@ -441,23 +451,39 @@ class GeospatialQueryService:
         if lon is not None and (math.isnan(lon) or math.isinf(lon)):
             lon = None
         
-        return FloatSummarySchema(
+        # Values come straight from the database, so skip validation
+        return FloatSummarySchema.model_construct(
             id=float_obj.id,
             wmo_id=float_obj.wmo_id,
             latitude=lat,
             longitude=lon,
-            status=float_obj.status,
+            status=StatusEnum(float_obj.status),
             last_update=float_obj.last_update,
             profile_count=profile_count,
-            latest_profile_date=latest_profile.timestamp if latest_profile else None
+            latest_profile_date=latest_profile_date
         )
     
-    async def _count_measurements(self, session: AsyncSession, profile_id: int) -> int:
-        """Count measurements for a profile."""
+    async def _count_measurements(self, session: AsyncSession, profile_ids: List[int]) -> Dict[int, int]:
+        """
+        Count measurements for several profiles in one grouped query.
+        
+        Args:
+            session: Database session
+            profile_ids: Profile IDs to count measurements for
+            
+        Returns:
+            Mapping of profile ID to measurement count; profiles without
+            measurements are absent
+        """
+        if not profile_ids:
+            return {}
+        
         result = await session.execute(
-            select(func.count(Measurement.id)).where(Measurement.profile_id == profile_id)
+            select(Measurement.profile_id, func.count(Measurement.id))
+            .where(Measurement.profile_id.in_(profile_ids))
+            .group_by(Measurement.profile_id)
         )
-        return result.scalar() or 0
+        return dict(result.all())
     
     async def _generate_data_summary(
         self, 
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Add and backfill the denormalized latest-profile columns on floats, and
+create the indexes added alongside them.
+
+Profile writes keep these columns up to date automatically; run this once on
+databases created before the columns and indexes existed. init_db's
+create_all only creates missing tables, never new indexes on existing ones.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from app.database import engine
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+ADD_COLUMNS_SQL = """
+ALTER TABLE floats
+    ADD COLUMN IF NOT EXISTS last_profile_timestamp TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS last_latitude DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS last_longitude DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS profile_count INTEGER NOT NULL DEFAULT 0
+"""
+
+BACKFILL_SQL = """
+UPDATE floats f
+SET last_profile_timestamp = latest.timestamp,
+    last_latitude = latest.latitude,
+    last_longitude = latest.longitude,
+    profile_count = counts.profile_count
+FROM (
+    SELECT float_id, COUNT(*) AS profile_count
+    FROM profiles
+    GROUP BY float_id
+) counts
+JOIN LATERAL (
+    SELECT p.timestamp, p.latitude, p.longitude
+    FROM profiles p
+    WHERE p.float_id = counts.float_id
+    ORDER BY p.timestamp DESC
+    LIMIT 1
+) latest ON TRUE
+WHERE f.id = counts.float_id
+"""
+
+# Trigram index support for substring WMO ID search
+CREATE_TRGM_EXTENSION_SQL = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+
+# Indexes declared on the models after the tables were first created; built
+# CONCURRENTLY so existing tables stay writable while they build
+CREATE_INDEX_SQL = [
+    # Keyset pagination of the float list
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_floats_created_at_id ON floats (created_at, id)",
+    # Last-modified lookups for list ETags
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_floats_updated_at ON floats (updated_at)",
+    # Substring (ILIKE) search on WMO ID
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_floats_wmo_id_trgm ON floats USING gin (wmo_id gin_trgm_ops)",
+    # Keyset pagination of the profile list
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_timestamp_id ON profiles (timestamp, id)",
+    # Bounding-box prefilter for nearby-float searches
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_latitude_longitude ON profiles (latitude, longitude)",
+    # Latest profile of a float via an index-only scan
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_float_id_timestamp "
+    "ON profiles (float_id, timestamp) INCLUDE (latitude, longitude)",
+    # Point-in-box searches on profile positions
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_position_gist "
+    "ON profiles USING gist (point(longitude, latitude))",
+]
+
+
+async def main():
+    """Add the columns if needed, recompute them, and create missing indexes."""
+    try:
+        async with engine.begin() as conn:
+            logger.info("Adding latest-profile columns to floats...")
+            await conn.execute(text(ADD_COLUMNS_SQL))
+
+            logger.info("Backfilling latest-profile columns...")
+            result = await conn.execute(text(BACKFILL_SQL))
+            logger.info(f"Updated {result.rowcount} floats")
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(CREATE_TRGM_EXTENSION_SQL))
+
+            for statement in CREATE_INDEX_SQL:
+                logger.info(f"Running: {statement}")
+                await conn.execute(text(statement))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,195 @@
+"""
+Tests for the /ai/query endpoint.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints.ai_query import _RELEVANT_QUERY_RE
+from app.models import Float, Profile
+from app.schemas import ComparisonIntent, FloatIdIntent, QueryParameters
+from app.services.ai_service import ai_service
+from app.services.geospatial import geospatial_service
+
+
+def _query_count(status: str) -> float:
+    """Current value of the AI query counter for one outcome."""
+    return REGISTRY.get_sample_value("floatchat_ai_query_total", {"status": status}) or 0.0
+
+
+def _latency_count() -> float:
+    """Number of AI query latencies observed so far."""
+    return REGISTRY.get_sample_value("floatchat_ai_query_seconds_count") or 0.0
+
+
+def _extract(monkeypatch, parameters: QueryParameters) -> None:
+    """Make parameter extraction return fixed parameters instead of calling the LLM."""
+    async def fake_process_query(query_input):
+        return parameters
+    
+    monkeypatch.setattr(ai_service, "process_query", fake_process_query)
+
+
+@pytest.mark.asyncio
+async def test_off_topic_reply_is_counted_and_timed(async_client: AsyncClient):
+    """Early replies are recorded as successful queries with a latency."""
+    ok_before, latency_before = _query_count("ok"), _latency_count()
+    
+    response = await async_client.post("/api/v1/ai/query", json={"question": "Who won the cup final?"})
+    
+    assert response.status_code == 200
+    assert response.json()["floats"] == []
+    assert _query_count("ok") == ok_before + 1
+    assert _latency_count() == latency_before + 1
+
+
+@pytest.mark.asyncio
+async def test_failed_query_is_counted_as_error(async_client: AsyncClient, monkeypatch):
+    """Failures are recorded once, as errors, with a latency."""
+    async def failing_process_query(query_input):
+        raise RuntimeError("LLM unavailable")
+    
+    monkeypatch.setattr(ai_service, "process_query", failing_process_query)
+    ok_before, error_before, latency_before = _query_count("ok"), _query_count("error"), _latency_count()
+    
+    response = await async_client.post("/api/v1/ai/query", json={"question": "Show ocean temperature data"})
+    
+    assert response.status_code == 500
+    assert _query_count("error") == error_before + 1
+    assert _query_count("ok") == ok_before
+    assert _latency_count() == latency_before + 1
+
+
+@pytest.mark.parametrize("question", [
+    "Show me temperature in the Pacific",
+    "What is the SALINITY near the equator?",
+    "Tell me about float 2902746",
+    "Compare the Atlantic and Indian oceans",
+    "pH readings last month"
+])
+def test_relevant_questions_pass_the_prefilter(question):
+    """Ocean, variable, region and float-ID vocabulary is recognised regardless of case."""
+    assert _RELEVANT_QUERY_RE.search(question)
+
+
+@pytest.mark.parametrize("question", [
+    "Who won the cup final?",
+    "Write me a poem about cats",
+    "What is the temperament of a husky",
+    "Call me at 1234"
+])
+def test_off_topic_questions_fail_the_prefilter(question):
+    """Whole-word matching keeps look-alikes and short numbers from slipping through."""
+    assert not _RELEVANT_QUERY_RE.search(question)
+
+
+@pytest.mark.asyncio
+async def test_off_topic_question_skips_parameter_extraction(async_client: AsyncClient, monkeypatch):
+    """Rejected questions never reach the LLM extraction call."""
+    async def unexpected_process_query(query_input):
+        raise AssertionError("process_query must not be called")
+    
+    monkeypatch.setattr(ai_service, "process_query", unexpected_process_query)
+    
+    response = await async_client.post("/api/v1/ai/query", json={"question": "Write me a poem about cats"})
+    
+    assert response.status_code == 200
+    assert response.json()["insights"].startswith("Sorry, I cannot help you with that.")
+
+
+def test_intent_is_parsed_by_kind():
+    """LLM output selects the intent model through its ``kind`` field."""
+    parameters = QueryParameters.model_validate({"intent": {"kind": "float_id", "float_id": 5905001}})
+    
+    assert parameters.intent == FloatIdIntent(float_id=5905001)
+    
+    with pytest.raises(ValidationError):
+        QueryParameters.model_validate({"intent": {"kind": "comparison", "oceans": ["Pacific Ocean", "Red Sea"]}})
+
+
+@pytest.mark.asyncio
+async def test_float_id_intent_answers_from_the_float_row(
+    db_session: AsyncSession,
+    async_client: AsyncClient,
+    monkeypatch
+):
+    """A float-ID intent is answered by WMO ID from the stored profile stats."""
+    float_obj = Float(wmo_id="5905001", status="active", institution="AOML")
+    db_session.add(float_obj)
+    await db_session.flush()
+    for cycle in range(2):
+        db_session.add(Profile(
+            float_id=float_obj.id,
+            cycle_number=cycle,
+            profile_id=f"5905001_{cycle:03d}",
+            timestamp=datetime(2023, 5, 1) + timedelta(days=10 * cycle),
+            latitude=12.5,
+            longitude=65.25
+        ))
+    await db_session.commit()
+    # The request shares this session; drop the Float loaded before its stats were updated
+    db_session.expunge_all()
+    _extract(monkeypatch, QueryParameters(intent=FloatIdIntent(float_id=5905001)))
+    
+    response = await async_client.post("/api/v1/ai/query", json={"question": "Tell me about float 5905001"})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert [f["wmo_id"] for f in body["floats"]] == ["5905001"]
+    assert body["data_summary"] == {"float_count": 1, "profile_count": 2}
+    assert "**Profiles:** 2" in body["insights"]
+    assert "**Location:** 12.50°, 65.25°" in body["insights"]
+    assert "**Institution:** AOML" in body["insights"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_float_id_intent_returns_not_found(async_client: AsyncClient, monkeypatch):
+    """The pre-serialized not-found reply carries the requested ID."""
+    _extract(monkeypatch, QueryParameters(intent=FloatIdIntent(float_id=4242)))
+    
+    response = await async_client.post("/api/v1/ai/query", json={"question": "Tell me about float 4242"})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "Float/WMO ID 4242"
+    assert body["floats"] == []
+    assert "Float with ID or WMO ID 4242 not found" in body["insights"]
+
+
+@pytest.mark.asyncio
+async def test_comparison_intent_queries_each_ocean(async_client: AsyncClient, monkeypatch):
+    """Each ocean is queried with the shared variables and the means are contrasted."""
+    means = {"Pacific Ocean": 18.5, "Indian Ocean": 21.0}
+    locations = []
+    
+    async def fake_query_floats(parameters, limit):
+        locations.append(parameters.location)
+        assert parameters.variables == ["temperature"]
+        mean = means[parameters.location]
+        return [], {
+            "measurement_count": 1000,
+            "variable_statistics": {"temperature": {"mean": mean, "min": mean - 5, "max": mean + 5}}
+        }
+    
+    monkeypatch.setattr(geospatial_service, "query_floats_by_parameters", fake_query_floats)
+    _extract(monkeypatch, QueryParameters(
+        variables=["temperature"],
+        intent=ComparisonIntent(oceans=["Pacific Ocean", "Indian Ocean"])
+    ))
+    
+    response = await async_client.post(
+        "/api/v1/ai/query",
+        json={"question": "Compare temperature in the Pacific and Indian oceans"}
+    )
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert sorted(locations) == ["Indian Ocean", "Pacific Ocean"]
+    assert body["data_summary"]["regions"] == ["Pacific Ocean", "Indian Ocean"]
+    assert "Temperature: 18.50 (range: 13.50 to 23.50)" in body["insights"]
+    assert "Temperature: Indian Ocean has 2.50 units higher average" in body["insights"]
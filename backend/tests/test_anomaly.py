@@ -0,0 +1,106 @@
+"""
+Tests for anomaly baselines and z-score scoring.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import _query_anomaly_detection_data
+from app.models import Float, Profile, Measurement
+from app.services.anomaly_kernels import zscore_outliers
+
+
+async def _add_profile(db: AsyncSession, float_obj: Float, cycle: int, age_days: int, temperatures) -> None:
+    """Add a profile of the given age with one measurement per temperature, shallowest first."""
+    profile = Profile(
+        float_id=float_obj.id,
+        cycle_number=cycle,
+        profile_id=f"{float_obj.wmo_id}_{cycle:03d}",
+        timestamp=datetime.utcnow() - timedelta(days=age_days),
+        latitude=0.0,
+        longitude=0.0
+    )
+    db.add(profile)
+    for order, temperature in enumerate(temperatures):
+        db.add(Measurement(
+            profile=profile,
+            pressure=10.0 * (order + 1),
+            temperature=temperature,
+            salinity=35.0,
+            measurement_order=order
+        ))
+
+
+@pytest.mark.asyncio
+async def test_baseline_uses_recent_rows_and_latest_ignores_cutoff(db_session: AsyncSession):
+    """Baselines match NumPy over the window; stale floats still get their latest values."""
+    reporting = Float(wmo_id="5901001", status="active")
+    stale = Float(wmo_id="5901002", status="inactive")
+    db_session.add_all([reporting, stale])
+    await db_session.flush()
+    
+    await _add_profile(db_session, reporting, 1, 60, [30.0])
+    await _add_profile(db_session, reporting, 2, 2, [10.0, 12.0, 14.0])
+    await _add_profile(db_session, stale, 1, 90, [5.0, 6.0])
+    await db_session.commit()
+    
+    baseline, latest = await _query_anomaly_detection_data(
+        db_session, [reporting.id, stale.id], ["temperature", "salinity", "unknown"], days_back=30
+    )
+    
+    recent = np.array([10.0, 12.0, 14.0])
+    count, mean, std = baseline["temperature"]
+    assert count == 3
+    assert mean == pytest.approx(recent.mean())
+    assert std == pytest.approx(recent.std(ddof=1))
+    # A constant column has zero spread rather than a negative rounding error
+    assert baseline["salinity"][2] == pytest.approx(0.0, abs=1e-6)
+    
+    # Newest profile, deepest level - for the stale float too
+    assert latest[reporting.id] == {"temperature": 14.0, "salinity": 35.0}
+    assert latest[stale.id] == {"temperature": 6.0, "salinity": 35.0}
+
+
+@pytest.mark.asyncio
+async def test_baseline_needs_two_recent_values(db_session: AsyncSession):
+    """A variable with fewer than two recent values gets no baseline."""
+    float_obj = Float(wmo_id="5901003", status="active")
+    db_session.add(float_obj)
+    await db_session.flush()
+    await _add_profile(db_session, float_obj, 1, 1, [11.0])
+    await db_session.commit()
+    
+    baseline, latest = await _query_anomaly_detection_data(db_session, [float_obj.id], ["temperature"], days_back=30)
+    
+    assert baseline == {}
+    assert latest == {float_obj.id: {"temperature": 11.0}}
+
+
+@pytest.mark.asyncio
+async def test_no_floats_or_variables_short_circuits(db_session: AsyncSession):
+    """Nothing to score means no query and empty results."""
+    assert await _query_anomaly_detection_data(db_session, [], ["temperature"], 30) == ({}, {})
+    assert await _query_anomaly_detection_data(db_session, [1], ["unknown"], 30) == ({}, {})
+
+
+def test_zscore_outliers_matches_numpy():
+    """The kernel returns the same indices and scores as a NumPy reference."""
+    currents = np.array([12.0, 20.0, 11.5, 2.0, 12.4], dtype=np.float64)
+    mean, std, threshold = 12.0, 2.0, 2.0
+    
+    indices, scores = zscore_outliers(currents, mean, std, threshold)
+    
+    expected_scores = np.abs(currents - mean) / std
+    expected_indices = np.flatnonzero(expected_scores > threshold)
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_allclose(scores, expected_scores[expected_indices])
+
+
+def test_zscore_outliers_with_zero_spread_finds_nothing():
+    """A uniform baseline cannot be scored, so nothing is reported."""
+    indices, scores = zscore_outliers(np.array([1.0, 5.0]), 1.0, 0.0, 2.0)
+    
+    assert indices.size == 0 and scores.size == 0
@@ -0,0 +1,75 @@
+"""
+Tests for cache keys, the Redis JSON helpers and the semantic_cache decorator.
+"""
+
+import numpy as np
+import pytest
+
+from app.schemas import QueryParameters
+from app.services.cache import cache_service, make_cache_key, normalize_question, semantic_cache
+
+
+def test_normalize_question():
+    """Case, surrounding and repeated whitespace and trailing punctuation are ignored."""
+    assert normalize_question("  Show   me Pacific  TEMPERATURE?! ") == "show me pacific temperature"
+
+
+def test_question_keys_are_normalized_on_request():
+    """Rephrasings share a key only when string normalization is asked for."""
+    first = make_cache_key("q", "Show me Pacific floats?", normalize_strings=True)
+    second = make_cache_key("q", "show me  pacific floats", normalize_strings=True)
+    
+    assert first == second
+    assert make_cache_key("q", "Show me Pacific floats?") != make_cache_key("q", "show me  pacific floats")
+
+
+def test_prompt_keys_are_verbatim():
+    """Prompts differing only in case or trailing punctuation get different keys."""
+    assert make_cache_key("llm", "Float WMO ABC.") != make_cache_key("llm", "Float WMO abc")
+    assert make_cache_key("llm", {"institution": "AOML"}) != make_cache_key("llm", {"institution": "aoml"})
+
+
+def test_cache_keys_ignore_dict_order_and_namespace_prefix():
+    """Dict ordering does not matter, the namespace does, and models hash by content."""
+    params = QueryParameters(location="Pacific Ocean", variables=["temperature"])
+    
+    key = make_cache_key("ns", {"a": 1, "b": [1, 2]}, params)
+    
+    assert key == make_cache_key("ns", {"b": [1, 2], "a": 1}, params.model_copy())
+    assert key != make_cache_key("other", {"a": 1, "b": [1, 2]}, params)
+    assert key.startswith("floatchat:ns:")
+
+
+@pytest.mark.asyncio
+async def test_json_round_trip_accepts_int_keys_and_numpy(fake_redis):
+    """Values with integer dict keys and NumPy scalars survive a round trip."""
+    await cache_service.set_json("k", {"latest": {7: {"temperature": np.float64(12.5)}}}, ttl=60)
+    
+    assert await cache_service.get_json("k") == {"latest": {"7": {"temperature": 12.5}}}
+    assert await cache_service.get_json("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_reuses_results_by_argument_policy(fake_redis):
+    """Question methods share entries across rephrasings; prompt methods only on exact match."""
+    calls = []
+    
+    class Service:
+        @semantic_cache(namespace="test_questions", normalize_strings=True)
+        async def extract(self, question: str) -> str:
+            calls.append(question)
+            return f"answer {len(calls)}"
+        
+        @semantic_cache(namespace="test_prompts")
+        async def complete(self, prompt: str) -> str:
+            calls.append(prompt)
+            return f"answer {len(calls)}"
+    
+    service = Service()
+    
+    assert await service.extract("Pacific temperature?") == "answer 1"
+    assert await service.extract("pacific  TEMPERATURE") == "answer 1"
+    assert await service.complete("Pacific temperature?") == "answer 2"
+    assert await service.complete("pacific temperature") == "answer 3"
+    assert await service.complete("Pacific temperature?") == "answer 2"
+    assert len(calls) == 3
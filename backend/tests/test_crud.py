@@ -0,0 +1,154 @@
+"""
+Tests for CRUD helpers used by the float endpoints and services.
+"""
+
+import struct
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.models import Float, Profile, Measurement
+
+
+async def _add_float_with_profiles(db: AsyncSession, wmo_id: str, profile_count: int, levels: int = 2) -> Float:
+    """Add a float with daily profiles, each with ``levels`` measurements."""
+    float_obj = Float(wmo_id=wmo_id, status="active")
+    db.add(float_obj)
+    await db.flush()
+    
+    base = datetime(2023, 1, 1)
+    for cycle in range(profile_count):
+        profile = Profile(
+            float_id=float_obj.id,
+            cycle_number=cycle,
+            profile_id=f"{wmo_id}_{cycle:03d}",
+            timestamp=base + timedelta(days=cycle),
+            latitude=10.0 + cycle,
+            longitude=-20.0 - cycle
+        )
+        db.add(profile)
+        for level in range(levels):
+            db.add(Measurement(profile=profile, pressure=10.0 * (level + 1), temperature=15.0 - level, measurement_order=level))
+    
+    await db.commit()
+    db.expunge_all()
+    return float_obj
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("include_measurements", [False, True])
+async def test_float_profiles_stream_newest_first(db_session: AsyncSession, monkeypatch, include_measurements):
+    """Profiles stream across several yield_per batches, optionally with measurements loaded."""
+    # Small batches so the limit spans several of them
+    monkeypatch.setattr(crud, "_PROFILE_STREAM_BATCH_SIZE", 2)
+    await _add_float_with_profiles(db_session, "5902001", profile_count=7)
+    await _add_float_with_profiles(db_session, "5902002", profile_count=2)
+    
+    profiles = [
+        profile
+        async for profile in crud.get_float_profiles_by_wmo_id(
+            db_session, "5902001", limit=5, include_measurements=include_measurements
+        )
+    ]
+    
+    assert [profile.cycle_number for profile in profiles] == [6, 5, 4, 3, 2]
+    for profile in profiles:
+        if include_measurements:
+            assert sorted(m.pressure for m in profile.measurements) == [10.0, 20.0]
+        else:
+            assert "measurements" in inspect(profile).unloaded
+
+
+@pytest.mark.asyncio
+async def test_float_profiles_stream_unknown_float(db_session: AsyncSession):
+    """An unknown WMO ID streams nothing."""
+    profiles = [profile async for profile in crud.get_float_profiles_by_wmo_id(db_session, "0000000")]
+    
+    assert profiles == []
+
+
+def _binary_copy(rows, header_extension: bytes = b"") -> bytes:
+    """Encode rows of three float8 values (None for NULL) as PostgreSQL binary COPY output."""
+    parts = [b"PGCOPY\n\xff\r\n\x00", struct.pack(">ii", 0, len(header_extension)), header_extension]
+    for row in rows:
+        parts.append(struct.pack(">h", len(row)))
+        for value in row:
+            parts.append(struct.pack(">id", 8, value))
+    parts.append(struct.pack(">h", -1))
+    return b"".join(parts)
+
+
+@pytest.mark.parametrize("header_extension", [b"", b"\x00\x01\x02\x03"])
+def test_decode_measurement_arrays(header_extension):
+    """Binary COPY tuples decode to float64 columns, NaN included."""
+    rows = [(10.0, 18.25, 35.1), (50.5, float("nan"), 35.2), (1000.0, 4.0, float("nan"))]
+    
+    arrays = crud._decode_measurement_arrays(memoryview(_binary_copy(rows, header_extension)))
+    
+    expected = np.array(rows, dtype=np.float64)
+    for index, name in enumerate(("pressure", "temperature", "salinity")):
+        assert arrays[name].dtype == np.float64
+        np.testing.assert_array_equal(arrays[name], expected[:, index])
+
+
+def test_decode_measurement_arrays_without_rows():
+    """A COPY with no tuples gives empty arrays."""
+    arrays = crud._decode_measurement_arrays(memoryview(_binary_copy([])))
+    
+    assert all(values.size == 0 for values in arrays.values())
+
+
+@pytest.mark.asyncio
+async def test_measurement_arrays_match_select(pg_session: AsyncSession):
+    """The binary COPY path returns the same values as a plain SELECT."""
+    float_obj = await _add_float_with_profiles(pg_session, "5902101", profile_count=3, levels=4)
+    await _add_float_with_profiles(pg_session, "5902102", profile_count=1)
+    other_profile = await pg_session.scalar(
+        select(Profile).where(Profile.float_id == float_obj.id).order_by(Profile.id).limit(1)
+    )
+    pg_session.add(Measurement(profile_id=other_profile.id, pressure=2000.0, temperature=None, salinity=None))
+    await pg_session.commit()
+    
+    arrays = await crud.get_measurement_arrays_by_wmo_id(pg_session, "5902101")
+    
+    result = await pg_session.execute(
+        select(Measurement.pressure, Measurement.temperature, Measurement.salinity)
+        .join(Profile, Measurement.profile_id == Profile.id)
+        .where(Profile.float_id == float_obj.id)
+    )
+    expected = np.array(
+        [[np.nan if value is None else value for value in row] for row in result.all()],
+        dtype=np.float64
+    )
+    
+    # COPY order is unspecified; compare both sides sorted by pressure, then temperature
+    order = np.lexsort((arrays["temperature"], arrays["pressure"]))
+    expected = expected[np.lexsort((expected[:, 1], expected[:, 0]))]
+    assert len(order) == len(expected) == 13
+    for index, name in enumerate(("pressure", "temperature", "salinity")):
+        np.testing.assert_array_equal(arrays[name][order], expected[:, index])
+
+
+@pytest.mark.asyncio
+async def test_latest_float_locations(pg_session: AsyncSession):
+    """Each requested float maps to its newest profile position; unknown IDs are left out."""
+    await _add_float_with_profiles(pg_session, "5902201", profile_count=3, levels=0)
+    await _add_float_with_profiles(pg_session, "5902202", profile_count=1, levels=0)
+    await _add_float_with_profiles(pg_session, "5902203", profile_count=2, levels=0)
+    
+    locations = await crud.get_latest_float_locations(pg_session, ["5902201", "5902202", "0000000"])
+    
+    assert locations == {
+        "5902201": {"wmo_id": "5902201", "latitude": 12.0, "longitude": -22.0, "timestamp": datetime(2023, 1, 3)},
+        "5902202": {"wmo_id": "5902202", "latitude": 10.0, "longitude": -20.0, "timestamp": datetime(2023, 1, 1)},
+    }
+
+
+@pytest.mark.asyncio
+async def test_latest_float_locations_without_ids(db_session: AsyncSession):
+    """No WMO IDs means no query."""
+    assert await crud.get_latest_float_locations(db_session, []) == {}
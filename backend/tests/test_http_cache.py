@@ -0,0 +1,117 @@
+"""
+Tests for ETag / If-None-Match handling.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Response
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.http_cache import CACHE_CONTROL, check_not_modified, weak_etag
+from app.models import Float, Profile, Measurement
+
+
+def _request(if_none_match: str = None) -> Request:
+    """Build a bare GET request with an optional If-None-Match header."""
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode("latin-1")))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_weak_etag_depends_on_time_and_parts():
+    """The ETag is weak and changes with the modification time or any part."""
+    updated_at = datetime(2023, 6, 1, 12, 0)
+    etag = weak_etag(updated_at, 1, True)
+    
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == weak_etag(updated_at, 1, True)
+    assert etag != weak_etag(datetime(2023, 6, 1, 12, 1), 1, True)
+    assert etag != weak_etag(updated_at, 1, False)
+    assert weak_etag(None, 1) == 'W/"0-1"'
+
+
+def test_check_not_modified_sets_headers_on_miss():
+    """Without a matching If-None-Match the headers go on the response."""
+    response = Response()
+    check_not_modified(_request('W/"stale"'), response, 'W/"fresh"')
+    
+    assert response.headers["ETag"] == 'W/"fresh"'
+    assert response.headers["Cache-Control"] == CACHE_CONTROL
+
+
+@pytest.mark.parametrize("if_none_match", ['W/"fresh"', 'W/"other", W/"fresh"', "*"])
+def test_check_not_modified_raises_304_on_match(if_none_match):
+    """A matching, listed or wildcard If-None-Match gives 304 with the ETag."""
+    with pytest.raises(HTTPException) as exc_info:
+        check_not_modified(_request(if_none_match), Response(), 'W/"fresh"')
+    
+    assert exc_info.value.status_code == 304
+    assert exc_info.value.headers["ETag"] == 'W/"fresh"'
+
+
+@pytest.mark.asyncio
+async def test_float_detail_revalidation(db_session: AsyncSession, async_client: AsyncClient, sample_float: Float):
+    """The float detail endpoint answers 304 until its measurements change."""
+    profile = Profile(
+        float_id=sample_float.id,
+        cycle_number=1,
+        profile_id=f"{sample_float.wmo_id}_001",
+        timestamp=datetime(2023, 6, 1, 12, 0),
+        latitude=35.0,
+        longitude=-140.0
+    )
+    db_session.add(profile)
+    await db_session.commit()
+    
+    url = f"/api/v1/floats/{sample_float.id}"
+    first = await async_client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    
+    revalidated = await async_client.get(url, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.content == b""
+    
+    db_session.add(Measurement(profile_id=profile.id, pressure=10.0, temperature=18.5, measurement_order=0))
+    await db_session.commit()
+    # Requests share the test session; reload rows as a fresh request session would
+    db_session.expire_all()
+    
+    changed = await async_client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["profiles"][0]["measurements"][0]["pressure"] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_float_detail_not_found(async_client: AsyncClient):
+    """An unknown float id is a 404, not a cached response."""
+    response = await async_client.get("/api/v1/floats/999")
+    
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_float_list_etag_changes_when_a_float_is_deleted(db_session: AsyncSession, async_client: AsyncClient):
+    """Removing a float that is not the newest still invalidates the list ETag."""
+    older = Float(wmo_id="5900001", status="active", updated_at=datetime(2023, 1, 1))
+    newer = Float(wmo_id="5900002", status="active", updated_at=datetime(2023, 6, 1))
+    db_session.add_all([older, newer])
+    await db_session.commit()
+    
+    first = await async_client.get("/api/v1/floats/")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    
+    await db_session.delete(older)
+    await db_session.commit()
+    
+    after_delete = await async_client.get("/api/v1/floats/", headers={"If-None-Match": etag})
+    assert after_delete.status_code == 200
+    assert [item["wmo_id"] for item in after_delete.json()["items"]] == ["5900002"]
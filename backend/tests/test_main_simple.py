@@ -0,0 +1,38 @@
+"""
+Tests for the simplified development server's in-memory float filters.
+"""
+
+import numpy as np
+
+from app.main_simple import FloatStore, _LOCATION_LONGITUDE_BOUNDS, filter_by_region
+
+
+def _store_with_longitudes(longitudes) -> FloatStore:
+    """Build an all-active store with the given longitudes."""
+    count = len(longitudes)
+    return FloatStore(
+        ids=np.arange(count, dtype=np.int64),
+        wmo_ids=[str(i) for i in range(count)],
+        latitudes=np.zeros(count),
+        longitudes=np.array(longitudes, dtype=np.float64),
+        status_codes=np.zeros(count, dtype=np.uint8),
+        profile_counts=np.zeros(count, dtype=np.int64),
+        last_updates=[None] * count,
+        latest_profile_dates=[None] * count
+    )
+
+
+def test_ocean_bands_do_not_overlap_at_boundaries():
+    """Longitudes of exactly -30 and 30 belong to the Atlantic only."""
+    store = _store_with_longitudes([-150.0, -30.0, 0.0, 30.0, 90.0, np.nan])
+    
+    matches = {
+        location: filter_by_region(store, lon_min, lon_max).tolist()
+        for location, (lon_min, lon_max) in _LOCATION_LONGITUDE_BOUNDS.items()
+    }
+    
+    assert matches == {
+        "Pacific Ocean": [0],
+        "Atlantic Ocean": [1, 2, 3],
+        "Indian Ocean": [4],
+    }
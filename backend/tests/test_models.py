@@ -0,0 +1,155 @@
+"""
+Tests for the model event listeners that keep denormalised float data current.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Float, Profile, Measurement
+
+
+def _make_profile(float_obj: Float, cycle_number: int, timestamp: datetime, latitude: float, longitude: float) -> Profile:
+    """Build an unsaved profile for the given float."""
+    return Profile(
+        float_id=float_obj.id,
+        cycle_number=cycle_number,
+        profile_id=f"{float_obj.wmo_id}_{cycle_number:03d}",
+        timestamp=timestamp,
+        latitude=latitude,
+        longitude=longitude,
+        direction='A',
+        data_mode='R'
+    )
+
+
+@pytest.mark.asyncio
+async def test_new_profile_updates_float_latest_position(db_session: AsyncSession, sample_float: Float):
+    """Inserting a profile records it as the float's latest and counts it."""
+    timestamp = datetime(2023, 6, 1, 12, 0)
+    db_session.add(_make_profile(sample_float, 1, timestamp, 36.5, -141.25))
+    await db_session.commit()
+    
+    await db_session.refresh(sample_float)
+    assert sample_float.profile_count == 1
+    assert sample_float.last_profile_timestamp == timestamp
+    assert sample_float.last_latitude == 36.5
+    assert sample_float.last_longitude == -141.25
+
+
+@pytest.mark.asyncio
+async def test_older_profile_does_not_replace_latest_position(db_session: AsyncSession, sample_float: Float):
+    """A back-filled older profile is counted but keeps the newest position."""
+    newest = datetime(2023, 6, 1, 12, 0)
+    db_session.add(_make_profile(sample_float, 2, newest, 37.0, -142.0))
+    await db_session.commit()
+    
+    db_session.add(_make_profile(sample_float, 1, newest - timedelta(days=10), 35.0, -140.0))
+    await db_session.commit()
+    
+    await db_session.refresh(sample_float)
+    assert sample_float.profile_count == 2
+    assert sample_float.last_profile_timestamp == newest
+    assert sample_float.last_latitude == 37.0
+    assert sample_float.last_longitude == -142.0
+
+
+@pytest.mark.asyncio
+async def test_profiles_flushed_together_are_counted_once_each(db_session: AsyncSession, sample_float: Float):
+    """A batch of profiles with measurements attached lands in one flush."""
+    base = datetime(2023, 6, 1)
+    for cycle in range(1, 4):
+        profile = _make_profile(sample_float, cycle, base + timedelta(days=cycle), 30.0 + cycle, -140.0)
+        db_session.add(profile)
+        db_session.add(Measurement(profile=profile, pressure=5.0, measurement_order=0))
+    await db_session.commit()
+    
+    await db_session.refresh(sample_float)
+    assert sample_float.profile_count == 3
+    assert sample_float.last_profile_timestamp == base + timedelta(days=3)
+    assert sample_float.last_latitude == 33.0
+
+
+@pytest.mark.asyncio
+async def test_deleting_latest_profile_falls_back_to_previous(db_session: AsyncSession, sample_float: Float):
+    """Deleting profiles recounts them and restores the next newest position."""
+    older = _make_profile(sample_float, 1, datetime(2023, 5, 1), 35.0, -140.0)
+    newest = _make_profile(sample_float, 2, datetime(2023, 6, 1), 37.0, -142.0)
+    db_session.add_all([older, newest])
+    await db_session.commit()
+    
+    await db_session.delete(newest)
+    await db_session.commit()
+    
+    await db_session.refresh(sample_float)
+    assert sample_float.profile_count == 1
+    assert sample_float.last_profile_timestamp == datetime(2023, 5, 1)
+    assert sample_float.last_latitude == 35.0
+    assert sample_float.last_longitude == -140.0
+    
+    await db_session.delete(older)
+    await db_session.commit()
+    
+    await db_session.refresh(sample_float)
+    assert sample_float.profile_count == 0
+    assert sample_float.last_profile_timestamp is None
+    assert sample_float.last_latitude is None
+
+
+@pytest.mark.asyncio
+async def test_retimed_profile_updates_latest_position(db_session: AsyncSession, sample_float: Float):
+    """Correcting a profile's timestamp or position is reflected on the float."""
+    first = _make_profile(sample_float, 1, datetime(2023, 5, 1), 35.0, -140.0)
+    second = _make_profile(sample_float, 2, datetime(2023, 6, 1), 37.0, -142.0)
+    db_session.add_all([first, second])
+    await db_session.commit()
+    
+    first.timestamp = datetime(2023, 7, 1)
+    first.latitude = 36.0
+    await db_session.commit()
+    
+    await db_session.refresh(sample_float)
+    assert sample_float.profile_count == 2
+    assert sample_float.last_profile_timestamp == datetime(2023, 7, 1)
+    assert sample_float.last_latitude == 36.0
+
+
+@pytest.mark.asyncio
+async def test_measurement_changes_touch_parent_rows(db_session: AsyncSession, sample_float: Float):
+    """Adding a measurement bumps updated_at on its profile and float."""
+    profile = _make_profile(sample_float, 1, datetime(2023, 6, 1, 12, 0), 35.0, -140.0)
+    db_session.add(profile)
+    await db_session.commit()
+    
+    await db_session.refresh(sample_float)
+    await db_session.refresh(profile)
+    float_updated_at = sample_float.updated_at
+    profile_updated_at = profile.updated_at
+    
+    db_session.add(Measurement(profile_id=profile.id, pressure=10.0, temperature=18.5, measurement_order=0))
+    await db_session.commit()
+    
+    await db_session.refresh(sample_float)
+    await db_session.refresh(profile)
+    assert profile.updated_at > profile_updated_at
+    assert sample_float.updated_at > float_updated_at
+
+
+@pytest.mark.asyncio
+async def test_unchanged_dirty_measurement_does_not_touch_parents(db_session: AsyncSession, sample_float: Float):
+    """Re-assigning a measurement's current value is not a change."""
+    profile = _make_profile(sample_float, 1, datetime(2023, 6, 1, 12, 0), 35.0, -140.0)
+    measurement = Measurement(profile=profile, pressure=10.0, temperature=18.5, measurement_order=0)
+    db_session.add_all([profile, measurement])
+    await db_session.commit()
+    
+    # Read through a query; refreshing the profile would cascade and expire the measurement
+    updated_at_query = select(Profile.updated_at).where(Profile.id == profile.id)
+    profile_updated_at = await db_session.scalar(updated_at_query)
+    
+    measurement.temperature = 18.5
+    await db_session.commit()
+    
+    assert await db_session.scalar(updated_at_query) == profile_updated_at
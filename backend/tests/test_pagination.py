@@ -0,0 +1,74 @@
+"""
+Tests for keyset cursor pagination.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Float
+from app.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    """A cursor decodes back to the sort value and id it was built from."""
+    created_at = datetime(2023, 6, 1, 12, 30, 15, 250000)
+    
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30=", "eyJ0cyI6ICJ4IiwgImlkIjogMX0="])
+def test_malformed_cursor_is_rejected(cursor):
+    """Garbage, empty and badly typed cursors give a 400."""
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail["error"] == "Invalid Cursor"
+
+
+@pytest.mark.asyncio
+async def test_cursor_paging_visits_every_float_once(db_session: AsyncSession, async_client: AsyncClient):
+    """Following next_cursor walks all floats newest first, including created_at ties."""
+    base = datetime(2023, 1, 1)
+    # Two pairs share a creation time so the id tie-breaker is exercised
+    offsets = [0, 1, 1, 2, 3, 3, 4]
+    for i, offset in enumerate(offsets):
+        db_session.add(Float(wmo_id=f"590{i:04d}", status="active", created_at=base + timedelta(hours=offset)))
+    await db_session.commit()
+    
+    seen = []
+    pages = 0
+    cursor = None
+    while True:
+        params = {"size": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await async_client.get("/api/v1/floats/", params=params)
+        assert response.status_code == 200
+        
+        body = response.json()
+        seen.extend(item["id"] for item in body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    
+    result = await db_session.execute(
+        Float.__table__.select().order_by(Float.created_at.desc(), Float.id.desc())
+    )
+    expected = [row.id for row in result]
+    
+    assert seen == expected
+    assert pages == 4
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_returns_400(async_client: AsyncClient):
+    """The list endpoint rejects a malformed cursor."""
+    response = await async_client.get("/api/v1/floats/", params={"cursor": "not-a-cursor"})
+    
+    assert response.status_code == 400
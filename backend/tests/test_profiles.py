@@ -0,0 +1,98 @@
+"""
+Tests for the profile list endpoint filters.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Float, Measurement, Profile
+
+
+async def _add_float(db: AsyncSession, wmo_id: str, latitude: float, longitude: float) -> None:
+    """Add a float with three daily profiles at a fixed position."""
+    float_obj = Float(wmo_id=wmo_id, status="active")
+    db.add(float_obj)
+    await db.flush()
+    
+    base = datetime(2023, 1, 1)
+    for cycle in range(3):
+        profile = Profile(
+            float_id=float_obj.id,
+            cycle_number=cycle,
+            profile_id=f"{wmo_id}_{cycle:03d}",
+            timestamp=base + timedelta(days=cycle),
+            latitude=latitude,
+            longitude=longitude
+        )
+        db.add(profile)
+        db.add(Measurement(profile=profile, pressure=10.0, temperature=15.0, measurement_order=0))
+    
+    await db.commit()
+
+
+async def _list_profiles(client: AsyncClient, **params) -> dict:
+    response = await client.get("/api/v1/profiles/", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_wmo_filter_binds_each_requests_value(db_session: AsyncSession, async_client: AsyncClient):
+    """The cached lambda statement picks up a new WMO ID on every request."""
+    await _add_float(db_session, "5903001", latitude=10.0, longitude=60.0)
+    await _add_float(db_session, "5903002", latitude=-40.0, longitude=-150.0)
+    
+    first = await _list_profiles(async_client, wmo_id="5903001", include_total=True)
+    second = await _list_profiles(async_client, wmo_id="5903002", include_total=True)
+    
+    assert first["total"] == 3
+    assert second["total"] == 3
+    assert {item["latitude"] for item in first["items"]} == {10.0}
+    assert {item["latitude"] for item in second["items"]} == {-40.0}
+    assert all(item["measurement_count"] == 1 for item in first["items"])
+
+
+@pytest.mark.asyncio
+async def test_date_and_bounding_box_filters(db_session: AsyncSession, async_client: AsyncClient):
+    """Date range and bounding box filters combine on the same statement."""
+    await _add_float(db_session, "5903001", latitude=10.0, longitude=60.0)
+    await _add_float(db_session, "5903002", latitude=-40.0, longitude=-150.0)
+    
+    body = await _list_profiles(
+        async_client,
+        start_date="2023-01-02T00:00:00",
+        end_date="2023-01-03T00:00:00",
+        min_lat=0,
+        max_lat=20,
+        min_lon=50,
+        max_lon=70,
+        include_total=True
+    )
+    
+    assert body["total"] == 2
+    assert [item["cycle_number"] for item in body["items"]] == [2, 1]
+    
+    # Same filters with a different box reuse the compiled statement
+    body = await _list_profiles(async_client, min_lat=-50, max_lat=-30, include_total=True)
+    
+    assert body["total"] == 3
+    assert {item["longitude"] for item in body["items"]} == {-150.0}
+
+
+@pytest.mark.asyncio
+async def test_float_id_filter_pages_with_cursor(db_session: AsyncSession, async_client: AsyncClient):
+    """A float_id filter stays applied while following the cursor."""
+    await _add_float(db_session, "5903001", latitude=10.0, longitude=60.0)
+    await _add_float(db_session, "5903002", latitude=-40.0, longitude=-150.0)
+    profile_id = (await _list_profiles(async_client, wmo_id="5903002"))["items"][0]["id"]
+    profile = await db_session.get(Profile, profile_id)
+    
+    first = await _list_profiles(async_client, float_id=profile.float_id, size=2)
+    second = await _list_profiles(async_client, float_id=profile.float_id, size=2, cursor=first["next_cursor"])
+    
+    cycles = [item["cycle_number"] for item in first["items"] + second["items"]]
+    assert cycles == [2, 1, 0]
+    assert second["next_cursor"] is None
@@ -0,0 +1,163 @@
+"""
+Tests for the float and profile statistics endpoints and their Redis cache.
+"""
+
+from datetime import datetime, timedelta
+from typing import AsyncGenerator
+
+import numpy as np
+import orjson
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.main import app
+from app.models import Float, Measurement, Profile
+
+PRESSURES = [10.0, 50.0, 100.0, 500.0]
+TEMPERATURES = [24.5, 21.0, 15.25, 6.0]
+
+
+async def _add_float(db: AsyncSession, profile_count: int) -> Float:
+    """Add a float whose profiles share the module's measurement levels."""
+    float_obj = Float(wmo_id="5904001", status="active")
+    db.add(float_obj)
+    await db.flush()
+    
+    for cycle in range(profile_count):
+        await _add_profile(db, float_obj, cycle)
+    
+    await db.commit()
+    return float_obj
+
+
+async def _add_profile(db: AsyncSession, float_obj: Float, cycle: int) -> Profile:
+    profile = Profile(
+        float_id=float_obj.id,
+        cycle_number=cycle,
+        profile_id=f"{float_obj.wmo_id}_{cycle:03d}",
+        timestamp=datetime(2023, 1, 1) + timedelta(days=10 * cycle),
+        latitude=10.0 + cycle,
+        longitude=60.0 - cycle
+    )
+    db.add(profile)
+    for order, (pressure, temperature) in enumerate(zip(PRESSURES, TEMPERATURES)):
+        # Salinity is only sampled at the surface
+        salinity = 35.0 if order == 0 else None
+        db.add(Measurement(
+            profile=profile,
+            pressure=pressure,
+            temperature=temperature,
+            salinity=salinity,
+            measurement_order=order
+        ))
+    return profile
+
+
+@pytest_asyncio.fixture
+async def pg_client(pg_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+    """Create an async HTTP client bound to the PostgreSQL test session."""
+    
+    async def override_get_db():
+        yield pg_session
+    
+    app.dependency_overrides[get_db] = override_get_db
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as test_client:
+        yield test_client
+    
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_float_statistics_aggregate_all_profiles(db_session: AsyncSession, async_client: AsyncClient):
+    """Coverage, depth range and variable counts span every profile of the float."""
+    float_obj = await _add_float(db_session, profile_count=3)
+    
+    response = await async_client.get(f"/api/v1/floats/{float_obj.id}/statistics")
+    
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["profile_count"] == 3
+    assert stats["total_measurements"] == 12
+    assert stats["temporal_coverage"]["duration_days"] == 20
+    assert stats["spatial_coverage"] == {
+        "min_latitude": 10.0,
+        "max_latitude": 12.0,
+        "min_longitude": 58.0,
+        "max_longitude": 60.0
+    }
+    assert stats["depth_range"] == {"min_pressure": 10.0, "max_pressure": 500.0}
+    assert stats["variable_counts"] == {"temperature": 12, "salinity": 3}
+
+
+@pytest.mark.asyncio
+async def test_float_statistics_without_profiles(db_session: AsyncSession, async_client: AsyncClient):
+    """A float with no profiles reports zero counts and no coverage."""
+    float_obj = await _add_float(db_session, profile_count=0)
+    
+    stats = (await async_client.get(f"/api/v1/floats/{float_obj.id}/statistics")).json()
+    
+    assert stats["profile_count"] == 0
+    assert stats["temporal_coverage"] is None
+    assert stats["variable_counts"] == {}
+
+
+@pytest.mark.asyncio
+async def test_float_statistics_cache_follows_updated_at(db_session: AsyncSession, async_client: AsyncClient, fake_redis):
+    """Cached bytes are served until a new profile advances the float's updated_at."""
+    float_obj = await _add_float(db_session, profile_count=1)
+    url = f"/api/v1/floats/{float_obj.id}/statistics"
+    
+    first = await async_client.get(url)
+    assert len(fake_redis.store) == 1
+    
+    # Tamper with the stored entry to prove the next response comes from Redis
+    (key,) = fake_redis.store
+    fake_redis.store[key] = orjson.dumps({"cached": True}).decode()
+    assert (await async_client.get(url)).json() == {"cached": True}
+    
+    await _add_profile(db_session, float_obj, cycle=1)
+    await db_session.commit()
+    
+    refreshed = await async_client.get(url)
+    assert refreshed.json()["profile_count"] == 2
+    assert first.json()["profile_count"] == 1
+    assert len(fake_redis.store) == 2
+
+
+@pytest.mark.asyncio
+async def test_statistics_of_missing_rows_return_404(db_session: AsyncSession, async_client: AsyncClient):
+    """Unknown float and profile IDs give a 404 before any aggregation."""
+    assert (await async_client.get("/api/v1/floats/999/statistics")).status_code == 404
+    assert (await async_client.get("/api/v1/profiles/999/statistics")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_profile_statistics_match_numpy(pg_session: AsyncSession, pg_client: AsyncClient):
+    """The single aggregate query agrees with numpy on every reported variable."""
+    float_obj = await _add_float(pg_session, profile_count=1)
+    profile_id = (await pg_session.execute(
+        Profile.__table__.select().where(Profile.float_id == float_obj.id)
+    )).one().id
+    
+    response = await pg_client.get(f"/api/v1/profiles/{profile_id}/statistics")
+    
+    assert response.status_code == 200
+    stats = response.json()
+    temperatures = np.array(TEMPERATURES)
+    assert stats["measurement_count"] == 4
+    assert stats["depth_range"] == {"min_pressure": 10.0, "max_pressure": 500.0, "pressure_count": 4}
+    assert stats["variables"]["temperature"] == pytest.approx({
+        "count": 4,
+        "min": temperatures.min(),
+        "max": temperatures.max(),
+        "mean": temperatures.mean(),
+        "stddev": temperatures.std(ddof=1),
+        "median": np.median(temperatures)
+    })
+    # A single sample has no spread, so stddev and median are left out
+    assert stats["variables"]["salinity"] == {"count": 1, "min": 35.0, "max": 35.0, "mean": 35.0}
+    assert set(stats["variables"]) == {"temperature", "salinity"}